@@ -0,0 +1,173 @@
+from django.core.files.storage import FileSystemStorage
+from django.utils.encoding import filepath_to_uri, iri_to_uri
+from rest_framework import fields as drf_fields
+from rest_framework import relations
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+from rest_framework.settings import api_settings
+from rest_framework.utils.serializer_helpers import ReturnList
+
+# Campos cuya representación es el mismo valor que entrega values().
+IDENTITY_FIELDS = (
+    drf_fields.BooleanField,
+    drf_fields.CharField,
+    drf_fields.ChoiceField,
+    drf_fields.FloatField,
+    drf_fields.IntegerField,
+    drf_fields.ReadOnlyField,
+    relations.StringRelatedField,
+)
+
+
+def url_converter(storage, request=None):
+    """
+    Función ``nombre -> URL`` equivalente a la representación de ``FileField``
+    (absoluta si hay ``request``); ``None`` para nombres vacíos.
+    """
+    build_absolute_uri = request.build_absolute_uri if request is not None else None
+    # FileSystemStorage.url() y build_absolute_uri() pasan cada valor por
+    # urljoin/urlsplit; con el almacenamiento local el resultado es un
+    # prefijo fijo más el nombre, así que se precalcula el prefijo.
+    prefix = None
+    if storage.__class__.url is FileSystemStorage.url and storage.base_url.startswith("/"):
+        prefix = (build_absolute_uri("/")[:-1] if build_absolute_uri else "") + storage.base_url
+
+    def convert(name):
+        if not name:
+            return None
+        if prefix is not None and "./" not in name:
+            return iri_to_uri(prefix + filepath_to_uri(name).lstrip("/"))
+        url = storage.url(name)
+        return build_absolute_uri(url) if build_absolute_uri else url
+
+    return convert
+
+
+class CompiledSerializer:
+    """
+    Versión de solo lectura de un ``ModelSerializer`` que arma los dicts de
+    salida directamente desde filas de ``values()``.
+
+    Al compilar se resuelve, para cada campo del serializer, la columna que
+    hay que pedir y una función de conversión (ninguna para la mayoría de los
+    campos); por fila solo queda leer la columna y convertir, sin instancias
+    de modelo, sin ``get_attribute`` y sin un ``ReturnDict`` por fila. La
+    salida es idéntica a la del serializer original.
+
+    Los campos que no salen de una columna del modelo se declaran en
+    ``Meta.compiled_sources`` como ``{campo: ruta_de_values}``; para
+    ``StringRelatedField`` la ruta debe apuntar a la columna que da ``__str__``.
+    Un campo propio puede ofrecer ``compiled_converter()`` para dar su propia
+    función de conversión.
+    """
+
+    def __init__(self, serializer):
+        self.serializer = serializer
+        meta = serializer.Meta
+        model_fields = {}
+        for model_field in meta.model._meta.concrete_fields:
+            model_fields[model_field.name] = model_fields[model_field.attname] = model_field
+        sources = getattr(meta, "compiled_sources", {})
+
+        self.columns = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, BaseSerializer):
+                raise ValueError(f"No se puede compilar {name!r}: es un serializer anidado.")
+            model_field = model_fields.get(field.source)
+            if name in sources:
+                path = sources[name]
+            elif model_field is not None:
+                path = model_field.attname
+            else:
+                raise ValueError(f"No se puede compilar {name!r}: declárelo en Meta.compiled_sources.")
+            self.columns.append((name, path, self._converter(field, model_field)))
+        self.paths = tuple(dict.fromkeys(path for _, path, _ in self.columns))
+
+    def _converter(self, field, model_field):
+        if hasattr(field, "compiled_converter"):
+            return field.compiled_converter()
+        if isinstance(field, drf_fields.FileField):
+            return self._file_converter(field, model_field)
+        if isinstance(field, drf_fields.DateTimeField):
+            return self._datetime_converter(field)
+        if isinstance(field, IDENTITY_FIELDS):
+            return None
+        if isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field is None:
+            return None
+        # Decimales y campos propios: su to_representation, sin get_attribute.
+        return field.to_representation
+
+    def _datetime_converter(self, field):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if output_format is None:
+            return None
+        # Igual que DateTimeField.enforce_timezone para valores con zona horaria.
+        zone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+        iso = output_format.lower() == drf_fields.ISO_8601
+
+        def convert(value):
+            if zone is not None:
+                value = value.astimezone(zone)
+            if not iso:
+                return value.strftime(output_format)
+            value = value.isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+        return convert
+
+    def _file_converter(self, field, model_field):
+        if not getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL):
+            return lambda name: name or None
+        return url_converter(model_field.storage, field.context.get("request"))
+
+    def values(self, queryset, *extra):
+        """``queryset.values()`` con las columnas del serializer y ``extra`` (p. ej. la llave de paginación)."""
+        return queryset.values(*dict.fromkeys((*self.paths, *extra)))
+
+    def to_representation(self, rows):
+        columns = self.columns
+        data = []
+        for row in rows:
+            item = {}
+            for name, path, convert in columns:
+                value = row[path]
+                # Como DRF: None se devuelve sin pasar por to_representation.
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return ReturnList(data, serializer=self.serializer)
+
+
+class CompiledListMixin:
+    """
+    Lista con ``CompiledSerializer`` en las acciones de ``compiled_actions``.
+    Si el serializer de la petición no se puede compilar (p. ej. con
+    ``?expand=``) se usa el camino normal de DRF.
+    """
+
+    compiled_actions = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+
+    def get_compiled_serializer(self):
+        if self.action not in self.compiled_actions:
+            return None
+        try:
+            return CompiledSerializer(self.get_serializer())
+        except ValueError:
+            return None
+
+    def list_response(self, queryset):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            page = self.paginate_queryset(queryset)
+            data = self.get_serializer(queryset if page is None else page, many=True).data
+        else:
+            # La llave de paginación tiene que venir en cada fila.
+            ordering = self.paginator.get_ordering(self.request, queryset, self) if self.paginator else ()
+            rows = compiled.values(queryset, *(field.lstrip("-") for field in ordering))
+            page = self.paginate_queryset(rows)
+            data = compiled.to_representation(rows if page is None else page)
+        return self.get_paginated_response(data) if page is not None else Response(data)
@@ -0,0 +1,79 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    ETag y Last-Modified para ``retrieve`` y ETag para ``list`` a partir de
+    ``updated_at``.
+
+    Los validadores salen de una consulta barata previa a la serialización: el
+    ``updated_at`` del objeto, o en los listados paginados el ``(pk,
+    updated_at)`` de las filas de la página pedida (el mismo rango sobre el
+    índice que usa la paginación, sin recorrer el resto del queryset). Sin
+    paginación se usan ``Max(updated_at)`` y ``Count`` del queryset filtrado
+    (el conteo detecta filas que salen del listado). Si el cliente ya tiene esa
+    versión se responde 304 sin serializar nada. Los listados no envían
+    Last-Modified: un borrado lógico no mueve el máximo de ``updated_at`` y
+    ``If-Modified-Since`` respondería 304 con datos viejos.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: kwargs[lookup_url_kwarg]}
+            )
+            updated_at = queryset.order_by().values_list("updated_at", flat=True).first()
+        except (TypeError, ValueError, ValidationError):
+            # Un pk mal formado (/events/abc/) es un 404, como en get_object_or_404.
+            raise Http404
+        if updated_at is None:
+            # No existe: retrieve() responde el 404 habitual.
+            return super().retrieve(request, *args, **kwargs)
+        render = super().retrieve
+        return self.conditional_response(
+            request, updated_at, render=lambda: render(request, *args, **kwargs), last_modified=updated_at
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        render = super().list
+        return self.conditional_list(request, queryset, lambda: render(request, *args, **kwargs))
+
+    def conditional_list(self, request, queryset, render):
+        return self.conditional_response(request, self.get_list_state(request, queryset), render=render)
+
+    def get_list_state(self, request, queryset):
+        if self.paginator is not None:
+            # Un paginador aparte: el de la vista guarda su estado para render().
+            paginator = type(self.paginator)()
+            rows = paginator.paginate_queryset(queryset.values_list("pk", "updated_at"), request, view=self)
+            if rows is not None:
+                return tuple(rows), paginator.has_next, paginator.has_previous
+        return tuple(queryset.order_by().aggregate(last_modified=Max("updated_at"), count=Count("pk")).values())
+
+    def conditional_response(self, request, state, render, last_modified=None):
+        etag = self.get_etag(request, state)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            return response
+
+        response = render()
+        if response.status_code == 200:
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def get_etag(self, request, state):
+        # La URL completa distingue filtros y páginas; el usuario, las vistas
+        # que dependen de él (p. ej. el feed por intereses).
+        parts = (request.get_full_path(), request.user.pk, state)
+        return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
@@ -0,0 +1,18 @@
+from django.db import connections, transaction
+
+
+def explain_index_usage(queryset, index_name, force=False):
+    """
+    Devuelve ``(usa_el_índice, plan)`` para la consulta del queryset.
+
+    Con ``force`` se desactivan los seq scans en PostgreSQL: en tablas casi
+    vacías el planificador prefiere leer la tabla entera y lo que se quiere
+    comprobar es que el índice *puede* resolver la consulta.
+    """
+    connection = connections[queryset.db]
+    with transaction.atomic(using=queryset.db):
+        if force and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+    return index_name in plan, plan
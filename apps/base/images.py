@@ -0,0 +1,198 @@
+"""
+Variantes redimensionadas (WebP y JPEG) de las imágenes subidas.
+
+Cada modelo registrado con ``register(model, "campo")`` tiene, junto a su
+``ImageField``, una columna ``<campo>_hash`` con el sha256 del archivo. Las
+variantes se guardan en el mismo almacenamiento bajo
+``variants/<hash[:2]>/<hash>/<tamaño>.<ext>``: dos archivos idénticos
+comparten variantes y volver a subir una imagen ya procesada solo cuesta
+leerla para calcular el hash.
+
+Al guardar una fila con una imagen nueva, el trabajo se encola al confirmar la
+transacción en un ``ThreadPoolExecutor``; mientras tanto el hash queda vacío y
+los serializers devuelven ``null`` en las variantes.
+"""
+
+import hashlib
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.db.models.signals import post_init, post_save
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Nombre de la variante -> lado mayor en píxeles (nunca se amplía).
+VARIANT_SIZES = {"thumb": 320, "medium": 1280}
+# Formato -> (extensión, opciones de Image.save).
+VARIANT_FORMATS = {
+    "webp": ("webp", {"format": "WEBP", "quality": 80, "method": 4}),
+    "jpeg": ("jpg", {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True}),
+}
+HASH_CHUNK_SIZE = 64 * 1024
+
+# Modelo -> campos de imagen con variantes.
+_registry = {}
+_executor = None
+
+
+def hash_field_name(field_name):
+    return f"{field_name}_hash"
+
+
+def content_hash(file):
+    digest = hashlib.sha256()
+    for chunk in file.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def variant_name(digest, size, fmt):
+    return f"variants/{digest[:2]}/{digest}/{size}.{VARIANT_FORMATS[fmt][0]}"
+
+
+def variant_names(digest):
+    """``{tamaño: {formato: nombre}}`` de las variantes de un hash."""
+    return {size: {fmt: variant_name(digest, size, fmt) for fmt in VARIANT_FORMATS} for size in VARIANT_SIZES}
+
+
+def _rgb(image):
+    # JPEG no tiene canal alfa: las transparencias se aplanan sobre blanco.
+    if image.mode == "RGB":
+        return image
+    background = Image.new("RGB", image.size, "white")
+    background.paste(image, mask=image.getchannel("A") if image.mode == "RGBA" else None)
+    return background
+
+
+def generate_variants(storage, file, digest):
+    """Crea en ``storage`` las variantes que falten para ``digest``; devuelve cuántas creó."""
+    missing = {
+        size: [fmt for fmt, name in formats.items() if not storage.exists(name)]
+        for size, formats in variant_names(digest).items()
+    }
+    missing = {size: formats for size, formats in missing.items() if formats}
+    if not missing:
+        return 0
+
+    file.seek(0)
+    with Image.open(file) as original:
+        # Con JPEG, draft() decodifica directamente a una escala reducida.
+        side = max(VARIANT_SIZES[size] for size in missing)
+        original.draft("RGB", (side, side))
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    created = 0
+    for size, formats in missing.items():
+        resized = image.copy()
+        resized.thumbnail((VARIANT_SIZES[size], VARIANT_SIZES[size]), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            name = variant_name(digest, size, fmt)
+            buffer = io.BytesIO()
+            (_rgb(resized) if fmt == "jpeg" else resized).save(buffer, **VARIANT_FORMATS[fmt][1])
+            saved = storage.save(name, ContentFile(buffer.getvalue()))
+            if saved != name:
+                # Otro worker la creó primero; el contenido es el mismo.
+                storage.delete(saved)
+            created += 1
+    return created
+
+
+def process(model, pk, field_name, using=None):
+    """Calcula el hash de la imagen de la fila y genera sus variantes (idempotente)."""
+    hash_field = hash_field_name(field_name)
+    manager = model._base_manager.db_manager(using)
+    row = manager.filter(pk=pk).values_list(field_name, hash_field).first()
+    if row is None or not row[0]:
+        return None
+    name, current = row
+
+    storage = model._meta.get_field(field_name).storage
+    try:
+        with storage.open(name, "rb") as file:
+            digest = content_hash(file)
+            generate_variants(storage, file, digest)
+    except (OSError, Image.DecompressionBombError):
+        logger.exception("No se pudieron generar las variantes de %s %s (%s)", model.__name__, pk, name)
+        return None
+
+    if digest != current:
+        # Solo si la imagen no cambió mientras se procesaba.
+        manager.filter(pk=pk, **{field_name: name}).update(**{hash_field: digest, "updated_at": timezone.now()})
+    return digest
+
+
+def _work(model, pk, field_name, using):
+    try:
+        process(model, pk, field_name, using)
+    except Exception:
+        logger.exception("Falló el procesamiento de imágenes de %s %s", model.__name__, pk)
+    finally:
+        # Cada hilo del pool abre sus propias conexiones.
+        connections.close_all()
+
+
+def executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.IMAGE_VARIANT_WORKERS, thread_name_prefix="image-variants")
+    return _executor
+
+
+def submit(model, pk, field_name, using=None):
+    """Procesa la imagen en el pool, o en línea si ``IMAGE_VARIANT_WORKERS`` es 0."""
+    if settings.IMAGE_VARIANT_WORKERS <= 0:
+        return process(model, pk, field_name, using)
+    return executor().submit(_work, model, pk, field_name, using)
+
+
+def _file_name(value):
+    return (getattr(value, "name", value) or "") if value is not None else ""
+
+
+def _remember_names(sender, instance, **kwargs):
+    # Nombre con que se cargó cada imagen (sin cargar los campos diferidos).
+    instance._image_names = {
+        name: _file_name(instance.__dict__[name]) for name in _registry[sender] if name in instance.__dict__
+    }
+
+
+def _schedule(sender, instance, raw=False, update_fields=None, using=None, **kwargs):
+    if raw:
+        return
+    previous = instance.__dict__.setdefault("_image_names", {})
+    for field_name in _registry[sender]:
+        if field_name not in instance.__dict__ or (update_fields is not None and field_name not in update_fields):
+            continue
+        name, old = _file_name(instance.__dict__[field_name]), previous.get(field_name)
+        if name == old or (old is None and not name):
+            continue
+        previous[field_name] = name
+
+        hash_field = hash_field_name(field_name)
+        if instance.__dict__.get(hash_field, True):
+            # Las variantes del hash anterior ya no corresponden a la imagen.
+            instance.__dict__[hash_field] = ""
+            sender._base_manager.using(using).filter(pk=instance.pk).update(**{hash_field: ""})
+        if name:
+            transaction.on_commit(partial(submit, sender, instance.pk, field_name, using), using=using)
+
+
+def register(model, *field_names):
+    """Genera variantes de ``field_names`` de ``model`` cada vez que cambie la imagen."""
+    _registry[model] = field_names
+    post_init.connect(_remember_names, sender=model, dispatch_uid=f"images:{model._meta.label}")
+    post_save.connect(_schedule, sender=model, dispatch_uid=f"images:{model._meta.label}")
+
+
+def registered_fields():
+    """Pares ``(modelo, campo)`` registrados."""
+    return [(model, name) for model, names in _registry.items() for name in names]
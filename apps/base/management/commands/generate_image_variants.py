@@ -0,0 +1,39 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.base import images
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera las variantes WebP/JPEG de las imágenes que aún no las tienen (p. ej. las subidas antes "
+        "de activar apps.base.images). Es idempotente: las variantes existentes no se recalculan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", action="append", dest="models", help="Modelo a procesar (app_label.Model).")
+        parser.add_argument("--all", action="store_true", help="Revisa también las filas que ya tienen hash.")
+
+    def handle(self, *args, **options):
+        fields = images.registered_fields()
+        if options["models"]:
+            try:
+                selected = {apps.get_model(label) for label in options["models"]}
+            except (LookupError, ValueError) as error:
+                raise CommandError(error)
+            fields = [(model, name) for model, name in fields if model in selected]
+
+        for model, field_name in fields:
+            queryset = model._base_manager.exclude(**{field_name: ""}).exclude(**{f"{field_name}__isnull": True})
+            if not options["all"]:
+                queryset = queryset.filter(**{images.hash_field_name(field_name): ""})
+            done = failed = 0
+            for pk in queryset.values_list("pk", flat=True).iterator():
+                if images.process(model, pk, field_name):
+                    done += 1
+                else:
+                    failed += 1
+            line = f"{model._meta.label}.{field_name}: {done} imágenes procesadas"
+            if failed:
+                line += f", {failed} con errores"
+            self.stdout.write(line)
@@ -0,0 +1,57 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.base.purge import purge_model, purgeable, retention_cutoff, soft_delete_models
+
+
+class Command(BaseCommand):
+    help = (
+        "Elimina definitivamente las filas que llevan en la papelera más de TRASH_RETENTION_DAYS días. "
+        "Pensado para correr periódicamente (cron / CronJob) contra la base en producción."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Días de retención (por defecto TRASH_RETENTION_DAYS).")
+        parser.add_argument("--batch-size", type=int, default=500, help="Filas por lote y transacción.")
+        parser.add_argument("--sleep", type=float, default=0.05, help="Pausa en segundos entre lotes.")
+        parser.add_argument("--model", action="append", dest="models", help="Modelo a purgar (app_label.Model).")
+        parser.add_argument("--dry-run", action="store_true", help="Solo cuenta las filas que se borrarían.")
+
+    def handle(self, *args, **options):
+        cutoff = retention_cutoff(options["days"])
+        models = soft_delete_models()
+        if options["models"]:
+            try:
+                selected = {apps.get_model(label) for label in options["models"]}
+            except (LookupError, ValueError) as error:
+                raise CommandError(error)
+            models = [model for model in models if model in selected]
+
+        total = 0
+        started = time.monotonic()
+        for model in models:
+            if options["dry_run"]:
+                count = model.trashed_objects.filter(purgeable(model, cutoff)).count()
+                self.stdout.write(f"{model._meta.label}: {count} filas por borrar")
+                continue
+
+            model_started = time.monotonic()
+            deleted, skipped = purge_model(model, cutoff, batch_size=options["batch_size"], sleep=options["sleep"])
+            elapsed = time.monotonic() - model_started
+            total += deleted
+            line = f"{model._meta.label}: {deleted} filas en {elapsed:.2f}s ({_rate(deleted, elapsed)} filas/s)"
+            if skipped:
+                line += f", {skipped} lotes saltados por locks"
+            self.stdout.write(line)
+
+        if not options["dry_run"]:
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                self.style.SUCCESS(f"Total: {total} filas en {elapsed:.2f}s ({_rate(total, elapsed)} filas/s)")
+            )
+
+
+def _rate(rows, seconds):
+    return f"{rows / seconds:.0f}" if seconds > 0 else "-"
@@ -0,0 +1,143 @@
+"""
+Vista que sirve los archivos de ``MEDIA_ROOT`` con ETag, respuestas
+condicionales y peticiones ``Range`` (un solo rango por petición; con
+varios se responde el archivo completo, como permite el RFC 9110).
+
+Los nombres direccionados por contenido (ver apps.base.storage) no cambian
+nunca de contenido y se sirven con ``Cache-Control: immutable`` por un año;
+el resto, con un máximo de ``MEDIA_CACHE_MAX_AGE`` segundos. Los
+directorios de trabajo (``RESERVED_DIRS``) nunca se sirven.
+"""
+
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_safe
+
+from apps.base.storage import content_digest
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+RANGE_CHUNK_SIZE = 64 * 1024
+RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Directorios de MEDIA_ROOT con archivos internos (p. ej. subidas en curso).
+RESERVED_DIRS = ("tmp",)
+
+
+def parse_range(header, size):
+    """
+    ``(inicio, fin)`` inclusivo de un encabezado ``Range`` con un solo rango;
+    ``None`` si hay que responder el archivo completo y ``ValueError`` si el
+    rango no se puede satisfacer.
+    """
+    match = RANGE_HEADER.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-N: los últimos N bytes.
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _etag(name, stat):
+    digest = content_digest(name)
+    if digest is not None:
+        return quote_etag(digest)
+    # Nombres antiguos: el ETag cambia con el archivo.
+    return quote_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+
+
+@require_safe
+def serve(request, path):
+    try:
+        full_path = default_storage.path(path)
+    except (SuspiciousFileOperation, NotImplementedError):
+        raise Http404
+    relative = os.path.relpath(full_path, default_storage.path(""))
+    if relative.split(os.sep, 1)[0] in RESERVED_DIRS:
+        raise Http404
+    try:
+        stat = os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    etag = _etag(path, stat)
+    last_modified = int(stat.st_mtime)
+    immutable = content_digest(path) is not None
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+        "Accept-Ranges": "bytes",
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}",
+    }
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        for header, value in headers.items():
+            response.headers[header] = value
+        return response
+
+    size = stat.st_size
+    byte_range = None
+    if "Range" in request.headers and _if_range_matches(request.headers.get("If-Range"), etag, last_modified):
+        try:
+            byte_range = parse_range(request.headers["Range"], size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response.headers["Content-Range"] = f"bytes */{size}"
+            return response
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or "application/octet-stream"
+    if byte_range is None:
+        response = FileResponse(open(full_path, "rb"), content_type=content_type)
+    else:
+        start, end = byte_range
+        chunks = _read_range(full_path, start, end - start + 1)
+        response = StreamingHttpResponse(chunks, content_type=content_type, status=206)
+        response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response.headers["Content-Length"] = str(end - start + 1)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    for header, value in headers.items():
+        response.headers[header] = value
+    return response
+
+
+def _if_range_matches(if_range, etag, last_modified):
+    # Sin If-Range se atiende el rango; con If-Range solo si el archivo no cambió.
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and since >= last_modified
@@ -1,12 +1,92 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.utils import timezone
 
+# Filas por UPDATE al propagar un borrado lógico o un restore.
+CASCADE_BATCH_SIZE = 2000
+
+
+def live_index(*fields, name, **kwargs):
+    """
+    Índice parcial ``WHERE deleted_at IS NULL``: coincide con el filtro que
+    BaseManager agrega a toda consulta y deja fuera las filas en la papelera.
+    """
+    return models.Index(fields=list(fields), name=name, condition=models.Q(deleted_at__isnull=True), **kwargs)
+
+
+def cascade_relations(model):
+    """
+    Relaciones inversas que arrastra el borrado lógico de ``model``: FKs con
+    ``on_delete=CASCADE`` desde otros BaseModel. Los ManyToMany con tabla
+    intermedia propia entran por aquí (la intermedia tiene FKs en cascada);
+    las intermedias automáticas no tienen ``deleted_at`` y se dejan intactas,
+    así que al restaurar el objeto sus relaciones siguen ahí.
+    """
+    return [
+        relation
+        for relation in model._meta.related_objects
+        if relation.one_to_many
+        and relation.on_delete is models.CASCADE
+        and issubclass(relation.related_model, BaseModel)
+    ]
+
+
+def _batched_update(queryset, batch_size, **values):
+    # UPDATE ... WHERE pk IN (SELECT pk ... LIMIT n) hasta agotar el queryset;
+    # cada UPDATE saca sus filas del filtro, así que no hace falta cursor.
+    model = queryset.model
+    total = 0
+    while True:
+        batch = queryset.order_by().values("pk")[:batch_size]
+        updated = models.QuerySet(model, using=queryset.db).filter(pk__in=batch).update(**values)
+        total += updated
+        if updated < batch_size:
+            return total
+
+
+def _cascade(queryset, batch_size, restore, **values):
+    """
+    Aplica ``values`` a las filas relacionadas de ``queryset`` de abajo hacia
+    arriba (nietos, luego hijos) con UPDATEs por lotes. Se procesan primero
+    los hijos porque su filtro depende del estado actual del padre:
+
+    - al borrar, hijos vivos de padres vivos;
+    - al restaurar, hijos cuyo ``deleted_at`` coincide con el del padre, es
+      decir, los que cayeron en el mismo borrado y no los que ya estaban en la
+      papelera desde antes.
+    """
+    for relation in cascade_relations(queryset.model):
+        name = relation.field.name
+        children = models.QuerySet(relation.related_model, using=queryset.db).filter(
+            **{f"{name}__in": queryset.values("pk")}
+        )
+        if restore:
+            children = children.filter(deleted_at=F(f"{name}__deleted_at"))
+        else:
+            children = children.filter(deleted_at__isnull=True)
+        _cascade(children, batch_size, restore, **values)
+        _batched_update(children, batch_size, **values)
+
 
 class BaseQuerySet(models.QuerySet):
 
-    def delete(self):
-        # set to soft deletion
-        return super(BaseQuerySet, self).update(deleted_at=timezone.now())
+    def delete(self, cascade=True, batch_size=CASCADE_BATCH_SIZE):
+        # set to soft deletion; las filas relacionadas en cascada comparten la
+        # misma marca de tiempo para poder restaurarlas juntas.
+        now = timezone.now()
+        live = self.filter(deleted_at__isnull=True)
+        with transaction.atomic(using=self.db):
+            if cascade:
+                _cascade(live, batch_size, False, deleted_at=now, updated_at=now)
+            return _batched_update(live, batch_size, deleted_at=now, updated_at=now)
+
+    def restore(self, cascade=True, batch_size=CASCADE_BATCH_SIZE):
+        now = timezone.now()
+        trashed = self.filter(deleted_at__isnull=False)
+        with transaction.atomic(using=self.db):
+            if cascade:
+                _cascade(trashed, batch_size, True, deleted_at=None, updated_at=now)
+            return _batched_update(trashed, batch_size, deleted_at=None, updated_at=now)
 
     def force_delete(self):
         # makes hard deletion
@@ -51,9 +131,16 @@ class BaseModel(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(blank=True, null=True, editable=False)
 
-    def delete(self, using=None, keep_parents=False):
-        self.deleted_at = timezone.now()
-        self.save(using=using)
+    def delete(self, using=None, keep_parents=False, cascade=True):
+        using = using or self._state.db
+        with transaction.atomic(using=using):
+            self.deleted_at = timezone.now()
+            if cascade:
+                row = type(self).all_objects.using(using).filter(pk=self.pk, deleted_at__isnull=True)
+                _cascade(row, CASCADE_BATCH_SIZE, False, deleted_at=self.deleted_at, updated_at=self.deleted_at)
+            # Solo las columnas del borrado: una instancia vieja no debe pisar
+            # otras columnas (p. ej. contadores desnormalizados).
+            self.save(using=using, update_fields=["deleted_at", "updated_at"])
 
     def force_delete(self, using=None, keep_parents=False):
         super(BaseModel, self).delete(using=using, keep_parents=keep_parents)
@@ -61,9 +148,13 @@ class BaseModel(models.Model):
     def is_trashed(self):
         return self.deleted_at is not None
 
-    def restore(self):
-        self.deleted_at = None
-        return self.save()
+    def restore(self, cascade=True):
+        with transaction.atomic(using=self._state.db):
+            if cascade and self.deleted_at is not None:
+                row = type(self).all_objects.using(self._state.db).filter(pk=self.pk, deleted_at__isnull=False)
+                _cascade(row, CASCADE_BATCH_SIZE, True, deleted_at=None, updated_at=timezone.now())
+            self.deleted_at = None
+            return self.save(update_fields=["deleted_at", "updated_at"])
 
     class Meta:
         abstract = True
\ No newline at end of file
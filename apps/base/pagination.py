@@ -0,0 +1,188 @@
+import datetime
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Paginación por cursor sobre una llave compuesta, p. ej. ``(event_date, id)``.
+
+    A diferencia de ``CursorPagination`` el cursor guarda el valor de todas las
+    columnas del ordenamiento, así que cada página se resuelve con un rango sobre
+    el índice compuesto correspondiente y nunca con un OFFSET: el costo es el
+    mismo en la primera página que en la página diez mil.
+
+    El último campo del ordenamiento debe ser único (normalmente ``id``) y
+    ninguno de los campos puede ser nulo.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = settings.PAGINATION_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.PAGINATION_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        if isinstance(queryset, QuerySet):
+            self.model = queryset.model
+            self.annotations = queryset.query.annotations
+        else:
+            self.model = type(queryset[0]) if queryset else None
+            self.annotations = {}
+
+        self.cursor = self.decode_cursor(request)
+        reverse, position = self.cursor if self.cursor else (False, None)
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        if isinstance(queryset, QuerySet):
+            queryset = queryset.order_by(*ordering)
+            if position is not None:
+                queryset = queryset.filter(_keyset_filter(ordering, position))
+        else:
+            queryset = _sort_rows(queryset, ordering)
+            if position is not None:
+                queryset = [row for row in queryset if _is_after(row, ordering, position)]
+
+        # Se pide un registro adicional para saber si existe otra página.
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        # La vista puede elegir otro ordenamiento según la petición (?ordering=).
+        get_pagination_ordering = getattr(view, "get_pagination_ordering", None)
+        ordering = get_pagination_ordering(queryset) if get_pagination_ordering else None
+        return tuple(ordering or self.ordering)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor((False, self._get_position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor((True, self._get_position(self.page[0])))
+
+    def encode_cursor(self, cursor):
+        reverse, position = cursor
+        # El cursor lleva el ordenamiento que lo produjo: con otro ?ordering= la
+        # posición no significa nada.
+        payload = {"r": int(reverse), "o": list(self.ordering), "p": position}
+        payload = json.dumps(payload, cls=_CursorEncoder, separators=(",", ":"))
+        encoded = urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            reverse = bool(payload["r"])
+            position = payload["p"]
+            if payload["o"] != list(self.ordering) or len(position) != len(self.ordering):
+                raise ValueError
+            position = [self._to_python(field, value) for field, value in zip(self.ordering, position)]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return reverse, position
+
+    def _get_position(self, instance):
+        return [_get_value(instance, field.lstrip("-")) for field in self.ordering]
+
+    def _to_python(self, field, value):
+        # Los valores del cursor viajan como JSON; las fechas y decimales se
+        # convierten de nuevo con el campo del modelo (o de la anotación) para
+        # poder compararlos.
+        name = field.lstrip("-")
+        if name in self.annotations:
+            return self.annotations[name].output_field.to_python(value)
+        try:
+            model_field = self.model._meta.get_field(name)
+        except (AttributeError, FieldDoesNotExist):
+            return value
+        return model_field.to_python(value)
+
+
+class _CursorEncoder(json.JSONEncoder):
+    # Igual que DjangoJSONEncoder pero sin recortar los microsegundos: el
+    # cursor tiene que reproducir el valor exacto de la columna.
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.date)):
+            return o.isoformat()
+        if isinstance(o, Decimal):
+            return str(o)
+        return super().default(o)
+
+
+def _get_value(instance, attr):
+    if isinstance(instance, dict):
+        return instance[attr]
+    return getattr(instance, attr)
+
+
+def _reverse_ordering(ordering):
+    return tuple(field[1:] if field.startswith("-") else f"-{field}" for field in ordering)
+
+
+def _keyset_filter(ordering, position):
+    """
+    Construye la condición ``(a, b, c) > (pa, pb, pc)`` respetando la dirección
+    de cada campo. Se antepone ``a >= pa`` para que el planificador pueda
+    resolver la consulta como un rango sobre el índice compuesto.
+    """
+    lookups = []
+    for field, value in zip(ordering, position):
+        name = field.lstrip("-")
+        op = "lt" if field.startswith("-") else "gt"
+        lookups.append((name, op, value))
+
+    name, op, value = lookups[-1]
+    condition = Q(**{f"{name}__{op}": value})
+    for name, op, value in reversed(lookups[:-1]):
+        condition = Q(**{f"{name}__{op}": value}) | (Q(**{name: value}) & condition)
+
+    name, op, value = lookups[0]
+    return Q(**{f"{name}__{op}e": value}) & condition
+
+
+def _sort_rows(rows, ordering):
+    # Ordenamientos estables del último campo al primero: admite direcciones mixtas.
+    rows = list(rows)
+    for field in reversed(ordering):
+        rows.sort(key=lambda row: _get_value(row, field.lstrip("-")), reverse=field.startswith("-"))
+    return rows
+
+
+def _is_after(row, ordering, position):
+    # Equivalente en Python de _keyset_filter.
+    for field, value in zip(ordering, position):
+        current = _get_value(row, field.lstrip("-"))
+        if current != value:
+            return current < value if field.startswith("-") else current > value
+    return False
@@ -0,0 +1,97 @@
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.db.models import CASCADE, Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.base.models import BaseModel
+
+# Tiempo máximo que un lote espera por un lock en PostgreSQL; si otra
+# transacción tiene las filas ocupadas el lote se salta y se reintenta en la
+# próxima ejecución en lugar de bloquear a la aplicación.
+LOCK_TIMEOUT = "2s"
+
+
+def soft_delete_models():
+    """Modelos concretos que heredan de BaseModel, hijos antes que padres."""
+    models = [model for model in apps.get_models() if issubclass(model, BaseModel)]
+    # Borrar primero las tablas que apuntan a otras reduce lo que el collector
+    # de Django tiene que arrastrar en cascada desde los padres.
+    return sorted(models, key=lambda model: -len(_parents(model, models)))
+
+
+def _parents(model, models, seen=None):
+    seen = set() if seen is None else seen
+    for field in model._meta.concrete_fields:
+        parent = field.related_model
+        if field.many_to_one and parent in models and parent not in seen and parent is not model:
+            seen.add(parent)
+            _parents(parent, models, seen)
+    return seen
+
+
+def purgeable(model, cutoff, _seen=()):
+    """
+    Filtro de las filas de ``model`` vencidas en la papelera que se pueden
+    borrar sin que el collector arrastre en cascada hijos vivos o que aún
+    están dentro del plazo de retención (p. ej. una inscripción restaurada
+    por separado mientras el evento seguía en la papelera). Esos padres
+    esperan a que sus hijos venzan.
+    """
+    condition = Q(deleted_at__lt=cutoff)
+    for relation in model._meta.related_objects:
+        child = relation.related_model
+        if not (relation.one_to_many or relation.one_to_one) or relation.on_delete is not CASCADE:
+            continue
+        if not issubclass(child, BaseModel) or child in _seen:
+            continue
+        children = child.all_objects.filter(**{relation.field.name: OuterRef("pk")})
+        condition &= ~Exists(children.exclude(purgeable(child, cutoff, (*_seen, model))))
+    return condition
+
+
+def retention_cutoff(days=None):
+    days = settings.TRASH_RETENTION_DAYS if days is None else days
+    return timezone.now() - timedelta(days=days)
+
+
+def purge_model(model, cutoff, batch_size=500, sleep=0.0, using=DEFAULT_DB_ALIAS):
+    """
+    Borra definitivamente las filas de ``model`` que están en la papelera
+    desde antes de ``cutoff`` (y cumplen ``purgeable``).
+
+    Recorre la tabla por pk ascendente (keyset, nunca OFFSET) y borra cada
+    lote con ``BaseQuerySet.force_delete`` en su propia transacción corta;
+    entre lotes duerme ``sleep`` segundos para no saturar la base. Devuelve
+    ``(filas_borradas, lotes_saltados)``; las filas borradas incluyen las que
+    el collector de Django arrastró en cascada.
+    """
+    connection = connections[using]
+    deleted = skipped = 0
+    last_pk = None
+    while True:
+        pending = model.trashed_objects.using(using).filter(purgeable(model, cutoff))
+        if last_pk is not None:
+            pending = pending.filter(pk__gt=last_pk)
+        pks = list(pending.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return deleted, skipped
+        last_pk = pks[-1]
+
+        try:
+            with transaction.atomic(using=using):
+                if connection.vendor == "postgresql":
+                    with connection.cursor() as cursor:
+                        cursor.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+                # Se repite el filtro: una fila restaurada entre la lectura y
+                # el borrado no debe perderse.
+                batch = model.all_objects.using(using).filter(purgeable(model, cutoff), pk__in=pks)
+                deleted += batch.force_delete()[0]
+        except OperationalError:
+            skipped += 1
+
+        if sleep:
+            time.sleep(sleep)
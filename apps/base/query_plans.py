@@ -0,0 +1,129 @@
+from rest_framework.exceptions import ValidationError
+
+
+class QueryPlan:
+    """
+    Relaciones y columnas que necesita un serializer para no disparar consultas
+    por cada fila (N+1). Se declara en el ``Meta`` del serializer como
+    ``query_plan`` y ``QueryPlanMixin`` lo aplica al queryset de la acción.
+
+    ``only`` lista columnas de modelos relacionados (``"event_organizer__email"``);
+    las columnas propias del modelo se conservan salvo las que estén en ``defer``,
+    o se limitan a ``fields`` (más la llave primaria) si se indica.
+    """
+
+    def __init__(self, select_related=(), prefetch_related=(), only=(), defer=(), fields=None):
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+        self.only = tuple(only)
+        self.defer = tuple(defer)
+        self.fields = None if fields is None else tuple(fields)
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only or self.defer or self.fields is not None:
+            local_fields = [
+                field.name
+                for field in queryset.model._meta.concrete_fields
+                if field.name not in self.defer
+                and (self.fields is None or field.name in self.fields or field.primary_key)
+            ]
+            queryset = queryset.only(*local_fields, *self.only)
+        return queryset
+
+    def merge(self, *plans):
+        """Une las relaciones y columnas relacionadas de otros planes a este."""
+        plan = QueryPlan(self.select_related, self.prefetch_related, self.only, self.defer, self.fields)
+        for other in plans:
+            plan.select_related += tuple(name for name in other.select_related if name not in plan.select_related)
+            plan.prefetch_related += tuple(name for name in other.prefetch_related if name not in plan.prefetch_related)
+            plan.only += tuple(name for name in other.only if name not in plan.only)
+        return plan
+
+
+def get_query_plan(serializer_class):
+    return getattr(getattr(serializer_class, "Meta", None), "query_plan", None)
+
+
+def parse_field_list(value):
+    """``"a, b,c"`` -> ``{"a", "b", "c"}``; ``None`` si el parámetro no vino."""
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def sparse_query_plan(serializer_class, fields=None, expand=()):
+    """
+    Plan para una respuesta con ``?fields=`` y ``?expand=``: carga solo las
+    columnas de los campos pedidos y solo las relaciones que esos campos (o
+    las expansiones) necesitan. Cada serializer declara en su ``Meta``:
+
+    - ``field_query_plans``: lo que necesita cada campo relacionado;
+    - ``expandable``: ``{campo: (serializer, QueryPlan)}`` para las expansiones.
+    """
+    meta = serializer_class.Meta
+    base = getattr(meta, "query_plan", None) or QueryPlan()
+    expandable = getattr(meta, "expandable", {})
+    expanded = [expandable[name][1] for name in expand]
+    if fields is None:
+        return base.merge(*expanded)
+
+    serializer_fields = serializer_class().fields
+    model_fields = {}
+    for field in meta.model._meta.concrete_fields:
+        model_fields[field.name] = model_fields[field.attname] = field.name
+    columns = {model_fields[serializer_fields[name].source] for name in fields if serializer_fields[name].source in model_fields}
+
+    field_plans = getattr(meta, "field_query_plans", {})
+    related = [field_plans[name] for name in fields if name in field_plans]
+    return QueryPlan(defer=base.defer, fields=columns).merge(*related, *expanded)
+
+
+class QueryPlanMixin:
+    """
+    Aplica al queryset de cada acción el ``query_plan`` de su serializer.
+
+    En las acciones de lectura (``sparse_actions``) acepta ``?fields=`` y
+    ``?expand=`` si el serializer usa ``SparseFieldsetsMixin``: el serializer
+    omite o expande campos y el queryset se ajusta con ``sparse_query_plan``.
+    """
+
+    sparse_actions = ("list", "retrieve")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        fields, expand = self.get_sparse_fieldset(serializer_class)
+        if fields is not None or expand:
+            return sparse_query_plan(serializer_class, fields, expand).apply(queryset)
+        plan = get_query_plan(serializer_class)
+        return plan.apply(queryset) if plan else queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        fields, expand = self.get_sparse_fieldset(self.get_serializer_class())
+        context.update(fields=fields, expand=expand)
+        return context
+
+    def get_sparse_fieldset(self, serializer_class):
+        """``(campos, expansiones)`` pedidos en la URL, validados contra el serializer."""
+        request = getattr(self, "request", None)
+        if request is None or self.action not in self.sparse_actions or not hasattr(serializer_class, "expandable_fields"):
+            return None, set()
+
+        expand = parse_field_list(request.query_params.get("expand")) or set()
+        unknown = expand - set(serializer_class.expandable_fields())
+        if unknown:
+            raise ValidationError({"expand": f"No se pueden expandir: {', '.join(sorted(unknown))}."})
+
+        fields = parse_field_list(request.query_params.get("fields"))
+        if fields is not None:
+            # Expandir un campo también lo incluye.
+            fields |= expand
+            unknown = fields - set(serializer_class().fields)
+            if unknown:
+                raise ValidationError({"fields": f"Campos desconocidos: {', '.join(sorted(unknown))}."})
+        return fields, expand
@@ -0,0 +1,68 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+
+from apps.base import images
+from apps.base.compiled import url_converter
+
+
+class SparseFieldsetsMixin:
+    """
+    Serializer que respeta ``fields`` y ``expand`` del contexto (los pone
+    ``QueryPlanMixin`` a partir de ``?fields=`` y ``?expand=``).
+
+    ``Meta.expandable`` mapea cada campo expandible a ``(serializer, QueryPlan)``;
+    al expandirlo el campo se reemplaza por ese serializer anidado.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get("fields")
+        expand = self.context.get("expand") or ()
+
+        expandable = getattr(self.Meta, "expandable", {})
+        for name in expand:
+            serializer_class, _ = expandable[name]
+            source = self.fields[name].source
+            self.fields[name] = serializer_class(read_only=True, **({} if source == name else {"source": source}))
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def expandable_fields(cls):
+        return tuple(getattr(cls.Meta, "expandable", {}))
+
+
+@extend_schema_field(OpenApiTypes.OBJECT)
+class ImageVariantsField(serializers.Field):
+    """
+    URLs de las variantes de ``image_field`` (ver apps.base.images) como
+    ``{tamaño: {formato: url}}``; ``null`` mientras no se hayan generado.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        kwargs.setdefault("source", images.hash_field_name(image_field))
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, digest):
+        # El convertidor se arma una vez por serializer, no por fila.
+        if not hasattr(self, "_convert"):
+            self._convert = self.compiled_converter()
+        return self._convert(digest)
+
+    def compiled_converter(self):
+        storage = self.parent.Meta.model._meta.get_field(self.image_field).storage
+        url = url_converter(storage, self.context.get("request"))
+
+        def convert(digest):
+            if not digest:
+                return None
+            return {
+                size: {fmt: url(name) for fmt, name in formats.items()}
+                for size, formats in images.variant_names(digest).items()
+            }
+
+        return convert
@@ -0,0 +1,74 @@
+"""
+Almacenamiento de media direccionado por contenido.
+
+``ContentAddressedStorage`` guarda cada archivo como
+``<hash[:2]>/<sha256><ext>`` sin importar el nombre ni el ``upload_to``: dos
+subidas idénticas terminan en el mismo archivo y la segunda no escribe nada.
+Como un nombre nunca cambia de contenido, ``apps.base.media.serve`` puede
+servirlos con ``Cache-Control: immutable``.
+
+Un mismo archivo puede estar referenciado por varias filas, así que no se
+debe borrar al borrar una de ellas.
+"""
+
+import hashlib
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASH_CHUNK_SIZE = 64 * 1024
+# <hash[:2]>/<sha256><ext>, y las variantes de apps.base.images. El prefijo
+# debe ser el inicio del hash: otro nombre con esa forma no es inmutable.
+CONTENT_ADDRESSED_NAME = re.compile(
+    r"^(?:(?P<prefix>[0-9a-f]{2})/(?P<digest>(?P=prefix)[0-9a-f]{62})\.\w+"
+    r"|variants/(?P<variant_prefix>[0-9a-f]{2})/(?P=variant_prefix)[0-9a-f]{62}/\w+\.\w+)$"
+)
+
+
+def content_digest(name):
+    """sha256 que identifica el contenido de ``name``, o ``None`` si el nombre no es direccionado por contenido."""
+    match = CONTENT_ADDRESSED_NAME.match(name)
+    if match is None:
+        return None
+    # Una variante se identifica por el hash del original y su nombre.
+    return match["digest"] or hashlib.sha256(name.encode()).hexdigest()
+
+
+@deconstructible(path="apps.base.storage.ContentAddressedStorage")
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    ``FileSystemStorage`` que nombra cada archivo por su sha256. Los nombres
+    que ya derivan del contenido (``exact_prefixes``, p. ej. las variantes de
+    apps.base.images) se guardan tal cual.
+    """
+
+    def __init__(self, *args, exact_prefixes=("variants/",), **kwargs):
+        # Dos escrituras simultáneas de un mismo nombre tienen el mismo contenido.
+        kwargs.setdefault("allow_overwrite", True)
+        super().__init__(*args, **kwargs)
+        self.exact_prefixes = tuple(exact_prefixes)
+
+    def get_available_name(self, name, max_length=None):
+        # El nombre definitivo lo decide _save() a partir del contenido.
+        return name
+
+    def _save(self, name, content):
+        if name.startswith(self.exact_prefixes):
+            return name if self.exists(name) else super()._save(name, content)
+
+        digest = getattr(content, "sha256", None) or self.hash_content(content)
+        _, ext = os.path.splitext(name)
+        name = f"{digest[:2]}/{digest}{ext.lower()}"
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
+
+    @staticmethod
+    def hash_content(content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        content.seek(0)
+        return digest.hexdigest()
@@ -0,0 +1,30 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def assert_list_queries_constant(testcase, url, create_row, sizes=(1, 5), params=None):
+    """
+    Falla si el número de consultas de un endpoint de listado crece con el
+    tamaño de la página, que es el síntoma de un N+1 en el serializer.
+
+    ``create_row(i)`` debe crear una fila visible en el listado; se crean tantas
+    como la página más grande y se compara el conteo de consultas entre tamaños.
+    """
+    for i in range(max(sizes)):
+        create_row(i)
+
+    # Una petición previa para que los caches en memoria (p. ej. el catálogo
+    # de categorías) ya estén cargados y no cuenten en la primera medición.
+    testcase.client.get(url, {**(params or {}), "page_size": min(sizes)})
+
+    counts = {}
+    for size in sizes:
+        with CaptureQueriesContext(connection) as context:
+            response = testcase.client.get(url, {**(params or {}), "page_size": size})
+        testcase.assertEqual(response.status_code, 200)
+        testcase.assertEqual(len(response.data["results"]), size)
+        counts[size] = len(context)
+
+    testcase.assertEqual(
+        len(set(counts.values())), 1, f"El número de consultas crece con el tamaño de la página: {counts}"
+    )
@@ -0,0 +1,116 @@
+import io
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from apps.base import images
+from apps.events.models import Event, EventCategory
+from apps.events.serializers import EventSerializer
+
+
+def _png(size=(2000, 1000), color=(200, 30, 30, 128)):
+    buffer = io.BytesIO()
+    Image.new("RGBA", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.IMAGE_VARIANT_WORKERS = 0
+    return tmp_path
+
+
+@pytest.fixture
+def event(django_user_model):
+    organizer = django_user_model.objects.create_user(email="organizer@test.com", password="123456", username="organizer")
+    return Event.objects.create(
+        event_name="Evento",
+        event_category=EventCategory.objects.create(name="Tecnología"),
+        event_organizer=organizer,
+        event_description="Descripción del evento",
+        event_location="Virtual",
+        event_date=timezone.now() + timedelta(days=10),
+        paid=False,
+        has_limit=False,
+    )
+
+
+def _upload(event, content, django_capture_on_commit_callbacks, name="foto.png"):
+    with django_capture_on_commit_callbacks(execute=True):
+        event.event_picture = SimpleUploadedFile(name, content, content_type="image/png")
+        event.save()
+    event.refresh_from_db()
+    return event
+
+
+@pytest.mark.django_db
+def test_upload_generates_variants(media, event, django_capture_on_commit_callbacks):
+    content = _png()
+    event = _upload(event, content, django_capture_on_commit_callbacks)
+
+    assert event.event_picture_hash == images.content_hash(SimpleUploadedFile("x", content))
+    for size, formats in images.variant_names(event.event_picture_hash).items():
+        for fmt, name in formats.items():
+            with default_storage.open(name) as file, Image.open(file) as variant:
+                assert max(variant.size) == images.VARIANT_SIZES[size]
+                assert variant.format == images.VARIANT_FORMATS[fmt][1]["format"]
+
+
+@pytest.mark.django_db
+def test_identical_upload_reuses_variants(media, event, django_capture_on_commit_callbacks, monkeypatch):
+    content = _png()
+    digest = _upload(event, content, django_capture_on_commit_callbacks).event_picture_hash
+
+    calls = []
+    monkeypatch.setattr(images.Image, "open", lambda *args, **kwargs: calls.append(args))
+    event = _upload(event, content, django_capture_on_commit_callbacks, name="otra.png")
+
+    assert event.event_picture_hash == digest
+    assert calls == []
+
+
+@pytest.mark.django_db
+def test_changing_picture_clears_hash_until_processed(media, event, django_capture_on_commit_callbacks):
+    _upload(event, _png(), django_capture_on_commit_callbacks)
+
+    event.event_picture = SimpleUploadedFile("nueva.png", _png(color=(0, 0, 255, 255)), content_type="image/png")
+    event.save()
+
+    assert Event.objects.get(pk=event.pk).event_picture_hash == ""
+
+
+@pytest.mark.django_db
+def test_serializer_exposes_variant_urls(media, event, django_capture_on_commit_callbacks):
+    assert EventSerializer(event).data["event_picture_variants"] is None
+
+    event = _upload(event, _png(), django_capture_on_commit_callbacks)
+    variants = EventSerializer(event).data["event_picture_variants"]
+
+    assert set(variants) == set(images.VARIANT_SIZES)
+    assert variants["thumb"]["webp"] == f"/media/variants/{event.event_picture_hash[:2]}/{event.event_picture_hash}/thumb.webp"
+
+
+@pytest.mark.django_db
+def test_invalid_image_keeps_hash_empty(media, event, django_capture_on_commit_callbacks):
+    event = _upload(event, b"no es una imagen", django_capture_on_commit_callbacks, name="falsa.png")
+
+    assert event.event_picture_hash == ""
+
+
+@pytest.mark.django_db
+def test_command_backfills_missing_variants(media, event):
+    name = default_storage.save("event_pictures/previa.png", io.BytesIO(_png()))
+    Event.objects.filter(pk=event.pk).update(event_picture=name)
+
+    out = StringIO()
+    call_command("generate_image_variants", "--model", "events.Event", stdout=out)
+
+    assert "1 imágenes procesadas" in out.getvalue()
+    assert Event.objects.get(pk=event.pk).event_picture_hash
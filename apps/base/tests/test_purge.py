@@ -0,0 +1,88 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.base.purge import purge_model, retention_cutoff, soft_delete_models
+from apps.events.models import Event, EventCategory, EventRegisteredUser, EventReview
+
+
+@pytest.fixture
+def events(django_user_model):
+    organizer = django_user_model.objects.create_user(email="organizer@test.com", password="123456", username="organizer")
+    category = EventCategory.objects.create(name="Tecnología")
+    return [
+        Event.objects.create(
+            event_name=f"Evento {i}",
+            event_category=category,
+            event_organizer=organizer,
+            event_description="Descripción del evento",
+            event_location="Virtual",
+            event_date=timezone.now() + timedelta(days=10),
+            paid=False,
+            has_limit=False,
+        )
+        for i in range(5)
+    ]
+
+
+def _trash(instance, days_ago):
+    instance.delete()
+    type(instance).all_objects.filter(pk=instance.pk).update(deleted_at=timezone.now() - timedelta(days=days_ago))
+
+
+@pytest.mark.django_db
+def test_purge_respects_retention(events):
+    old, recent, live = events[:3], events[3], events[4]
+    for event in old:
+        _trash(event, days_ago=40)
+    _trash(recent, days_ago=5)
+
+    deleted, skipped = purge_model(Event, retention_cutoff(30), batch_size=2)
+
+    assert (deleted, skipped) == (3, 0)
+    assert set(Event.all_objects.values_list("pk", flat=True)) == {recent.pk, live.pk}
+
+
+@pytest.mark.django_db
+def test_purge_keeps_parents_with_live_children(events, django_user_model):
+    customer = django_user_model.objects.create_user(email="customer@test.com", password="123456", username="customer")
+    restored, expired = events[:2]
+    live_registration = EventRegisteredUser.objects.create(event=restored, user=customer)
+    EventRegisteredUser.objects.create(event=expired, user=customer)
+    for event in (restored, expired):
+        _trash(event, days_ago=40)
+    # La inscripción se restauró sola; el evento sigue en la papelera.
+    EventRegisteredUser.all_objects.filter(pk=live_registration.pk).update(deleted_at=None)
+    EventRegisteredUser.all_objects.filter(event=expired).update(deleted_at=timezone.now() - timedelta(days=40))
+
+    purge_model(Event, retention_cutoff(30))
+
+    assert set(Event.all_objects.filter(pk__in=[restored.pk, expired.pk]).values_list("pk", flat=True)) == {restored.pk}
+    assert EventRegisteredUser.objects.filter(pk=live_registration.pk).exists()
+    assert not EventRegisteredUser.all_objects.filter(event_id=expired.pk).exists()
+
+
+@pytest.mark.django_db
+def test_children_are_purged_before_parents():
+    models = soft_delete_models()
+    assert models.index(EventRegisteredUser) < models.index(Event) < models.index(EventCategory)
+    assert models.index(EventReview) < models.index(Event)
+
+
+@pytest.mark.django_db
+def test_purge_command(events, settings):
+    settings.TRASH_RETENTION_DAYS = 30
+    _trash(events[0], days_ago=31)
+
+    out = StringIO()
+    call_command("purge_trashed", dry_run=True, model=["events.Event"], stdout=out)
+    assert "events.Event: 1 filas por borrar" in out.getvalue()
+    assert Event.all_objects.count() == 5
+
+    out = StringIO()
+    call_command("purge_trashed", sleep=0, stdout=out)
+    assert "filas/s" in out.getvalue()
+    assert Event.all_objects.count() == 4
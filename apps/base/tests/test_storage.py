@@ -0,0 +1,171 @@
+import hashlib
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from apps.base.media import IMMUTABLE_CACHE_CONTROL, parse_range
+from apps.base.storage import ContentAddressedStorage, content_digest
+
+CONTENT = bytes(range(256)) * 40
+DIGEST = hashlib.sha256(CONTENT).hexdigest()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return ContentAddressedStorage(location=tmp_path, base_url="/media/")
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def test_names_files_by_content_hash(storage):
+    name = storage.save("event_pictures/Foto.JPG", ContentFile(CONTENT))
+
+    assert name == f"{DIGEST[:2]}/{DIGEST}.jpg"
+    with storage.open(name) as file:
+        assert file.read() == CONTENT
+
+
+def test_identical_uploads_share_one_file(storage, tmp_path):
+    first = storage.save("products/a.png", ContentFile(CONTENT))
+    second = storage.save("profiles/b.png", ContentFile(CONTENT))
+    other = storage.save("products/a.png", ContentFile(CONTENT + b"!"))
+
+    assert first == second != other
+    assert len(list((tmp_path / DIGEST[:2]).iterdir())) == 1
+
+
+def test_uses_hash_computed_during_upload(storage):
+    content = ContentFile(CONTENT)
+    content.sha256 = "f" * 64
+
+    assert storage.save("x.png", content) == f"ff/{'f' * 64}.png"
+
+
+def test_exact_prefixes_keep_their_name(storage):
+    name = f"variants/{DIGEST[:2]}/{DIGEST}/thumb.webp"
+
+    assert storage.save(name, ContentFile(b"webp")) == name
+    assert storage.save(name, ContentFile(b"webp")) == name
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-10", (990, 999)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=5-1", "bytes=-0"])
+def test_parse_range_unsatisfiable(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 1000)
+
+
+def _url(name):
+    return f"/media/{name}"
+
+
+def test_serves_content_addressed_files_as_immutable(client, media):
+    name = default_storage.save("event_pictures/foto.png", ContentFile(CONTENT))
+
+    response = client.get(_url(name))
+
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == CONTENT
+    assert response["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    assert response["ETag"] == f'"{DIGEST}"'
+    assert response["Accept-Ranges"] == "bytes"
+    assert response["Content-Type"] == "image/png"
+
+
+def test_if_none_match_returns_not_modified(client, media):
+    name = default_storage.save("foto.png", ContentFile(CONTENT))
+
+    response = client.get(_url(name), HTTP_IF_NONE_MATCH=f'"{DIGEST}"')
+
+    assert response.status_code == 304
+    assert response["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+
+
+def test_range_request(client, media):
+    name = default_storage.save("foto.png", ContentFile(CONTENT))
+
+    response = client.get(_url(name), HTTP_RANGE="bytes=10-19")
+
+    assert response.status_code == 206
+    assert b"".join(response.streaming_content) == CONTENT[10:20]
+    assert response["Content-Range"] == f"bytes 10-19/{len(CONTENT)}"
+    assert response["Content-Length"] == "10"
+
+
+def test_unsatisfiable_range(client, media):
+    name = default_storage.save("foto.png", ContentFile(CONTENT))
+
+    response = client.get(_url(name), HTTP_RANGE=f"bytes={len(CONTENT)}-")
+
+    assert response.status_code == 416
+    assert response["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_stale_if_range_returns_whole_file(client, media):
+    name = default_storage.save("foto.png", ContentFile(CONTENT))
+
+    response = client.get(_url(name), HTTP_RANGE="bytes=10-19", HTTP_IF_RANGE='"otro"')
+
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == CONTENT
+
+
+def test_legacy_names_are_not_immutable(client, media, settings):
+    (media / "event_pictures").mkdir()
+    (media / "event_pictures" / "vieja.png").write_bytes(CONTENT)
+
+    response = client.get(_url("event_pictures/vieja.png"))
+
+    assert response.status_code == 200
+    assert response["Cache-Control"] == f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+
+
+@pytest.mark.parametrize(
+    "name",
+    [f"{DIGEST[:2]}/{DIGEST}.png", f"variants/{DIGEST[:2]}/{DIGEST}/320.webp"],
+)
+def test_content_digest(name):
+    assert content_digest(name) is not None
+
+
+@pytest.mark.parametrize(
+    "name",
+    [f"00/{DIGEST}.png", f"variants/00/{DIGEST}/320.webp", f"{DIGEST[:2]}/{DIGEST[:-1]}.png"],
+)
+def test_content_digest_requires_matching_prefix(name):
+    # DIGEST no empieza por "00": el prefijo no coincide con el hash.
+    assert content_digest(name) is None
+
+
+@pytest.mark.parametrize("path", ["tmp/subida.png", "tmp//subida.png", "./tmp/subida.png"])
+def test_reserved_dirs_are_not_found(client, media, path):
+    (media / "tmp").mkdir()
+    (media / "tmp" / "subida.png").write_bytes(CONTENT)
+
+    assert client.get(_url(path)).status_code == 404
+
+
+@pytest.mark.parametrize("path", ["no-existe.png", "../settings.py", "event_pictures"])
+def test_missing_or_outside_files_are_not_found(client, media, path):
+    (media / "event_pictures").mkdir(exist_ok=True)
+
+    assert client.get(_url(path)).status_code == 404
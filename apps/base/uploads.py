@@ -0,0 +1,135 @@
+"""
+Subida de imágenes en streaming.
+
+``ImageUploadHandler`` escribe cada chunk del multipart directamente a un
+archivo temporal en ``UPLOAD_TEMP_DIR``, fuera de ``MEDIA_ROOT`` para que
+apps.base.media.serve no exponga subidas a medias pero en el mismo sistema de
+archivos (así guardarlo después en el almacenamiento local es un ``rename`` y
+no una copia), calcula el sha256 a
+medida que llegan los datos y corta la subida en cuanto el cuerpo supera
+``IMAGE_UPLOAD_MAX_SIZE`` o los primeros bytes no son de una imagen, sin
+leer el resto del cuerpo.
+"""
+
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile, UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+# Firmas de los formatos aceptados: (desplazamiento, bytes).
+IMAGE_SIGNATURES = (
+    ((0, b"\xff\xd8\xff"),),  # JPEG
+    ((0, b"\x89PNG\r\n\x1a\n"),),  # PNG
+    ((0, b"GIF87a"),),
+    ((0, b"GIF89a"),),
+    ((0, b"RIFF"), (8, b"WEBP")),
+)
+SIGNATURE_SIZE = 12
+# Holgura para los campos de texto y los encabezados del multipart.
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "El archivo supera el tamaño máximo permitido."
+    default_code = "upload_too_large"
+
+
+def is_image_header(header):
+    return any(
+        all(header[offset:offset + len(magic)] == magic for offset, magic in signature) for signature in IMAGE_SIGNATURES
+    )
+
+
+def upload_temp_dir():
+    os.makedirs(settings.UPLOAD_TEMP_DIR, exist_ok=True)
+    return settings.UPLOAD_TEMP_DIR
+
+
+class HashedUploadedFile(TemporaryUploadedFile):
+    """``TemporaryUploadedFile`` en ``UPLOAD_TEMP_DIR`` con el sha256 de su contenido en ``sha256``."""
+
+    def __init__(self, name, content_type, charset, content_type_extra=None):
+        _, ext = os.path.splitext(name)
+        file = tempfile.NamedTemporaryFile(suffix=".upload" + ext, dir=upload_temp_dir())
+        UploadedFile.__init__(self, file, name, content_type, 0, charset, content_type_extra)
+        self.sha256 = None
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """
+    Reemplaza a los handlers por defecto de Django en las vistas con
+    ``StreamingUploadMixin``: ningún archivo se guarda en memoria.
+    """
+
+    def __init__(self, request=None, max_size=None):
+        super().__init__(request)
+        self.max_size = max_size or settings.IMAGE_UPLOAD_MAX_SIZE
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # Si el Content-Length ya delata un cuerpo demasiado grande no se lee nada.
+        if content_length > self.max_size + MULTIPART_OVERHEAD:
+            raise UploadTooLarge()
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        if self.content_length is not None and self.content_length > self.max_size:
+            raise UploadTooLarge()
+        self.file = HashedUploadedFile(self.file_name, self.content_type, self.charset, self.content_type_extra)
+        self.digest = hashlib.sha256()
+        self.header = b""
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_size:
+            self._discard()
+            raise UploadTooLarge()
+        if len(self.header) < SIGNATURE_SIZE:
+            self.header += raw_data[:SIGNATURE_SIZE - len(self.header)]
+            if len(self.header) == SIGNATURE_SIZE and not is_image_header(self.header):
+                self._reject()
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if not is_image_header(self.header):
+            # Archivos más cortos que la firma.
+            self._reject()
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.sha256 = self.digest.hexdigest()
+        return self.file
+
+    def upload_interrupted(self):
+        if hasattr(self, "file"):
+            self._discard()
+
+    def _reject(self):
+        self._discard()
+        raise ValidationError({self.field_name: ["El archivo no es una imagen JPEG, PNG, GIF o WebP."]})
+
+    def _discard(self):
+        # NamedTemporaryFile borra el archivo al cerrarse.
+        self.file.close()
+
+
+class StreamingUploadMixin:
+    """
+    Usa ``ImageUploadHandler`` para el cuerpo de las acciones de
+    ``upload_actions``. Los handlers se fijan antes de que DRF lea el cuerpo,
+    y como los permisos se revisan antes, una subida sin permiso no se lee.
+    """
+
+    upload_actions = ("create", "update", "partial_update")
+
+    def initialize_request(self, request, *args, **kwargs):
+        request = super().initialize_request(request, *args, **kwargs)
+        if getattr(self, "action", None) in self.upload_actions:
+            # El Request de DRF no reenvía asignaciones al HttpRequest de Django.
+            request._request.upload_handlers = [ImageUploadHandler(request._request)]
+        return request
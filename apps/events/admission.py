@@ -0,0 +1,128 @@
+"""
+Admisión por cola para eventos con ``queued_admission``.
+
+En la apertura de un evento con cupo, ``EventRegisteredUserViewSet.create``
+solo inserta un ``AdmissionTicket`` y responde 202; no valida cupos ni toca
+la fila del evento, así que su latencia no depende de la demanda. El comando
+``process_admissions`` drena después la cola de cada evento por lotes: bloquea
+el evento una vez por lote, crea las inscripciones de los primeros tickets en
+orden de llegada con un solo INSERT y pasa el resto a lista de espera.
+
+Cuando una inscripción deja de ocupar cupo (cancelada, rechazada o borrada)
+``promote_waitlist`` admite al siguiente de la lista de espera. Corre dentro de
+la petición que liberó el cupo, así que solo toca la lista de espera y como
+mucho tantos tickets como cupos se liberaron; la cola es del worker.
+"""
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.events import capacity, trending
+
+QUEUED, ADMITTED, WAITLISTED, REJECTED = "1", "2", "3", "4"
+DRAIN_BATCH_SIZE = 500
+
+
+def _models(ticket_model):
+    event_model = ticket_model._meta.get_field("event").related_model
+    registration_model = ticket_model._meta.get_field("registration").related_model
+    return event_model, registration_model
+
+
+def enqueue(ticket_model, event_id, user_id):
+    """Crea el ticket del usuario, o devuelve el que ya tenía. Devuelve ``(ticket, creado)``."""
+    try:
+        with transaction.atomic():
+            return ticket_model.objects.create(event_id=event_id, user_id=user_id), True
+    except IntegrityError:
+        return ticket_model.all_objects.get(event_id=event_id, user_id=user_id), False
+
+
+def drain_event(ticket_model, event_id, batch_size=DRAIN_BATCH_SIZE, include_queued=True):
+    """
+    Procesa hasta ``batch_size`` tickets del evento en una transacción: primero
+    la lista de espera (si hay cupos), luego la cola (salvo con
+    ``include_queued=False``). Devuelve un dict con cuántos tickets quedaron en
+    cada estado.
+    """
+    event_model, registration_model = _models(ticket_model)
+    now = timezone.now()
+    result = {"admitted": 0, "waitlisted": 0, "rejected": 0}
+    with transaction.atomic():
+        # El bloqueo del evento ordena este lote con las inscripciones directas
+        # y con otros workers que drenen el mismo evento.
+        event = (
+            event_model.objects.select_for_update()
+            .filter(pk=event_id)
+            .values("has_limit", "limit", "registered_count")
+            .first()
+        )
+        pending = ticket_model.objects.filter(event_id=event_id)
+        if event is None:
+            result["rejected"] = pending.filter(status__in=(QUEUED, WAITLISTED)).update(
+                status=REJECTED, processed_at=now, updated_at=now
+            )
+            return result
+
+        free = max((event["limit"] or 0) - event["registered_count"], 0) if event["has_limit"] else None
+        tickets = []
+        if free != 0:
+            tickets = list(pending.filter(status=WAITLISTED).order_by("pk")[: min(batch_size, free or batch_size)])
+        if include_queued:
+            tickets += pending.filter(status=QUEUED).order_by("pk")[: batch_size - len(tickets)]
+        if not tickets:
+            return result
+
+        registered = set(
+            registration_model.all_objects.filter(event_id=event_id, user_id__in=[ticket.user_id for ticket in tickets])
+            .values_list("user_id", flat=True)
+        )
+        admitted, waitlisted, rejected = [], [], []
+        for ticket in tickets:
+            if ticket.user_id in registered:
+                rejected.append(ticket)
+            elif free is None or len(admitted) < free:
+                admitted.append(ticket)
+            elif ticket.status == QUEUED:
+                waitlisted.append(ticket)
+
+        if admitted:
+            if not capacity.reserve_seat(event_model, event_id, seats=len(admitted)):
+                raise RuntimeError(f"El evento {event_id} cambió de cupo con la fila bloqueada.")
+            registrations = registration_model.objects.bulk_create(
+                registration_model(event_id=event_id, user_id=ticket.user_id) for ticket in admitted
+            )
+            for ticket, registration in zip(admitted, registrations):
+                ticket.status, ticket.registration = ADMITTED, registration
+                ticket.processed_at = ticket.updated_at = now
+            ticket_model.objects.bulk_update(admitted, ["status", "registration", "processed_at", "updated_at"])
+            trending.record_activity(event_model, event_id, trending.REGISTRATION_WEIGHT * len(admitted), now)
+        for status, group in ((WAITLISTED, waitlisted), (REJECTED, rejected)):
+            if group:
+                ticket_model.objects.filter(pk__in=[ticket.pk for ticket in group]).update(
+                    status=status, processed_at=now, updated_at=now
+                )
+
+    result.update(admitted=len(admitted), waitlisted=len(waitlisted), rejected=len(rejected))
+    return result
+
+
+def drain(ticket_model, batch_size=DRAIN_BATCH_SIZE):
+    """Drena la cola de todos los eventos; devuelve los totales por estado."""
+    totals = {"admitted": 0, "waitlisted": 0, "rejected": 0}
+    event_ids = ticket_model.objects.filter(status=QUEUED).order_by().values_list("event_id", flat=True).distinct()
+    for event_id in list(event_ids):
+        while True:
+            result = drain_event(ticket_model, event_id, batch_size)
+            for key, value in result.items():
+                totals[key] += value
+            if sum(result.values()) < batch_size:
+                break
+    return totals
+
+
+def promote_waitlist(ticket_model, event_id, seats=1):
+    """Admite hasta ``seats`` tickets de la lista de espera si el evento tiene cupos libres."""
+    if seats > 0 and ticket_model.objects.filter(event_id=event_id, status=WAITLISTED).exists():
+        return drain_event(ticket_model, event_id, batch_size=seats, include_queued=False)
+    return None
@@ -0,0 +1,79 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+# Estados de EventRegisteredUser que ocupan un cupo del evento.
+SEAT_STATUSES = ("1", "2")
+
+
+def reserve_seat(event_model, event_id, seats=1):
+    """
+    Ocupa ``seats`` cupos con un único ``UPDATE ... WHERE registered_count +
+    seats <= limit``. La fila del evento queda bloqueada hasta el final de la
+    transacción, así que dos inscripciones simultáneas nunca pueden tomar el
+    último cupo. Devuelve False si no hay cupos suficientes.
+    """
+    available = Q(has_limit=False) | Q(registered_count__lte=F("limit") - seats)
+    return bool(
+        event_model._base_manager.filter(available, pk=event_id).update(
+            registered_count=F("registered_count") + seats, updated_at=timezone.now()
+        )
+    )
+
+
+def release_seat(event_model, event_id, seats=1):
+    event_model._base_manager.filter(pk=event_id).update(
+        registered_count=Greatest(F("registered_count") - seats, 0), updated_at=timezone.now()
+    )
+
+
+def rebuild_registered_counts(event_model, registration_model, events=None):
+    """Recalcula ``registered_count`` contando las inscripciones que ocupan cupo."""
+    seats = (
+        registration_model._base_manager.filter(
+            event=OuterRef("pk"), deleted_at=None, registration_status__in=SEAT_STATUSES
+        )
+        .order_by()
+        .values("event")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    queryset = event_model._base_manager.all() if events is None else events
+    return queryset.update(registered_count=Coalesce(Subquery(seats), 0), updated_at=timezone.now())
+
+
+def bulk_set_status(event_model, registrations, status):
+    """
+    Pasa las inscripciones de ``registrations`` (un queryset que ya filtra
+    por dueño del evento) a ``status`` con un único UPDATE y recalcula el cupo
+    de los eventos afectados. Devuelve ``(filas_actualizadas, cupos_liberados)``,
+    con ``cupos_liberados`` como ``{id_de_evento: cupos}`` para cada evento
+    afectado.
+
+    Las filas de los eventos se bloquean primero, en orden de pk: así las
+    inscripciones individuales (reserve_seat) esperan y el recálculo posterior
+    ve todo lo que ya confirmaron. Si algún evento queda por encima de su
+    límite se lanza ValidationError y no se aplica nada.
+    """
+    registration_model = registrations.model
+    with transaction.atomic(using=registrations.db):
+        before = dict(
+            event_model._base_manager.filter(pk__in=registrations.values("event_id"))
+            .select_for_update()
+            .order_by("pk")
+            .values_list("pk", "registered_count")
+        )
+        updated = registrations.exclude(registration_status=status).update(
+            registration_status=status, updated_at=timezone.now()
+        )
+        events = event_model._base_manager.filter(pk__in=list(before))
+        rebuild_registered_counts(event_model, registration_model, events=events)
+        # Un evento que ya estaba excedido (p. ej. se redujo el límite) no impide
+        # rechazar o cancelar; solo falla si esta operación ocupó más cupos.
+        over_limit = events.filter(has_limit=True, registered_count__gt=F("limit")).values_list("pk", "registered_count")
+        if any(count > before[pk] for pk, count in over_limit):
+            raise ValidationError("El evento ha alcanzado su límite de registrados.")
+        after = dict(events.values_list("pk", "registered_count"))
+    return updated, {pk: max(count - after.get(pk, 0), 0) for pk, count in before.items()}
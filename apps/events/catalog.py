@@ -0,0 +1,94 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from apps.events.models import EventCategory
+
+# Versión compartida del catálogo. Cada worker guarda su copia junto con la
+# versión con la que la cargó y la recarga cuando la del cache cambia; con un
+# cache compartido (Redis, Memcached) la invalidación llega a todo el clúster.
+# Es un token aleatorio y no un contador para que un cache vaciado nunca
+# repita una versión vieja.
+VERSION_KEY = "events:categories:version"
+
+
+class CategoryCatalog:
+    """
+    Copia en memoria de todas las categorías, incluidas las de la papelera
+    (un evento puede seguir apuntando a una). Leerla cuesta una lectura del
+    cache y ninguna consulta a la base.
+
+    Con el cache local por proceso (sin CACHES compartido) la versión solo
+    cambia en el worker que editó la categoría; por eso además, cada
+    ``EVENT_CATEGORY_CATALOG_TTL`` segundos, se compara ``Max(updated_at)`` y
+    el conteo de la tabla con los de la copia y se recarga si cambiaron.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (versión, categorías por pk, representaciones serializadas, huella
+        # de la tabla, próxima verificación); se reemplaza entero para que los
+        # hilos nunca vean una mezcla.
+        self._state = (None, {}, {}, None, 0.0)
+
+    def _current(self):
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+            version = cache.get(VERSION_KEY)
+        if version != self._state[0] or time.monotonic() >= self._state[4]:
+            with self._lock:
+                state = self._state
+                if version != state[0] or time.monotonic() >= state[4]:
+                    # La huella se lee antes que las filas: un cambio entre
+                    # ambas lecturas se detecta en la siguiente verificación.
+                    fingerprint = self._fingerprint()
+                    categories, representations = state[1], state[2]
+                    if version != state[0] or fingerprint != state[3]:
+                        rows = EventCategory.all_objects.order_by("-created_at", "-id")
+                        categories, representations = {category.pk: category for category in rows}, {}
+                    deadline = time.monotonic() + settings.EVENT_CATEGORY_CATALOG_TTL
+                    self._state = (version, categories, representations, fingerprint, deadline)
+        return self._state
+
+    @staticmethod
+    def _fingerprint():
+        state = EventCategory.all_objects.aggregate(last_modified=Max("updated_at"), count=Count("pk"))
+        return state["last_modified"], state["count"]
+
+    def get(self, pk):
+        return self._current()[1].get(pk)
+
+    def live(self):
+        """Categorías fuera de la papelera, en el orden por defecto del listado."""
+        return [category for category in self._current()[1].values() if category.deleted_at is None]
+
+    def representation(self, pk, serializer_class):
+        """Datos serializados de la categoría, calculados una vez por versión."""
+        return self.resolver(serializer_class)(pk)
+
+    def resolver(self, serializer_class):
+        """
+        Función ``pk -> datos serializados`` atada a la versión actual: para
+        resolver muchas filas con una sola lectura de la versión en el cache.
+        """
+        _, categories, representations, *_ = self._current()
+
+        def resolve(pk):
+            key = (serializer_class, pk)
+            if key not in representations:
+                category = categories.get(pk)
+                representations[key] = serializer_class(category).data if category else None
+            return representations[key]
+
+        return resolve
+
+    def invalidate(self):
+        cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+catalog = CategoryCatalog()
@@ -0,0 +1,82 @@
+"""
+Filtros ``?from=``/``?to=`` sobre ``event_date`` y conteo de eventos por día,
+semana o mes para las vistas de calendario.
+
+Las fechas sin hora y los límites de cada periodo se interpretan en
+``TIME_ZONE`` (America/Bogota): un evento el 1 de octubre a las 8 p. m. en
+Bogotá cuenta para el 1 de octubre aunque en UTC ya sea el 2.
+"""
+
+import hashlib
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DateField
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+CALENDAR_KEY = "events:calendar:{params}"
+CALENDAR_PERIODS = ("day", "week", "month")
+# Máximo de días que puede abarcar una consulta del calendario.
+CALENDAR_MAX_DAYS = 400
+
+
+def parse_bound(value, end=False):
+    """
+    Fecha (``2026-10-01``) o fecha y hora ISO 8601 como datetime con zona
+    horaria. Una fecha sola como límite final incluye el día completo, así que
+    se devuelve el inicio del día siguiente (límite exclusivo).
+    """
+    # parse_datetime() también acepta fechas sin hora; se prueba primero la fecha.
+    day = parse_date(value)
+    if day is not None:
+        if end:
+            day += timedelta(days=1)
+        return timezone.make_aware(datetime.combine(day, time.min))
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValueError(value)
+    return moment if timezone.is_aware(moment) else timezone.make_aware(moment)
+
+
+def filter_date_range(queryset, start=None, end=None):
+    """``start <= event_date < end``; usa los índices que empiezan por event_date."""
+    if start is not None:
+        queryset = queryset.filter(event_date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(event_date__lt=end)
+    return queryset
+
+
+def event_counts(queryset, period):
+    """
+    Un solo ``SELECT date_trunc(periodo, event_date AT TIME ZONE ...), COUNT(*)
+    ... GROUP BY 1`` con los eventos de ``queryset`` por periodo. Las semanas
+    empiezan el lunes.
+    """
+    bucket = Trunc("event_date", period, output_field=DateField(), tzinfo=timezone.get_current_timezone())
+    return (
+        queryset.order_by()
+        .annotate(date=bucket)
+        .values("date")
+        .annotate(count=Count("id"))
+        .order_by("date")
+    )
+
+
+def get_cached(request):
+    if not settings.EVENT_CALENDAR_CACHE_TIMEOUT:
+        return None
+    return cache.get(_key(request))
+
+
+def set_cached(request, data):
+    if settings.EVENT_CALENDAR_CACHE_TIMEOUT:
+        cache.set(_key(request), data, settings.EVENT_CALENDAR_CACHE_TIMEOUT)
+
+
+def _key(request):
+    params = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+    return CALENDAR_KEY.format(params=params)
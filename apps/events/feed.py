@@ -0,0 +1,67 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.events.models import Interests
+
+# Las páginas del feed se guardan bajo una llave que incluye la versión de cada
+# categoría de interés del usuario: crear o editar un evento sube la versión de
+# su categoría y cambiar los intereses borra la lista cacheada del usuario, así
+# que nunca hay que buscar y borrar páginas individuales.
+INTERESTS_KEY = "events:feed:interests:{user_id}"
+CATEGORY_VERSION_KEY = "events:feed:category:{category_id}"
+PAGE_KEY = "events:feed:page:{user_id}:{signature}"
+
+
+def interest_categories(user):
+    """Subconsulta con las categorías de interés del usuario."""
+    return Interests.event_categories.through.objects.filter(
+        interests__user=user, interests__deleted_at=None
+    ).values("eventcategory_id")
+
+
+def filter_feed(queryset, user):
+    """Eventos próximos de las categorías que le interesan al usuario."""
+    return queryset.filter(event_category__in=interest_categories(user), event_date__gte=timezone.now())
+
+
+def get_cached_page(request):
+    if not settings.EVENT_FEED_CACHE_TIMEOUT:
+        return None
+    return cache.get(_page_key(request))
+
+
+def cache_page(request, data):
+    if settings.EVENT_FEED_CACHE_TIMEOUT:
+        cache.set(_page_key(request), data, settings.EVENT_FEED_CACHE_TIMEOUT)
+
+
+def invalidate_user(user_id):
+    cache.delete(INTERESTS_KEY.format(user_id=user_id))
+
+
+def invalidate_category(category_id):
+    key = CATEGORY_VERSION_KEY.format(category_id=category_id)
+    # add() no hace nada si la llave existe; incr() falla si no existe.
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def _page_key(request):
+    user_id = request.user.pk
+    interests_key = INTERESTS_KEY.format(user_id=user_id)
+    category_ids = cache.get(interests_key)
+    if category_ids is None:
+        category_ids = sorted(interest_categories(request.user).values_list("eventcategory_id", flat=True))
+        cache.set(interests_key, category_ids, settings.EVENT_FEED_CACHE_TIMEOUT)
+
+    version_keys = [CATEGORY_VERSION_KEY.format(category_id=category_id) for category_id in category_ids]
+    versions = cache.get_many(version_keys)
+    signature = ",".join(f"{category_id}:{versions.get(key, 0)}" for category_id, key in zip(category_ids, version_keys))
+    signature = hashlib.md5(f"{signature}|{request.GET.urlencode()}".encode()).hexdigest()
+    return PAGE_KEY.format(user_id=user_id, signature=signature)
@@ -0,0 +1,146 @@
+import math
+
+from django.conf import settings
+from django.db.models import F, Q, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+from django.utils.module_loading import import_string
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+# Máximo de celdas con que se cubre un área de búsqueda; más celdas dan un
+# filtro más ajustado pero más ramas OR en la consulta.
+MAX_COVER_CELLS = 16
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        target, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if target >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision):
+    """Alto y ancho en grados de una celda geohash de ``precision`` caracteres."""
+    total_bits = precision * 5
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / 2**lat_bits, 360.0 / 2**lng_bits
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Caja (min_lat, min_lng, max_lat, max_lng) que contiene el círculo."""
+    delta_lat = radius_km / KM_PER_DEGREE
+    delta_lng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 1e-6))
+    return (
+        max(latitude - delta_lat, -90.0),
+        max(longitude - delta_lng, -180.0),
+        min(latitude + delta_lat, 90.0),
+        min(longitude + delta_lng, 180.0),
+    )
+
+
+def cover_bbox(min_lat, min_lng, max_lat, max_lng):
+    """
+    Prefijos geohash que cubren la caja: se elige la precisión más fina que
+    la cubre con a lo sumo ``MAX_COVER_CELLS`` celdas.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = range(math.floor((min_lat + 90) / height), math.floor((max_lat + 90) / height) + 1)
+        cols = range(math.floor((min_lng + 180) / width), math.floor((max_lng + 180) / width) + 1)
+        if len(rows) * len(cols) <= MAX_COVER_CELLS:
+            break
+
+    cells = set()
+    for row in rows:
+        for col in cols:
+            # Se codifica el centro de cada celda para no caer en un borde.
+            latitude = min(-90 + (row + 0.5) * height, 90.0)
+            longitude = min(-180 + (col + 0.5) * width, 180.0)
+            cells.add(encode_geohash(latitude, longitude, precision))
+    return sorted(cells)
+
+
+def distance_km(latitude, longitude):
+    """Expresión con la distancia haversine desde el punto dado hasta el evento."""
+    delta_lat = Radians(F("latitude") - latitude)
+    delta_lng = Radians(F("longitude") - longitude)
+    a = Power(Sin(delta_lat / 2), 2) + Value(math.cos(math.radians(latitude))) * Cos(Radians(F("latitude"))) * Power(
+        Sin(delta_lng / 2), 2
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a))
+
+
+def filter_bbox(queryset, min_lat, min_lng, max_lat, max_lng):
+    """
+    Eventos dentro de la caja. El filtro por prefijo geohash descarta casi
+    todas las filas usando el índice y la comparación de coordenadas deja
+    solo las que están realmente dentro.
+    """
+    prefixes = Q()
+    for cell in cover_bbox(min_lat, min_lng, max_lat, max_lng):
+        prefixes |= Q(geohash__startswith=cell)
+    return queryset.filter(
+        prefixes,
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lng, max_lng),
+    )
+
+
+def filter_nearby(queryset, latitude, longitude, radius_km):
+    """Eventos a menos de ``radius_km``, anotados con ``distance``."""
+    queryset = filter_bbox(queryset, *bounding_box(latitude, longitude, radius_km))
+    return queryset.annotate(distance=distance_km(latitude, longitude)).filter(distance__lte=radius_km)
+
+
+class NullGeocoder:
+    """Geocodificador por defecto: no resuelve ninguna dirección."""
+
+    def geocode(self, location):
+        return None
+
+
+class StaticGeocoder:
+    """
+    Geocodificador de prueba para desarrollo local: reconoce ciudades
+    colombianas mencionadas en el texto de la ubicación.
+    """
+
+    CITIES = {
+        "medellín": (6.2442, -75.5812),
+        "medellin": (6.2442, -75.5812),
+        "bogotá": (4.7110, -74.0721),
+        "bogota": (4.7110, -74.0721),
+        "cali": (3.4516, -76.5320),
+        "barranquilla": (10.9685, -74.7813),
+        "cartagena": (10.3910, -75.4794),
+        "manizales": (5.0703, -75.5138),
+        "pereira": (4.8087, -75.6906),
+        "bucaramanga": (7.1193, -73.1227),
+    }
+
+    def geocode(self, location):
+        text = location.lower()
+        for city, coordinates in self.CITIES.items():
+            if city in text:
+                return coordinates
+        return None
+
+
+def get_geocoder():
+    return import_string(settings.EVENT_GEOCODER)()
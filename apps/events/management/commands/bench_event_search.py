@@ -0,0 +1,77 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.events.models import Event, EventCategory
+from apps.events.search import search_events, update_search_vector, uses_postgres
+from apps.users.models import User
+
+WORDS = (
+    "taller", "concierto", "conferencia", "feria", "festival", "python", "django", "música", "salsa", "rock",
+    "teatro", "cine", "maratón", "ciclismo", "fútbol", "emprendimiento", "datos", "inteligencia", "artificial",
+    "gastronomía", "café", "arte", "pintura", "fotografía", "danza", "literatura", "ciencia", "robótica",
+)
+CITIES = ("Medellín", "Bogotá", "Cali", "Barranquilla", "Cartagena", "Manizales", "Pereira", "Bucaramanga")
+QUERIES = ("python", "festival de salsa", "conferencia inteligencia artificial", "Medellín café", "robótica -datos")
+
+
+class Command(BaseCommand):
+    help = (
+        "Siembra eventos sintéticos y mide la búsqueda de texto completo con EXPLAIN ANALYZE. "
+        "Requiere PostgreSQL; los eventos sembrados se borran al terminar salvo con --keep."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--keep", action="store_true", help="No borrar los eventos sembrados.")
+
+    def handle(self, *args, **options):
+        if not uses_postgres(connection.alias):
+            raise CommandError("El benchmark de búsqueda necesita PostgreSQL.")
+
+        prefix = f"bench-{int(time.time())}"
+        organizer = User.objects.create_user(email=f"{prefix}@bench.local", username=prefix, user_type="3")
+        categories = [EventCategory.objects.get_or_create(name=f"Benchmark {word}")[0] for word in WORDS[:8]]
+
+        start = time.perf_counter()
+        self._seed(organizer, categories, options["rows"], options["batch_size"])
+        self.stdout.write(f"Sembrados {options['rows']} eventos en {time.perf_counter() - start:.1f}s")
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE events_event")
+            for term in QUERIES:
+                queryset = search_events(Event.objects.all(), term).order_by("-search_rank", "id")[:20]
+                start = time.perf_counter()
+                results = list(queryset)
+                elapsed = (time.perf_counter() - start) * 1000
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n{term!r}: {len(results)} resultados en {elapsed:.1f} ms"))
+                self.stdout.write(queryset.explain(analyze=True))
+        finally:
+            if not options["keep"]:
+                Event.all_objects.filter(event_organizer=organizer).force_delete()
+                organizer.delete()
+
+    def _seed(self, organizer, categories, rows, batch_size):
+        now = timezone.now()
+        for offset in range(0, rows, batch_size):
+            events = Event.objects.bulk_create(
+                Event(
+                    event_name=" ".join(random.sample(WORDS, 3)).capitalize(),
+                    event_category=random.choice(categories),
+                    event_organizer=organizer,
+                    event_description=" ".join(random.choices(WORDS, k=25)),
+                    event_location=random.choice(CITIES),
+                    event_date=now + timedelta(minutes=random.randint(0, 525_600)),
+                    paid=False,
+                    has_limit=False,
+                )
+                for _ in range(min(batch_size, rows - offset))
+            )
+            # bulk_create no pasa por Event.save(): el vector se calcula por lote.
+            update_search_vector(Event.all_objects.filter(pk__gte=events[0].pk, pk__lte=events[-1].pk))
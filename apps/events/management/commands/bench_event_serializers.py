@@ -0,0 +1,78 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.base.compiled import CompiledSerializer
+from apps.base.query_plans import get_query_plan
+from apps.events.models import Event, EventCategory
+from apps.events.serializers import EventSerializer
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara EventSerializer(many=True) con CompiledSerializer al renderizar listas de eventos. "
+        "Los eventos sembrados se borran al terminar salvo con --keep."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000])
+        parser.add_argument("--repeat", type=int, default=3, help="Se reporta la mejor de N corridas.")
+        parser.add_argument("--keep", action="store_true", help="No borrar los eventos sembrados.")
+
+    def handle(self, *args, **options):
+        prefix = f"bench-{int(time.time())}"
+        organizer = User.objects.create_user(email=f"{prefix}@bench.local", username=prefix, user_type="3")
+        category = EventCategory.objects.get_or_create(name="Benchmark")[0]
+        Event.objects.bulk_create(
+            Event(
+                event_name=f"Evento {i}",
+                event_category=category,
+                event_organizer=organizer,
+                event_description="Benchmark",
+                event_location="Medellín",
+                event_date=timezone.now() + timedelta(minutes=i),
+                event_picture=f"event_pictures/{i}.png",
+                paid=bool(i % 2),
+                price=i % 2 and 25_000 or None,
+                has_limit=False,
+            )
+            for i in range(max(options["rows"]))
+        )
+        context = {"request": RequestFactory().get("/api/events/")}
+        renderer = JSONRenderer()
+        events = Event.objects.filter(event_organizer=organizer).order_by("event_date", "id")
+
+        try:
+            for rows in options["rows"]:
+                queryset = get_query_plan(EventSerializer).apply(events)[:rows]
+
+                def drf():
+                    return renderer.render(EventSerializer(queryset, many=True, context=context).data)
+
+                def compiled():
+                    serializer = CompiledSerializer(EventSerializer(context=context))
+                    return renderer.render(serializer.to_representation(serializer.values(queryset)))
+
+                assert drf() == compiled(), "Las salidas no coinciden"
+                drf_ms, compiled_ms = self._best(drf, options["repeat"]), self._best(compiled, options["repeat"])
+                self.stdout.write(
+                    f"{rows:>7} filas: DRF {drf_ms:8.1f} ms | compilado {compiled_ms:8.1f} ms "
+                    f"({drf_ms / compiled_ms:.1f}x)"
+                )
+        finally:
+            if not options["keep"]:
+                Event.all_objects.filter(event_organizer=organizer).force_delete()
+                organizer.delete()
+
+    def _best(self, render, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - start) * 1000)
+        return min(timings)
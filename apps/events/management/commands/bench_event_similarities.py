@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from apps.events.recommendations import CHUNK_SIZE, CoAttendance
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el cálculo de eventos similares sobre inscripciones sintéticas (sin base de datos): "
+        "popularidad de eventos con ley de potencias y número de eventos por usuario geométrico."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--registrations", type=int, default=1_000_000, help="Inscripciones a generar.")
+        parser.add_argument("--events", type=int, default=20_000, help="Eventos distintos.")
+        parser.add_argument("--events-per-user", type=float, default=5.0, help="Promedio de eventos por usuario.")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Inscripciones por bloque.")
+        parser.add_argument("--top-k", type=int, default=20, help="Eventos similares por evento.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        total = options["registrations"]
+        sizes = rng.geometric(1 / options["events_per_user"], size=total)
+        sizes = sizes[np.cumsum(sizes) <= total]
+        user_ids = np.repeat(np.arange(1, len(sizes) + 1, dtype=np.int64), sizes)
+        event_ids = (rng.zipf(1.3, size=len(user_ids)) % options["events"] + 1).astype(np.int64)
+        # Un usuario no se inscribe dos veces al mismo evento.
+        pairs = np.unique((user_ids << 32) | event_ids)
+        user_ids, event_ids = pairs >> 32, pairs & 0xFFFFFFFF
+        self.stdout.write(f"{len(user_ids)} inscripciones de {len(sizes)} usuarios en {options['events']} eventos")
+
+        co_attendance = CoAttendance()
+        chunk_size = options["chunk_size"]
+        start = time.perf_counter()
+        position = 0
+        while position < len(user_ids):
+            # Igual que registration_chunks: el bloque no parte a un usuario.
+            end = min(position + chunk_size, len(user_ids))
+            if end < len(user_ids):
+                cut = np.searchsorted(user_ids, user_ids[end])
+                end = cut if cut > position else np.searchsorted(user_ids, user_ids[end], side="right")
+            co_attendance.add(user_ids[position:end], event_ids[position:end])
+            position = end
+        accumulated = time.perf_counter()
+        top_k = co_attendance.top_k(options["top_k"])
+        finished = time.perf_counter()
+
+        self.stdout.write(
+            f"pares distintos: {len(co_attendance.pair_codes)} "
+            f"({co_attendance.pair_codes.nbytes + co_attendance.pair_counts.nbytes} bytes)"
+        )
+        self.stdout.write(f"acumulado: {accumulated - start:.2f}s, top-k: {finished - accumulated:.2f}s")
+        self.stdout.write(self.style.SUCCESS(f"{len(top_k[0])} similitudes en {finished - start:.2f}s"))
@@ -0,0 +1,102 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from apps.events.capacity import rebuild_registered_counts
+from apps.events.models import Event, EventCategory, EventRegisteredUser
+from apps.events.stats import organizer_stats
+from apps.users.models import User
+
+STATUSES = [code for code, _ in EventRegisteredUser.STATUS_CHOICES]
+
+
+class Command(BaseCommand):
+    help = (
+        "Siembra un organizador con muchos eventos e inscripciones y mide la consulta agrupada del "
+        "tablero (organizer_stats). Los datos sembrados se borran al terminar salvo con --keep."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=5_000)
+        parser.add_argument("--registrations", type=int, default=1_000_000)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--keep", action="store_true", help="No borrar los datos sembrados.")
+
+    def handle(self, *args, **options):
+        prefix = f"bench-{int(time.time())}"
+        organizer = User.objects.create_user(email=f"{prefix}@bench.local", username=prefix, user_type="3")
+        category = EventCategory.objects.get_or_create(name="Benchmark")[0]
+        # La restricción (event, user) exige un usuario distinto por inscripción de cada evento.
+        per_event = -(-options["registrations"] // options["events"])
+        users = User.objects.bulk_create(
+            User(email=f"{prefix}-{i}@bench.local", username=f"{prefix}-{i}", user_type="1") for i in range(per_event)
+        )
+
+        start = time.perf_counter()
+        events = self._seed_events(organizer, category, options["events"], options["batch_size"])
+        self._seed_registrations(events, users, options["registrations"], options["batch_size"])
+        rebuild_registered_counts(Event, EventRegisteredUser, events=Event.objects.filter(event_organizer=organizer))
+        self.stdout.write(
+            f"Sembrados {len(events)} eventos y {options['registrations']} inscripciones "
+            f"en {time.perf_counter() - start:.1f}s"
+        )
+
+        try:
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE events_event")
+                    cursor.execute("ANALYZE events_eventregistereduser")
+
+            queryset = organizer_stats(organizer).order_by("event_date", "id")
+            for label, query in (("Página", queryset[: options["page_size"]]), ("Todos los eventos", queryset)):
+                start = time.perf_counter()
+                rows = list(query)
+                elapsed = (time.perf_counter() - start) * 1000
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n{label}: {len(rows)} filas en {elapsed:.1f} ms"))
+                if connection.vendor == "postgresql":
+                    self.stdout.write(query.explain(analyze=True))
+        finally:
+            if not options["keep"]:
+                Event.all_objects.filter(event_organizer=organizer).force_delete()
+                User.objects.filter(email__startswith=prefix, email__endswith="@bench.local").delete()
+
+    def _seed_events(self, organizer, category, total, batch_size):
+        now = timezone.now()
+        events = []
+        for offset in range(0, total, batch_size):
+            events += Event.objects.bulk_create(
+                Event(
+                    event_name=f"Evento {offset + i}",
+                    event_category=category,
+                    event_organizer=organizer,
+                    event_description="Benchmark",
+                    event_location="Medellín",
+                    event_date=now + timedelta(minutes=random.randint(0, 525_600)),
+                    paid=False,
+                    has_limit=random.random() < 0.5,
+                    limit=1_000,
+                )
+                for i in range(min(batch_size, total - offset))
+            )
+        return events
+
+    def _seed_registrations(self, events, users, total, batch_size):
+        # bulk_create no pasa por save(): el cupo se recalcula al final.
+        rows = (
+            EventRegisteredUser(event=event, user=user, registration_status=random.choice(STATUSES))
+            for event in events
+            for user in users
+        )
+        batch = []
+        for _, row in zip(range(total), rows):
+            batch.append(row)
+            if len(batch) == batch_size:
+                EventRegisteredUser.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            EventRegisteredUser.objects.bulk_create(batch)
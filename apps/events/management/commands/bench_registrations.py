@@ -0,0 +1,99 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, connections
+from django.utils import timezone
+
+from apps.events import admission
+from apps.events.models import AdmissionTicket, Event, EventCategory, EventRegisteredUser
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Lanza inscripciones concurrentes contra un evento con cupo limitado y verifica que no haya "
+        "sobreventa. Debe correrse contra PostgreSQL; los datos creados se borran al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=500, help="Usuarios que intentan inscribirse.")
+        parser.add_argument("--limit", type=int, default=100, help="Cupo del evento.")
+        parser.add_argument("--workers", type=int, default=64, help="Hilos concurrentes.")
+        parser.add_argument(
+            "--queued", action="store_true", help="Usa la admisión por cola (tickets + process_admissions)."
+        )
+
+    def handle(self, *args, **options):
+        prefix = f"bench-{int(time.time())}"
+        organizer = User.objects.create_user(email=f"{prefix}@bench.local", username=prefix, user_type="3")
+        category, _ = EventCategory.objects.get_or_create(name="Benchmark")
+        event = Event.objects.create(
+            event_name=prefix,
+            event_category=category,
+            event_organizer=organizer,
+            event_description="Benchmark de inscripciones",
+            event_location="Benchmark",
+            event_date=timezone.now() + timedelta(days=30),
+            paid=False,
+            has_limit=True,
+            limit=options["limit"],
+            queued_admission=options["queued"],
+        )
+        users = User.objects.bulk_create(
+            User(email=f"{prefix}-{i}@bench.local", username=f"{prefix}-{i}", name="Bench", last_name="User")
+            for i in range(options["users"])
+        )
+
+        latencies = []
+
+        def register(user_id):
+            start = time.perf_counter()
+            try:
+                if options["queued"]:
+                    admission.enqueue(AdmissionTicket, event.pk, user_id)
+                else:
+                    EventRegisteredUser(event_id=event.pk, user_id=user_id).save()
+                return True
+            except (ValidationError, IntegrityError):
+                return False
+            finally:
+                latencies.append(time.perf_counter() - start)
+                connections.close_all()
+
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+                accepted = sum(pool.map(register, [user.pk for user in users]))
+            elapsed = time.perf_counter() - start
+            latencies.sort()
+            self.stdout.write(
+                f"latencia por solicitud: p50={latencies[len(latencies) // 2] * 1000:.1f} ms "
+                f"p99={latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms"
+            )
+            if options["queued"]:
+                drain_start = time.perf_counter()
+                totals = admission.drain(AdmissionTicket)
+                accepted = totals["admitted"]
+                self.stdout.write(f"cola drenada en {time.perf_counter() - drain_start:.2f}s: {totals}")
+
+            event.refresh_from_db()
+            stored = EventRegisteredUser.objects.filter(event=event).count()
+            overbooked = max(stored - options["limit"], 0)
+            self.stdout.write(
+                f"{options['users']} intentos con {options['workers']} hilos en {elapsed:.2f}s "
+                f"({options['users'] / elapsed:.0f} inscripciones/s)\n"
+                f"aceptadas={accepted} guardadas={stored} registered_count={event.registered_count} "
+                f"cupo={options['limit']} sobreventa={overbooked}"
+            )
+            if overbooked or stored != event.registered_count:
+                self.stderr.write(self.style.ERROR("El contador de cupos no coincide con las inscripciones."))
+            else:
+                self.stdout.write(self.style.SUCCESS("Sin sobreventa."))
+        finally:
+            AdmissionTicket.all_objects.filter(event=event).force_delete()
+            EventRegisteredUser.all_objects.filter(event=event).force_delete()
+            Event.all_objects.filter(pk=event.pk).force_delete()
+            User.objects.filter(email__endswith="@bench.local", username__startswith=prefix).delete()
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.events import recommendations
+from apps.events.models import EventRegisteredUser, EventSimilarity
+
+
+class Command(BaseCommand):
+    help = "Recalcula la tabla de eventos similares (asistentes en común) a partir de las inscripciones."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-k", type=int, default=20, help="Eventos similares por evento.")
+        parser.add_argument("--min-common", type=int, default=2, help="Asistentes en común mínimos por par.")
+        parser.add_argument(
+            "--chunk-size", type=int, default=recommendations.CHUNK_SIZE, help="Inscripciones leídas por consulta."
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        top_k = recommendations.build_similarities(
+            EventRegisteredUser, k=options["top_k"], min_common=options["min_common"], chunk_size=options["chunk_size"]
+        )
+        computed = time.perf_counter()
+        stored = recommendations.store_similarities(EventSimilarity, top_k)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{stored} similitudes guardadas (cálculo {computed - start:.2f}s, "
+                f"escritura {time.perf_counter() - computed:.2f}s)."
+            )
+        )
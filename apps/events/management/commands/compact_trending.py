@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.events.models import Event, EventRegisteredUser, EventReview
+from apps.events.trending import compact_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula el puntaje de tendencia de los eventos con la actividad reciente y deja en 0 los eventos "
+        "sin actividad. Se corre cada hora (ver README)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Eventos por lote.")
+
+    def handle(self, *args, **options):
+        updated = compact_scores(Event, EventRegisteredUser, EventReview, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Puntaje de tendencia actualizado en {updated} eventos."))
@@ -0,0 +1,136 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.base.explain import explain_index_usage
+from apps.events.dates import event_counts, filter_date_range
+from apps.events.models import Event, EventCategory, EventRegisteredUser, EventReview
+from apps.stores.models import Order, Product
+
+# (descripción, consulta, índice esperado, motores donde aplica)
+HOT_PATHS = [
+    (
+        "Listado de eventos por fecha",
+        lambda: Event.objects.filter(event_date__gte=timezone.now()).order_by("event_date", "id")[:20],
+        "event_date_id_idx",
+        None,
+    ),
+    (
+        "Calendario de un mes",
+        lambda: event_counts(
+            filter_date_range(Event.objects.all(), timezone.now(), timezone.now() + timedelta(days=31)), "day"
+        ),
+        "event_date_id_idx",
+        None,
+    ),
+    (
+        "Eventos ordenados por calificación",
+        lambda: Event.objects.order_by("-rating_avg", "-id")[:20],
+        "event_rating_avg_id_idx",
+        None,
+    ),
+    (
+        "Eventos en tendencia",
+        lambda: Event.objects.order_by("-trending_score", "-id")[:20],
+        "event_trending_id_idx",
+        None,
+    ),
+    (
+        "Feed por categoría",
+        lambda: Event.objects.filter(event_category_id=1, event_date__gte=timezone.now()).order_by("event_date", "id")[
+            :20
+        ],
+        "event_category_date_id_idx",
+        None,
+    ),
+    (
+        "Eventos de un organizador",
+        lambda: Event.objects.filter(event_organizer_id=1).order_by("event_date", "id")[:20],
+        "event_organizer_date_id_idx",
+        None,
+    ),
+    (
+        "Eventos por prefijo geohash",
+        lambda: Event.objects.filter(geohash__startswith="d2g6"),
+        "event_geohash_idx",
+        # SQLite no usa índices para LIKE con ESCAPE, que es lo que genera Django.
+        {"postgresql"},
+    ),
+    (
+        "Listado de categorías",
+        lambda: EventCategory.objects.order_by("-created_at", "-id")[:20],
+        "eventcategory_created_id_idx",
+        None,
+    ),
+    (
+        "Inscripciones de un evento por estado",
+        lambda: EventRegisteredUser.objects.filter(event_id=1, registration_status="1"),
+        "eventreguser_event_status_idx",
+        None,
+    ),
+    (
+        "Inscripciones de un usuario",
+        lambda: EventRegisteredUser.objects.filter(user_id=1).order_by("-created_at")[:20],
+        "eventreguser_user_created_idx",
+        None,
+    ),
+    (
+        "Reseñas de un evento",
+        lambda: EventReview.objects.filter(event_id=1).order_by("-created_at", "-id")[:20],
+        "eventreview_event_created_idx",
+        None,
+    ),
+    (
+        "Productos de una categoría",
+        lambda: Product.objects.filter(category_id=1).order_by("-created_at", "-id")[:20],
+        "product_category_created_idx",
+        None,
+    ),
+    (
+        "Productos de una tienda",
+        lambda: Product.objects.filter(seller_id=1).order_by("-created_at", "-id")[:20],
+        "product_seller_created_idx",
+        None,
+    ),
+    (
+        "Órdenes de un usuario",
+        lambda: Order.objects.filter(user_id=1).order_by("-order_date", "-id")[:20],
+        "order_user_date_idx",
+        None,
+    ),
+]
+
+
+def applicable_hot_paths(vendor):
+    return [(name, query, index) for name, query, index, vendors in HOT_PATHS if vendors is None or vendor in vendors]
+
+
+class Command(BaseCommand):
+    help = (
+        "Corre EXPLAIN sobre las consultas más frecuentes y verifica que el planificador use los "
+        "índices parciales (WHERE deleted_at IS NULL) pensados para ellas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Desactiva los seq scans en PostgreSQL (útil con tablas pequeñas).",
+        )
+        parser.add_argument("--verbose-plans", action="store_true", help="Imprime el plan completo.")
+
+    def handle(self, *args, **options):
+        failures = []
+        for name, query, index in applicable_hot_paths(connection.vendor):
+            used, plan = explain_index_usage(query(), index, force=options["force"])
+            status = self.style.SUCCESS("OK  ") if used else self.style.ERROR("FALLA")
+            self.stdout.write(f"{status} {name} -> {index}")
+            if options["verbose_plans"] or not used:
+                self.stdout.write(plan)
+            if not used:
+                failures.append(name)
+
+        if failures:
+            raise CommandError(f"{len(failures)} consultas no usan el índice esperado.")
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from apps.events import geo
+from apps.events.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Llena latitude/longitude/geohash de los eventos sin coordenadas usando el geocodificador "
+        "configurado en EVENT_GEOCODER. Pensado para correr fuera de línea (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Ubicaciones distintas por lote.")
+
+    def handle(self, *args, **options):
+        geocoder = geo.get_geocoder()
+        pending = Event.objects.filter(latitude__isnull=True).exclude(event_location="")
+        resolved = unresolved = updated = 0
+        last_location = ""
+
+        # Se geocodifica cada ubicación distinta una sola vez y se actualizan
+        # todos sus eventos con un solo UPDATE.
+        while True:
+            locations = list(
+                pending.filter(event_location__gt=last_location)
+                .order_by("event_location")
+                .values_list("event_location", flat=True)
+                .distinct()[: options["batch_size"]]
+            )
+            if not locations:
+                break
+            last_location = locations[-1]
+
+            for location in locations:
+                coordinates = geocoder.geocode(location)
+                if coordinates is None:
+                    unresolved += 1
+                    continue
+                latitude, longitude = coordinates
+                resolved += 1
+                updated += pending.filter(event_location=location).update(
+                    latitude=latitude, longitude=longitude, geohash=geo.encode_geohash(latitude, longitude)
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{updated} eventos geocodificados ({resolved} ubicaciones resueltas, {unresolved} sin resolver)."
+            )
+        )
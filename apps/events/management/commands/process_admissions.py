@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.events import admission
+from apps.events.models import AdmissionTicket
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker de la admisión por cola: asigna los cupos de los tickets encolados en orden de llegada y "
+        "pasa el resto a lista de espera. Corre en un proceso aparte (ver procfile)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=admission.DRAIN_BATCH_SIZE, help="Tickets por transacción.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Segundos de espera cuando la cola está vacía.")
+        parser.add_argument("--once", action="store_true", help="Drena la cola una vez y termina.")
+
+    def handle(self, *args, **options):
+        while True:
+            # Proceso de larga duración: respeta CONN_MAX_AGE y descarta conexiones caídas.
+            close_old_connections()
+            started = time.monotonic()
+            totals = admission.drain(AdmissionTicket, batch_size=options["batch_size"])
+            if any(totals.values()):
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"admitidos={totals['admitted']} en espera={totals['waitlisted']} "
+                    f"rechazados={totals['rejected']} en {elapsed:.2f}s"
+                )
+            if options["once"]:
+                return
+            if not any(totals.values()):
+                time.sleep(options["interval"])
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.events.models import Event, EventReview
+from apps.events.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = "Recalcula rating_avg, rating_count y el histograma de estrellas de todos los eventos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Eventos por lote.")
+
+    def handle(self, *args, **options):
+        updated = rebuild_ratings(Event, EventReview, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Agregados recalculados para {updated} eventos."))
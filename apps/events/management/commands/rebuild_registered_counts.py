@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.events.capacity import rebuild_registered_counts
+from apps.events.models import Event, EventRegisteredUser
+
+
+class Command(BaseCommand):
+    help = "Recalcula registered_count de todos los eventos contando las inscripciones que ocupan cupo."
+
+    def handle(self, *args, **options):
+        updated = rebuild_registered_counts(Event, EventRegisteredUser)
+        self.stdout.write(self.style.SUCCESS(f"Cupos recalculados para {updated} eventos."))
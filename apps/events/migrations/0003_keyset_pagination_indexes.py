@@ -0,0 +1,31 @@
+# Generated by Django 5.1.5 on 2026-10-18 13:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['event_date', 'id'], name='event_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventcategory',
+            index=models.Index(fields=['created_at', 'id'], name='eventcategory_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistereduser',
+            index=models.Index(fields=['created_at', 'id'], name='eventreguser_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventreview',
+            index=models.Index(fields=['created_at', 'id'], name='eventreview_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-18 13:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['event_category', 'event_date', 'id'], name='event_category_date_id_idx'),
+        ),
+    ]
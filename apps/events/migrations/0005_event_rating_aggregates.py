@@ -0,0 +1,61 @@
+# Generated by Django 5.1.5 on 2026-10-18 13:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.events.ratings import rebuild_ratings
+
+
+def backfill_ratings(apps, schema_editor):
+    rebuild_ratings(apps.get_model("events", "Event"), apps.get_model("events", "EventReview"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_category_date_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_avg',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['rating_avg', 'id'], name='event_rating_avg_id_idx'),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
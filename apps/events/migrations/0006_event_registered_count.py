@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-10-18 13:20
+
+from django.db import migrations, models
+
+from apps.events.capacity import rebuild_registered_counts
+
+
+def backfill_registered_counts(apps, schema_editor):
+    rebuild_registered_counts(apps.get_model("events", "Event"), apps.get_model("events", "EventRegisteredUser"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='registered_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_registered_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.5 on 2026-10-18 13:23
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+from apps.events.search import update_search_vector
+
+SEARCH_INDEX = django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='event_search_vector_gin')
+
+
+def create_search_index(apps, schema_editor):
+    # El índice GIN y el vector solo existen en PostgreSQL; en SQLite la
+    # búsqueda usa el camino de respaldo de apps.events.search.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Event = apps.get_model("events", "Event")
+    update_search_vector(Event._base_manager.using(schema_editor.connection.alias).all())
+    schema_editor.add_index(Event, SEARCH_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(apps.get_model("events", "Event"), SEARCH_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_registered_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name='event', index=SEARCH_INDEX),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_index, drop_search_index),
+            ],
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.1.5 on 2026-10-18 13:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_event_coordinates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_date_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_category_date_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_rating_avg_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='eventcategory',
+            name='eventcategory_created_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='eventregistereduser',
+            name='eventreguser_created_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='eventreview',
+            name='eventreview_created_id_idx',
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='geohash',
+            field=models.CharField(blank=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['event_date', 'id'], name='event_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['rating_avg', 'id'], name='event_rating_avg_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['event_category', 'event_date', 'id'], name='event_category_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['event_organizer', 'event_date', 'id'], name='event_organizer_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['geohash'], name='event_geohash_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='eventcategory',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['created_at', 'id'], name='eventcategory_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistereduser',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['created_at', 'id'], name='eventreguser_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistereduser',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['event', 'registration_status'], name='eventreguser_event_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistereduser',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['user', 'created_at'], name='eventreguser_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventreview',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['created_at', 'id'], name='eventreview_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventreview',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['event', 'created_at', 'id'], name='eventreview_event_created_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.5 on 2026-10-18 14:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_event_event_picture_hash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='queued_admission',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='AdmissionTicket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('status', models.CharField(choices=[('1', 'En cola'), ('2', 'Admitido'), ('3', 'En lista de espera'), ('4', 'Rechazado')], default='1', max_length=1)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='events.event')),
+                ('registration', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='events.eventregistereduser')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['event', 'status', 'id'], name='admticket_event_status_idx')],
+                'constraints': [models.UniqueConstraint(fields=('event', 'user'), name='unique_admission_ticket')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.5 on 2026-10-18 14:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0011_admission_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('common_attendees', models.PositiveIntegerField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_events', to='events.event')),
+                ('similar_event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to', to='events.event')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('event', 'rank'), name='unique_event_similarity_rank')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.5 on 2026-10-18 14:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.events.trending import compact_scores
+
+
+def backfill_trending(apps, schema_editor):
+    compact_scores(
+        apps.get_model("events", "Event"),
+        apps.get_model("events", "EventRegisteredUser"),
+        apps.get_model("events", "EventReview"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_event_similarity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['trending_score', 'id'], name='event_trending_id_idx'),
+        ),
+        migrations.RunPython(backfill_trending, migrations.RunPython.noop),
+    ]
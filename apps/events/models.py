@@ -1,9 +1,15 @@
-from apps.base.models import BaseModel
+from functools import partial
+
+from apps.base.models import BaseModel, live_index
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
+from apps.events import admission, capacity, geo, ratings, search, trending
+
 
 # Create your models here.
 
@@ -11,6 +17,9 @@ class EventCategory(BaseModel):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [live_index("created_at", "id", name="eventcategory_created_id_idx")]
+
     def __str__(self):
         return self.name
 
@@ -33,12 +42,52 @@ class Event(BaseModel):
     event_description = models.TextField()
     event_organizer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     event_location = models.CharField(max_length=100)
+    # Coordenadas de event_location; las llena el comando geocode_events.
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+    geohash = models.CharField(max_length=12, blank=True, null=True, editable=False)
     event_date = models.DateTimeField()
     event_picture = models.ImageField(upload_to="event_pictures/", blank=True, null=True)
+    # sha256 de event_picture, lo llena apps.base.images al generar las variantes.
+    event_picture_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
     paid = models.BooleanField()
     price = models.DecimalField(decimal_places=2, max_digits=10, blank=True, null=True)
     has_limit = models.BooleanField()
     limit = models.PositiveIntegerField(blank=True, null=True)
+    # Las inscripciones entran a una cola (AdmissionTicket) que reparte los
+    # cupos por orden de llegada; ver apps.events.admission.
+    queued_admission = models.BooleanField(default=False)
+    # Inscripciones que ocupan cupo, mantenido por EventRegisteredUser.save().
+    registered_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Agregados de EventReview, mantenidos por EventReview.save().
+    rating_avg = models.FloatField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_1_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_2_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_3_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_4_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_5_count = models.PositiveIntegerField(default=0, editable=False)
+    # Tendencia con decaimiento exponencial en escala logarítmica, mantenida
+    # por las inscripciones y reseñas; ver apps.events.trending.
+    trending_score = models.FloatField(default=0, editable=False)
+
+    # Solo se llena en PostgreSQL; ver apps.events.search.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="event_search_vector_gin"),
+            live_index("event_date", "id", name="event_date_id_idx"),
+            live_index("rating_avg", "id", name="event_rating_avg_id_idx"),
+            live_index("trending_score", "id", name="event_trending_id_idx"),
+            # Feed por intereses: rango de fechas dentro de cada categoría.
+            live_index("event_category", "event_date", "id", name="event_category_date_id_idx"),
+            # Eventos de un organizador.
+            live_index("event_organizer", "event_date", "id", name="event_organizer_date_id_idx"),
+            # Búsqueda por prefijo geohash (LIKE 'abc%').
+            live_index("geohash", name="event_geohash_idx", opclasses=["varchar_pattern_ops"]),
+        ]
 
     def clean(self):
         super().clean()
@@ -52,12 +101,35 @@ class Event(BaseModel):
         if not self.paid and self.price:
             raise ValidationError("No puede asignar un precio a eventos gratuitos.")
 
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValidationError("Debe ingresar latitud y longitud juntas.")
+
         if self.has_limit and (self.limit is None or self.limit <= 0):
             raise ValidationError("Debe ingresar un límite válido de participantes.")
 
         if not self.has_limit and self.limit:
             raise ValidationError("No puede establecer un límite si el evento no tiene restricciones de cupo.")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "event_category_id" in field_names:
+            # Categoría guardada: si cambia, su feed también se invalida.
+            instance._stored_category_id = instance.event_category_id
+        return instance
+
+    def save(self, *args, **kwargs):
+        has_coordinates = self.latitude is not None and self.longitude is not None
+        self.geohash = geo.encode_geohash(self.latitude, self.longitude) if has_coordinates else None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"}.intersection(update_fields):
+            kwargs["update_fields"] = update_fields = {*update_fields, "geohash"}
+
+        super().save(*args, **kwargs)
+        self._stored_category_id = self.event_category_id
+        if update_fields is None or search.SEARCH_SOURCE_FIELDS.intersection(update_fields):
+            search.update_search_vector(type(self)._base_manager.using(self._state.db).filter(pk=self.pk))
+
     def __str__(self):
         return self.event_name
 
@@ -75,20 +147,119 @@ class EventRegisteredUser(BaseModel):
 
     class Meta:
         constraints = [models.UniqueConstraint(fields=["event", "user"], name="unique_event_user")]
+        indexes = [
+            live_index("created_at", "id", name="eventreguser_created_id_idx"),
+            # Inscripciones de un evento por estado (organizadores) y de un usuario.
+            live_index("event", "registration_status", name="eventreguser_event_status_idx"),
+            live_index("user", "created_at", name="eventreguser_user_created_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {"event_id", "registration_status", "deleted_at"}.issubset(field_names):
+            instance._seat_event_id = instance._seat_state()
+        return instance
+
+    def _seat_state(self):
+        # Evento en el que la inscripción ocupa un cupo, o None si no ocupa ninguno.
+        if self.deleted_at is not None or self.registration_status not in capacity.SEAT_STATUSES:
+            return None
+        return self.event_id
+
+    def _stored_seat_state(self):
+        if hasattr(self, "_seat_event_id"):
+            return self._seat_event_id
+        if self.pk is None:
+            return None
+        row = type(self).all_objects.filter(pk=self.pk).values("event_id", "registration_status", "deleted_at").first()
+        if row is None or row["deleted_at"] is not None or row["registration_status"] not in capacity.SEAT_STATUSES:
+            return None
+        return row["event_id"]
 
     def clean(self):
         super().clean()
 
-        if self.event.has_limit:
-            # Excluir la instancia actual para evitar contarla antes de que se guarde.
-            registered_count = self.event.eventregistereduser_set.exclude(id=self.id).count()
-            if registered_count >= self.event.limit:
+        # Validación anticipada; la garantía real es el UPDATE condicional de save().
+        if self._seat_state() is not None and self._stored_seat_state() != self.event_id:
+            event = Event._base_manager.filter(pk=self.event_id).values("has_limit", "limit", "registered_count").first()
+            if event and event["has_limit"] and event["registered_count"] >= event["limit"]:
                 raise ValidationError("El evento ha alcanzado su límite de registrados.")
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get("using")):
+            old_event_id = self._stored_seat_state()
+            new_event_id = self._seat_state()
+            if new_event_id != old_event_id:
+                if new_event_id is not None and not capacity.reserve_seat(Event, new_event_id):
+                    raise ValidationError("El evento ha alcanzado su límite de registrados.")
+                if new_event_id is not None:
+                    trending.record_activity(Event, new_event_id, trending.REGISTRATION_WEIGHT)
+                if old_event_id is not None:
+                    capacity.release_seat(Event, old_event_id)
+                    self._promote_waitlist(old_event_id, kwargs.get("using"))
+            super().save(*args, **kwargs)
+            self._seat_event_id = new_event_id
+
+    @staticmethod
+    def _promote_waitlist(event_id, using=None):
+        # El cupo liberado pasa al primero de la lista de espera (si la hay).
+        transaction.on_commit(partial(admission.promote_waitlist, AdmissionTicket, event_id), using=using)
+
     def __str__(self):
         return f"{self.user.email} - {self.event.event_name}"
 
 
+class AdmissionTicket(BaseModel):
+    """
+    Solicitud de inscripción a un evento con ``queued_admission``. Se
+    responde de inmediato con el ticket y apps.events.admission la convierte
+    después en un EventRegisteredUser, o la deja en lista de espera.
+    """
+
+    STATUS_CHOICES = (
+        ("1", "En cola"),
+        ("2", "Admitido"),
+        ("3", "En lista de espera"),
+        ("4", "Rechazado"),
+    )
+    event = models.ForeignKey(Event, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    status = models.CharField(default="1", choices=STATUS_CHOICES, max_length=1)
+    registration = models.ForeignKey(EventRegisteredUser, blank=True, null=True, on_delete=models.SET_NULL)
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["event", "user"], name="unique_admission_ticket")]
+        indexes = [
+            # Tickets pendientes de cada evento en orden de llegada.
+            live_index("event", "status", "id", name="admticket_event_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.event_id} - {self.get_status_display()}"
+
+
+class EventSimilarity(models.Model):
+    """
+    Top-k de eventos con más asistentes en común con ``event`` (similitud
+    coseno sobre las inscripciones). Es un dato derivado: lo reconstruye por
+    completo el comando build_event_similarities.
+    """
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="similar_events")
+    similar_event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="similar_to")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    common_attendees = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["event", "rank"], name="unique_event_similarity_rank")]
+
+    def __str__(self):
+        return f"{self.event_id} -> {self.similar_event_id} ({self.score:.3f})"
+
+
 class EventReview(BaseModel):
     RATING_CHOICES = (
         (1, "1 - Muy malo"),
@@ -107,6 +278,43 @@ class EventReview(BaseModel):
         constraints = [
             models.UniqueConstraint(fields=["user", "event"], name="unique_event_review")
         ]
+        indexes = [
+            live_index("created_at", "id", name="eventreview_created_id_idx"),
+            live_index("event", "created_at", "id", name="eventreview_event_created_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {"event_id", "rating", "deleted_at"}.issubset(field_names):
+            instance._counted_state = instance._rating_state()
+        return instance
+
+    def _rating_state(self):
+        # (evento, calificación) con que la reseña cuenta en los agregados del evento.
+        if self.deleted_at is not None:
+            return None
+        return self.event_id, self.rating
+
+    def _stored_rating_state(self):
+        if hasattr(self, "_counted_state"):
+            return self._counted_state
+        if self.pk is None:
+            return None
+        row = type(self).all_objects.filter(pk=self.pk).values("event_id", "rating", "deleted_at").first()
+        if row is None or row["deleted_at"] is not None:
+            return None
+        return row["event_id"], row["rating"]
+
+    def save(self, *args, **kwargs):
+        # Cubre creación, edición, borrado lógico (BaseModel.delete) y restore().
+        with transaction.atomic(using=kwargs.get("using")):
+            old_state = self._stored_rating_state()
+            super().save(*args, **kwargs)
+            self._counted_state = self._rating_state()
+            ratings.apply_review_change(Event, old_state, self._counted_state)
+            if old_state is None and self._counted_state is not None:
+                trending.record_activity(Event, self.event_id, trending.REVIEW_WEIGHT)
 
     def clean(self):
         super().clean()
@@ -0,0 +1,6 @@
+from apps.base.pagination import KeysetPagination
+
+
+class EventPagination(KeysetPagination):
+    # Los eventos se recorren en orden cronológico, del más próximo al más lejano.
+    ordering = ("event_date", "id")
@@ -0,0 +1,88 @@
+from django.db.models import Count, F, FloatField, Q
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+
+def histogram_field(rating):
+    return f"rating_{rating}_count"
+
+
+def rating_updates(old_rating=None, new_rating=None):
+    """
+    Expresiones para un único UPDATE que quita ``old_rating`` y suma
+    ``new_rating`` a los agregados de un evento. Todas las expresiones leen los
+    valores anteriores de la fila, así que el promedio se recalcula a partir del
+    histograma en la misma sentencia y no hay ventana para carreras.
+    """
+    deltas = {rating: 0 for rating in RATING_VALUES}
+    if old_rating is not None:
+        deltas[old_rating] -= 1
+    if new_rating is not None:
+        deltas[new_rating] += 1
+
+    counts = {rating: F(histogram_field(rating)) + deltas[rating] for rating in RATING_VALUES}
+    count = F("rating_count") + sum(deltas.values())
+    total = sum(counts[rating] * rating for rating in RATING_VALUES)
+
+    updates = {histogram_field(rating): counts[rating] for rating in RATING_VALUES if deltas[rating]}
+    updates["rating_count"] = count
+    updates["rating_avg"] = Coalesce(Cast(total, FloatField()) / NullIf(count, 0), 0.0)
+    # El evento cambia para los clientes: invalida su ETag/Last-Modified.
+    updates["updated_at"] = timezone.now()
+    return updates
+
+
+def apply_review_change(event_model, old_state, new_state):
+    """
+    Actualiza los agregados a partir del estado ``(event_id, rating)`` con el
+    que una reseña contaba antes y después de guardarse (``None`` si no cuenta).
+    """
+    if old_state == new_state:
+        return
+
+    manager = event_model._base_manager
+    if old_state and new_state and old_state[0] == new_state[0]:
+        manager.filter(pk=new_state[0]).update(**rating_updates(old_state[1], new_state[1]))
+        return
+    if old_state:
+        manager.filter(pk=old_state[0]).update(**rating_updates(old_rating=old_state[1]))
+    if new_state:
+        manager.filter(pk=new_state[0]).update(**rating_updates(new_rating=new_state[1]))
+
+
+def rebuild_ratings(event_model, review_model, batch_size=1000):
+    """
+    Recalcula desde cero los agregados de todos los eventos, en lotes de
+    ``batch_size`` eventos: una consulta agrupada y un ``bulk_update`` por lote.
+    Recibe los modelos para poder usarse también desde migraciones.
+    """
+    aggregates = {"rating_count": Count("id")}
+    aggregates.update({histogram_field(rating): Count("id", filter=Q(rating=rating)) for rating in RATING_VALUES})
+    fields = ["rating_avg", *aggregates]
+
+    updated = 0
+    last_pk = 0
+    while True:
+        events = list(event_model._base_manager.filter(pk__gt=last_pk).order_by("pk").only("pk")[:batch_size])
+        if not events:
+            return updated
+        last_pk = events[-1].pk
+
+        rows = (
+            review_model._base_manager.filter(event_id__in=[event.pk for event in events], deleted_at=None)
+            .values("event_id")
+            .annotate(**aggregates)
+            .order_by()
+        )
+        by_event = {row.pop("event_id"): row for row in rows}
+        for event in events:
+            row = by_event.get(event.pk, dict.fromkeys(aggregates, 0))
+            for field, value in row.items():
+                setattr(event, field, value)
+            total = sum(row[histogram_field(rating)] * rating for rating in RATING_VALUES)
+            event.rating_avg = total / row["rating_count"] if row["rating_count"] else 0.0
+
+        event_model._base_manager.bulk_update(events, fields)
+        updated += len(events)
@@ -0,0 +1,162 @@
+"""
+Recomendaciones "quienes asistieron a X también asistieron a Y".
+
+El cálculo es fuera de línea (comando build_event_similarities) y trabaja
+sobre arreglos de numpy, sin instancias de modelo:
+
+1. ``registration_chunks`` recorre EventRegisteredUser ordenado por usuario
+   con paginación por llave, en bloques que nunca parten a un usuario.
+2. ``CoAttendance.add`` convierte cada bloque en la matriz dispersa
+   usuario×evento (coordenadas) y suma sus pares de eventos co-asistidos
+   (XᵀX) a los acumulados, reduciendo con ``np.unique`` en cada paso; la
+   memoria depende de los pares distintos, no de las inscripciones.
+3. ``CoAttendance.top_k`` normaliza con similitud coseno y se queda con los
+   ``k`` mejores de cada evento con un ``lexsort``.
+
+El resultado se guarda en EventSimilarity y la acción ``similar`` de
+EventViewSet lo lee con una consulta indexada.
+"""
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Q
+
+from apps.events.capacity import SEAT_STATUSES
+
+CHUNK_SIZE = 200_000
+# Usuarios con más inscripciones que esto aportan pares cuadráticos y poca
+# señal (cuentas de prueba, organizadores); se descartan.
+MAX_EVENTS_PER_USER = 200
+WRITE_BATCH_SIZE = 5000
+
+
+def registration_chunks(registration_model, chunk_size=CHUNK_SIZE):
+    """
+    Bloques ``(user_ids, event_ids)`` (arreglos int64) de las inscripciones que
+    ocupan cupo, ordenados por usuario. Las filas del último usuario de cada
+    lectura pasan al bloque siguiente, así un usuario nunca queda repartido
+    entre dos bloques.
+    """
+    queryset = registration_model.objects.filter(registration_status__in=SEAT_STATUSES).order_by("user_id", "event_id")
+    carry = np.empty((0, 2), dtype=np.int64)
+    while True:
+        page = queryset
+        if len(carry):
+            # (user_id, event_id) es único: sirve de llave de paginación.
+            user_id, event_id = carry[-1].tolist()
+            page = page.filter(Q(user_id__gt=user_id) | Q(user_id=user_id, event_id__gt=event_id))
+        rows = np.array(page.values_list("user_id", "event_id")[:chunk_size], dtype=np.int64).reshape(-1, 2)
+        complete = len(rows) < chunk_size
+        rows = np.concatenate([carry, rows])
+        if complete:
+            if len(rows):
+                yield rows[:, 0], rows[:, 1]
+            return
+        cut = np.searchsorted(rows[:, 0], rows[-1, 0])
+        carry = rows[cut:]
+        if cut:
+            yield rows[:cut, 0], rows[:cut, 1]
+
+
+class CoAttendance:
+    """Acumulador de co-asistencias entre eventos."""
+
+    def __init__(self, max_events_per_user=MAX_EVENTS_PER_USER):
+        self.max_events_per_user = max_events_per_user
+        self.event_ids = np.empty(0, dtype=np.int64)
+        self.attendees = np.empty(0, dtype=np.int64)
+        # Pares (a, b) codificados como a * 2**32 + b con sus conteos.
+        self.pair_codes = np.empty(0, dtype=np.int64)
+        self.pair_counts = np.empty(0, dtype=np.int64)
+
+    def add(self, user_ids, event_ids):
+        """Suma un bloque de inscripciones; ``user_ids`` debe venir agrupado por usuario."""
+        user_ids = np.asarray(user_ids, dtype=np.int64)
+        event_ids = np.asarray(event_ids, dtype=np.int64)
+        if not len(user_ids):
+            return
+
+        # Grupos contiguos por usuario: inicio y tamaño de cada uno.
+        starts = np.flatnonzero(np.r_[True, user_ids[1:] != user_ids[:-1]])
+        sizes = np.diff(np.r_[starts, len(user_ids)])
+        keep = np.repeat(sizes <= self.max_events_per_user, sizes)
+        self._add_attendees(event_ids[keep])
+
+        group_sizes = sizes[sizes <= self.max_events_per_user]
+        events = event_ids[keep]
+        if not len(events):
+            return
+        group_starts = np.r_[0, np.cumsum(group_sizes)[:-1]]
+
+        # Cada inscripción se empareja con todas las de su usuario (XᵀX sin
+        # materializar X): la fila i aparece n veces, con j recorriendo el grupo.
+        row_sizes = np.repeat(group_sizes, group_sizes)
+        row_starts = np.repeat(group_starts, group_sizes)
+        left = np.repeat(np.arange(len(events)), row_sizes)
+        offsets = np.arange(len(left)) - np.repeat(np.cumsum(row_sizes) - row_sizes, row_sizes)
+        right = np.repeat(row_starts, row_sizes) + offsets
+        distinct = left != right
+        codes = (events[left[distinct]] << 32) | events[right[distinct]]
+
+        codes, counts = np.unique(codes, return_counts=True)
+        self._merge_pairs(codes, counts)
+
+    def _add_attendees(self, event_ids):
+        ids, counts = np.unique(event_ids, return_counts=True)
+        merged, inverse = np.unique(np.r_[self.event_ids, ids], return_inverse=True)
+        weights = np.r_[self.attendees, counts]
+        self.attendees = np.bincount(inverse, weights=weights, minlength=len(merged)).astype(np.int64)
+        self.event_ids = merged
+
+    def _merge_pairs(self, codes, counts):
+        merged, inverse = np.unique(np.r_[self.pair_codes, codes], return_inverse=True)
+        weights = np.r_[self.pair_counts, counts]
+        self.pair_counts = np.bincount(inverse, weights=weights, minlength=len(merged)).astype(np.int64)
+        self.pair_codes = merged
+
+    def top_k(self, k, min_common=2):
+        """
+        Arreglos ``(evento, similar, rango, puntaje, comunes)`` con los ``k``
+        eventos más parecidos a cada evento (coseno: comunes / √(nₐ·n_b)).
+        """
+        keep = self.pair_counts >= min_common
+        codes, common = self.pair_codes[keep], self.pair_counts[keep]
+        left, right = codes >> 32, codes & 0xFFFFFFFF
+        attendees = self.attendees.astype(np.float64)
+        degree = attendees[np.searchsorted(self.event_ids, left)] * attendees[np.searchsorted(self.event_ids, right)]
+        score = common / np.sqrt(degree)
+
+        # Por evento, de mayor a menor puntaje; empates por el id más bajo.
+        order = np.lexsort((right, -score, left))
+        left, right, score, common = left[order], right[order], score[order], common[order]
+        starts = np.flatnonzero(np.r_[True, left[1:] != left[:-1]]) if len(left) else np.empty(0, dtype=np.int64)
+        rank = np.arange(len(left)) - np.repeat(starts, np.diff(np.r_[starts, len(left)]))
+        best = rank < k
+        return left[best], right[best], rank[best] + 1, score[best], common[best]
+
+
+def build_similarities(registration_model, k=20, min_common=2, chunk_size=CHUNK_SIZE):
+    """Recorre las inscripciones y devuelve el ``top_k`` de cada evento."""
+    co_attendance = CoAttendance()
+    for user_ids, event_ids in registration_chunks(registration_model, chunk_size):
+        co_attendance.add(user_ids, event_ids)
+    return co_attendance.top_k(k, min_common)
+
+
+def store_similarities(similarity_model, top_k, batch_size=WRITE_BATCH_SIZE):
+    """Reemplaza la tabla de similitudes completa en una transacción."""
+    rows = zip(*(column.tolist() for column in top_k))
+    with transaction.atomic():
+        similarity_model.objects.all().delete()
+        batch = []
+        for event_id, similar_id, rank, score, common in rows:
+            batch.append(
+                similarity_model(
+                    event_id=event_id, similar_event_id=similar_id, rank=rank, score=score, common_attendees=common
+                )
+            )
+            if len(batch) >= batch_size:
+                similarity_model.objects.bulk_create(batch)
+                batch = []
+        similarity_model.objects.bulk_create(batch)
+    return len(top_k[0])
@@ -0,0 +1,78 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import Case, DecimalField, F, FloatField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Cast, Round
+
+# LANGUAGE_CODE es "es-co": el diccionario de PostgreSQL hace stemming en español.
+SEARCH_CONFIG = "spanish"
+
+# Campos indexados y su peso (A > B > C), equivalentes a los pesos por defecto
+# de ts_rank para el camino de respaldo sin PostgreSQL.
+SEARCH_FIELDS = (
+    ("event_name", "A"),
+    ("event_category__name", "B"),
+    ("event_location", "B"),
+    ("event_description", "C"),
+)
+WEIGHT_VALUES = {"A": 1.0, "B": 0.4, "C": 0.2}
+# search_rank va en el cursor de paginación y se compara por igualdad: se
+# redondea para que el valor que vuelve del JSON sea exactamente el de la fila.
+RANK_DECIMAL_PLACES = 6
+
+# Cambios en estos campos obligan a recalcular el vector.
+SEARCH_SOURCE_FIELDS = {"event_name", "event_category", "event_location", "event_description"}
+
+
+def uses_postgres(using):
+    return connections[using].vendor == "postgresql"
+
+
+def search_vector(model):
+    """
+    Vector de búsqueda de ``model`` (Event) listo para ``QuerySet.update``. El
+    nombre de la categoría se lee con una subconsulta porque un UPDATE no
+    admite joins. Recibe el modelo para poder usarse desde migraciones.
+    """
+    category_model = model._meta.get_field("event_category").related_model
+    category_name = Subquery(category_model._base_manager.filter(pk=OuterRef("event_category_id")).values("name")[:1])
+
+    vector = None
+    for field, weight in SEARCH_FIELDS:
+        source = category_name if field == "event_category__name" else field
+        part = SearchVector(source, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vector(queryset):
+    """Recalcula ``search_vector`` de las filas del queryset con un solo UPDATE."""
+    if not uses_postgres(queryset.db):
+        return 0
+    return queryset.update(search_vector=search_vector(queryset.model))
+
+
+def search_events(queryset, term):
+    """
+    Filtra por ``term`` y anota ``search_rank``. En PostgreSQL usa el vector
+    con índice GIN; en otros motores (SQLite en pruebas locales) cae a
+    ``icontains`` con un rango aproximado que respeta los mismos pesos.
+    """
+    if uses_postgres(queryset.db):
+        query = SearchQuery(term, config=SEARCH_CONFIG, search_type="websearch")
+        rank = Cast(
+            SearchRank(F("search_vector"), query), DecimalField(max_digits=12, decimal_places=RANK_DECIMAL_PLACES)
+        )
+        return queryset.filter(search_vector=query).annotate(search_rank=rank)
+
+    rank = Value(0.0, output_field=FloatField())
+    for word in term.split():
+        matches = Q()
+        for field, weight in SEARCH_FIELDS:
+            matches |= Q(**{f"{field}__icontains": word})
+            rank += Case(
+                When(**{f"{field}__icontains": word}, then=Value(WEIGHT_VALUES[weight])),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        queryset = queryset.filter(matches)
+    return queryset.annotate(search_rank=Round(rank, RANK_DECIMAL_PLACES))
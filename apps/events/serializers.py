@@ -1,6 +1,12 @@
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
-from apps.events.models import Event, EventCategory, EventRegisteredUser, EventReview, Interests
+from apps.base.query_plans import QueryPlan
+from apps.base.serializers import ImageVariantsField, SparseFieldsetsMixin
+from apps.events import stats
+from apps.events.catalog import catalog
+from apps.events.models import AdmissionTicket, Event, EventCategory, EventRegisteredUser, EventReview, Interests
+from apps.users.models import User
 
 
 class EventCategorySerializer(serializers.ModelSerializer):
@@ -9,12 +15,30 @@ class EventCategorySerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+@extend_schema_field(EventCategorySerializer)
+class CatalogCategoryField(serializers.Field):
+    """Categoría anidada resuelta desde el catálogo en memoria, sin JOIN."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("source", "event_category_id")
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, category_id):
+        return catalog.representation(category_id, EventCategorySerializer)
+
+    def compiled_converter(self):
+        # CompiledSerializer: una sola lectura de la versión del catálogo por respuesta.
+        return catalog.resolver(EventCategorySerializer)
+
+
 class InterestsSerializer(serializers.ModelSerializer):
     event_categories = EventCategorySerializer(many=True, read_only=True)
 
     class Meta:
         model = Interests
         fields = ["id", "user", "event_categories"]
+        query_plan = QueryPlan(prefetch_related=("event_categories",))
 
 
 class InterestsWriteSerializer(serializers.ModelSerializer):
@@ -27,13 +51,48 @@ class InterestsWriteSerializer(serializers.ModelSerializer):
         exclude = ["user"]
 
 
-class EventSerializer(serializers.ModelSerializer):
-    event_category = EventCategorySerializer(read_only=False)
+class UserSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ["id", "email", "name", "last_name"]
+
+
+class EventSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Event
+        fields = ["id", "event_name", "event_date", "event_location"]
+
+
+def _user_plan(relation):
+    return QueryPlan(select_related=(relation,), only=tuple(f"{relation}__{name}" for name in ("email", "name", "last_name")))
+
+
+def _event_plan(relation):
+    return QueryPlan(
+        select_related=(relation,),
+        only=tuple(f"{relation}__{name}" for name in ("event_name", "event_date", "event_location")),
+    )
+
+
+class EventSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    event_category = CatalogCategoryField()
     event_organizer = serializers.StringRelatedField()
+    event_picture_variants = ImageVariantsField("event_picture")
 
     class Meta:
         model = Event
-        fields = "__all__"
+        exclude = ["search_vector", "event_picture_hash", "trending_score"]
+        query_plan = QueryPlan(
+            select_related=("event_organizer",),
+            only=("event_organizer__email",),
+            defer=("search_vector",),
+        )
+        field_query_plans = {
+            "event_organizer": QueryPlan(select_related=("event_organizer",), only=("event_organizer__email",)),
+        }
+        expandable = {"event_organizer": (UserSummarySerializer, _user_plan("event_organizer"))}
+        # Columnas de values() para CompiledSerializer (str() de cada relación).
+        compiled_sources = {"event_organizer": "event_organizer__email"}
 
 
 class EventWriteSerializer(serializers.ModelSerializer):
@@ -41,16 +100,44 @@ class EventWriteSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Event
-        exclude = ["event_organizer"]
+        exclude = ["event_organizer", "search_vector", "event_picture_hash", "trending_score"]
+
 
+class OrganizerEventStatsSerializer(serializers.Serializer):
+    """Fila de apps.events.stats.organizer_stats()."""
 
-class EventRegisteredUserSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField()
+    event_name = serializers.CharField()
+    event_date = serializers.DateTimeField()
+    limit = serializers.IntegerField(allow_null=True)
+    registered_count = serializers.IntegerField()
+    remaining_capacity = serializers.IntegerField(allow_null=True)
+    registrations = serializers.SerializerMethodField()
+    review_count = serializers.IntegerField(source="rating_count")
+    rating_avg = serializers.FloatField()
+
+    def get_registrations(self, row) -> dict:
+        # Inscripciones vigentes por registration_status ("1": Pendiente, ...).
+        return {code: row[field] for code, field in stats.STATUS_FIELDS.items()}
+
+
+class EventRegisteredUserSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     event = serializers.StringRelatedField()
     user = serializers.StringRelatedField()
 
     class Meta:
         model = EventRegisteredUser
         fields = "__all__"
+        query_plan = QueryPlan(select_related=("event", "user"), only=("event__event_name", "user__email"))
+        field_query_plans = {
+            "event": QueryPlan(select_related=("event",), only=("event__event_name",)),
+            "user": QueryPlan(select_related=("user",), only=("user__email",)),
+        }
+        expandable = {
+            "event": (EventSummarySerializer, _event_plan("event")),
+            "user": (UserSummarySerializer, _user_plan("user")),
+        }
+        compiled_sources = {"event": "event__event_name", "user": "user__email"}
 
 
 class EventRegisteredUserWriteSerializer(serializers.ModelSerializer):
@@ -59,13 +146,40 @@ class EventRegisteredUserWriteSerializer(serializers.ModelSerializer):
         exclude = ["user"]
 
 
-class EventReviewSerializer(serializers.ModelSerializer):
+class AdmissionTicketSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AdmissionTicket
+        fields = ["id", "event", "status", "registration", "created_at", "processed_at"]
+        read_only_fields = fields
+
+
+class BulkRegistrationStatusSerializer(serializers.Serializer):
+    """Selección por ``ids`` o por ``event`` (y opcionalmente ``current_status``)."""
+
+    MAX_IDS = 5000
+
+    registration_status = serializers.ChoiceField(choices=EventRegisteredUser.STATUS_CHOICES)
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=MAX_IDS)
+    event = serializers.IntegerField(required=False)
+    current_status = serializers.ChoiceField(choices=EventRegisteredUser.STATUS_CHOICES, required=False)
+
+    def validate(self, attrs):
+        if not attrs.get("ids") and "event" not in attrs:
+            raise serializers.ValidationError("Indique ids o event.")
+        return attrs
+
+
+class EventReviewSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField()
     event = serializers.StringRelatedField()
 
     class Meta:
         model = EventReview
         fields = "__all__"
+        query_plan = QueryPlan(select_related=("event", "user"), only=("event__event_name", "user__email"))
+        field_query_plans = EventRegisteredUserSerializer.Meta.field_query_plans
+        expandable = EventRegisteredUserSerializer.Meta.expandable
+        compiled_sources = EventRegisteredUserSerializer.Meta.compiled_sources
 
 
 class EventReviewWriteSerializer(serializers.ModelSerializer):
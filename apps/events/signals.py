@@ -0,0 +1,71 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.base import images
+from apps.events import capacity, feed, ratings, search
+from apps.events.catalog import catalog
+from apps.events.models import Event, EventCategory, EventRegisteredUser, EventReview, Interests
+
+images.register(Event, "event_picture")
+
+
+@receiver(post_save, sender=Interests)
+@receiver(post_delete, sender=Interests)
+def invalidate_feed_on_interests_change(sender, instance, **kwargs):
+    feed.invalidate_user(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Interests.event_categories.through)
+def invalidate_feed_on_interest_categories_change(sender, instance, **kwargs):
+    if isinstance(instance, Interests):
+        feed.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_feed_on_event_change(sender, instance, **kwargs):
+    feed.invalidate_category(instance.event_category_id)
+    # Al cambiar de categoría, el feed de la anterior también lo listaba.
+    stored_category_id = getattr(instance, "_stored_category_id", None)
+    if stored_category_id is not None and stored_category_id != instance.event_category_id:
+        feed.invalidate_category(stored_category_id)
+
+
+@receiver(pre_delete, sender=EventRegisteredUser)
+def release_seat_on_hard_delete(sender, instance, using, **kwargs):
+    # force_delete() y el borrado en cascada de Django (p. ej. al eliminar el
+    # usuario) no pasan por save(): el cupo se libera aquí, antes del DELETE.
+    event_id = instance._stored_seat_state()
+    if event_id is not None:
+        capacity.release_seat(Event, event_id)
+        instance._promote_waitlist(event_id, using)
+
+
+@receiver(pre_delete, sender=EventReview)
+def remove_rating_on_hard_delete(sender, instance, **kwargs):
+    # Igual que los cupos: el borrado definitivo no pasa por save().
+    ratings.apply_review_change(Event, instance._stored_rating_state(), None)
+
+
+@receiver(post_save, sender=EventCategory)
+def update_search_vector_on_category_change(sender, instance, created, **kwargs):
+    # El nombre de la categoría forma parte del vector de búsqueda de sus eventos.
+    if not created:
+        events = Event._base_manager.filter(event_category=instance)
+        search.update_search_vector(events)
+        # Los eventos muestran el nombre de la categoría: cambia su ETag.
+        events.update(updated_at=timezone.now())
+        # Borrar o restaurar la categoría arrastra sus eventos sin pasar por Event.save().
+        feed.invalidate_category(instance.pk)
+
+
+@receiver(post_save, sender=EventCategory)
+@receiver(post_delete, sender=EventCategory)
+def invalidate_category_catalog(sender, instance, **kwargs):
+    # Cubre creación, edición, borrado lógico y restore(). Se invalida ya (este
+    # worker ve su propio cambio dentro de la transacción) y otra vez tras el
+    # commit, por si otro worker recargó antes de que el cambio fuera visible.
+    catalog.invalidate()
+    transaction.on_commit(catalog.invalidate)
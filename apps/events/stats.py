@@ -0,0 +1,53 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, F, IntegerField, Q, When
+from django.db.models.functions import Greatest
+
+from apps.events.models import Event, EventRegisteredUser
+
+STATS_KEY = "events:organizer-stats:{organizer_id}:{params}"
+
+STATUS_FIELDS = {code: f"registrations_{code}" for code, _ in EventRegisteredUser.STATUS_CHOICES}
+
+
+def organizer_stats(organizer):
+    """
+    Un único SELECT ... GROUP BY con los indicadores de cada evento del
+    organizador. Las inscripciones por estado salen de conteos condicionales
+    (``COUNT(...) FILTER (WHERE ...)``) sobre un solo JOIN; las reseñas y el
+    cupo ya están desnormalizados en el evento, así que no hace falta unir
+    una segunda tabla que multiplicaría las filas.
+    """
+    live = Q(eventregistereduser__deleted_at=None)
+    by_status = {
+        field: Count("eventregistereduser", filter=live & Q(eventregistereduser__registration_status=code))
+        for code, field in STATUS_FIELDS.items()
+    }
+    remaining = Case(
+        When(has_limit=True, then=Greatest(F("limit") - F("registered_count"), 0)),
+        default=None,
+        output_field=IntegerField(),
+    )
+    return (
+        Event.objects.filter(event_organizer=organizer)
+        .values("id", "event_name", "event_date", "has_limit", "limit", "registered_count", "rating_count", "rating_avg")
+        .annotate(remaining_capacity=remaining, **by_status)
+    )
+
+
+def get_cached(organizer, request):
+    if not settings.EVENT_ORGANIZER_STATS_CACHE_TIMEOUT:
+        return None
+    return cache.get(_key(organizer, request))
+
+
+def set_cached(organizer, request, data):
+    if settings.EVENT_ORGANIZER_STATS_CACHE_TIMEOUT:
+        cache.set(_key(organizer, request), data, settings.EVENT_ORGANIZER_STATS_CACHE_TIMEOUT)
+
+
+def _key(organizer, request):
+    params = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+    return STATS_KEY.format(organizer_id=organizer.pk, params=params)
@@ -0,0 +1,61 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.events import geo
+from apps.events.models import Event, EventCategory
+
+
+class TestGeohash:
+
+    def test_encode_known_value(self):
+        assert geo.encode_geohash(57.64911, 10.40744, precision=11) == "u4pruydqqvj"
+
+    def test_cover_contains_point(self):
+        latitude, longitude = 6.2442, -75.5812
+        cells = geo.cover_bbox(*geo.bounding_box(latitude, longitude, 5))
+        assert len(cells) <= geo.MAX_COVER_CELLS
+        assert any(geo.encode_geohash(latitude, longitude).startswith(cell) for cell in cells)
+
+    def test_cover_bbox_corners(self):
+        bbox = (4.5, -75.8, 6.4, -74.0)
+        cells = geo.cover_bbox(*bbox)
+        for latitude in (bbox[0], bbox[2]):
+            for longitude in (bbox[1], bbox[3]):
+                assert any(geo.encode_geohash(latitude, longitude).startswith(cell) for cell in cells)
+
+    def test_static_geocoder(self):
+        assert geo.StaticGeocoder().geocode("Plaza Mayor, Medellín") == (6.2442, -75.5812)
+        assert geo.StaticGeocoder().geocode("Lugar desconocido") is None
+        assert geo.NullGeocoder().geocode("Medellín") is None
+
+
+@pytest.mark.django_db
+@override_settings(EVENT_GEOCODER="apps.events.geo.StaticGeocoder")
+def test_geocode_events_command(django_user_model):
+    organizer = django_user_model.objects.create_user(email="organizer@test.com", password="123456", username="organizer")
+    category = EventCategory.objects.create(name="Conferencia")
+    events = [
+        Event.objects.create(
+            event_name=f"Evento {location}",
+            event_category=category,
+            event_organizer=organizer,
+            event_description="Descripción",
+            event_location=location,
+            event_date=timezone.now() + timedelta(days=1),
+            paid=False,
+            has_limit=False,
+        )
+        for location in ("Centro, Medellín", "Centro, Medellín", "Bogotá", "En algún lugar")
+    ]
+
+    call_command("geocode_events", batch_size=1, stdout=StringIO())
+
+    for event in events:
+        event.refresh_from_db()
+    assert [event.geohash is not None for event in events] == [True, True, True, False]
+    assert events[0].geohash == geo.encode_geohash(6.2442, -75.5812)
@@ -0,0 +1,20 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from apps.base.explain import explain_index_usage
+from apps.events.management.commands.explain_indexes import applicable_hot_paths
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name,query,index", applicable_hot_paths(connection.vendor))
+def test_hot_path_uses_partial_index(name, query, index):
+    used, plan = explain_index_usage(query(), index, force=True)
+    assert used, f"{name}: se esperaba {index}\n{plan}"
+
+
+@pytest.mark.django_db
+def test_explain_indexes_command():
+    call_command("explain_indexes", force=True, stdout=StringIO())
@@ -1,5 +1,8 @@
+from io import StringIO
+
 import pytest
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.utils import timezone
 from datetime import timedelta
 
@@ -294,6 +297,81 @@ class TestEventRegisteredUser:
             reg_user = EventRegisteredUser(event=event, user=user2)
             reg_user.clean()
 
+    def test_registered_count(self, django_user_model):
+        users = [
+            django_user_model.objects.create_user(email=f"user{i}@test.com", password="123456", username=f"user{i}")
+            for i in range(3)
+        ]
+        organizer = django_user_model.objects.create_user(email="organizer@test.com", password="123456", username="organizer")
+        category = EventCategory.objects.create(name="Tecnología")
+        event = Event.objects.create(
+            event_name="Evento con cupo",
+            event_category=category,
+            event_organizer=organizer,
+            event_description="Descripción del evento",
+            event_location="Online",
+            event_date=timezone.now() + timedelta(days=5),
+            paid=False,
+            has_limit=True,
+            limit=2
+        )
+
+        def registered_count():
+            event.refresh_from_db()
+            return event.registered_count
+
+        first = EventRegisteredUser.objects.create(event=event, user=users[0])
+        EventRegisteredUser.objects.create(event=event, user=users[1])
+        assert registered_count() == 2
+
+        # El evento está lleno: el UPDATE condicional rechaza la inscripción.
+        with pytest.raises(ValidationError):
+            EventRegisteredUser.objects.create(event=event, user=users[2])
+        assert EventRegisteredUser.objects.filter(event=event).count() == 2
+
+        # Cancelar libera el cupo y volver a confirmar lo ocupa de nuevo.
+        first.registration_status = "4"
+        first.save()
+        assert registered_count() == 1
+        third = EventRegisteredUser.objects.create(event=event, user=users[2])
+        assert registered_count() == 2
+        first.registration_status = "2"
+        with pytest.raises(ValidationError):
+            first.save()
+
+        # Borrado lógico y restauración.
+        third.delete()
+        assert registered_count() == 1
+        third.restore()
+        assert registered_count() == 2
+
+        # Borrado definitivo, también en cascada al eliminar al usuario.
+        EventRegisteredUser.objects.filter(pk=third.pk).force_delete()
+        assert registered_count() == 1
+        users[1].delete()
+        assert registered_count() == 0
+
+    def test_rebuild_registered_counts_command(self, django_user_model):
+        user = django_user_model.objects.create_user(email="user@test.com", password="123456", username="user")
+        organizer = django_user_model.objects.create_user(email="organizer@test.com", password="123456", username="organizer")
+        event = Event.objects.create(
+            event_name="Evento con cupo",
+            event_category=EventCategory.objects.create(name="Tecnología"),
+            event_organizer=organizer,
+            event_description="Descripción del evento",
+            event_location="Online",
+            event_date=timezone.now() + timedelta(days=5),
+            paid=False,
+            has_limit=True,
+            limit=2
+        )
+        EventRegisteredUser.objects.create(event=event, user=user)
+        Event.objects.filter(pk=event.pk).update(registered_count=2)
+
+        call_command("rebuild_registered_counts", stdout=StringIO())
+        event.refresh_from_db()
+        assert event.registered_count == 1
+
 
 @pytest.mark.django_db
 class TestEventReview:
@@ -351,4 +429,137 @@ class TestEventReview:
     def test_event_review_str(self, django_user_model):
         user = django_user_model.objects.create_user(email="reviewer@test.com", password="123456", username="reviewer")
         review = EventReview(user=user, rating=5)
-        assert str(review) == "reviewer@test.com - 5"
\ No newline at end of file
+        assert str(review) == "reviewer@test.com - 5"
+
+
+@pytest.mark.django_db
+class TestEventRatingAggregates:
+
+    @pytest.fixture
+    def event(self, django_user_model):
+        organizer = django_user_model.objects.create_user(email="organizer@test.com", password="123456", username="organizer")
+        category = EventCategory.objects.create(name="Tecnología")
+        return Event.objects.create(
+            event_name="Conferencia IA",
+            event_category=category,
+            event_organizer=organizer,
+            event_description="Descripción del evento",
+            event_location="Virtual",
+            event_date=timezone.now() + timedelta(days=10),
+            paid=False,
+            has_limit=False
+        )
+
+    def _review(self, django_user_model, event, rating, i=0):
+        user = django_user_model.objects.create_user(email=f"reviewer{i}@test.com", password="123456", username=f"reviewer{i}")
+        return EventReview.objects.create(user=user, event=event, rating=rating, review_text="Reseña")
+
+    def _aggregates(self, event):
+        event.refresh_from_db()
+        return (event.rating_count, event.rating_avg, [getattr(event, f"rating_{r}_count") for r in range(1, 6)])
+
+    def test_create_and_update(self, django_user_model, event):
+        review = self._review(django_user_model, event, 5, 1)
+        self._review(django_user_model, event, 2, 2)
+        assert self._aggregates(event) == (2, 3.5, [0, 1, 0, 0, 1])
+
+        review.rating = 4
+        review.save()
+        assert self._aggregates(event) == (2, 3.0, [0, 1, 0, 1, 0])
+
+    def test_soft_delete_restore_and_force_delete(self, django_user_model, event):
+        review = self._review(django_user_model, event, 5, 1)
+        self._review(django_user_model, event, 3, 2)
+
+        review.delete()
+        assert self._aggregates(event) == (1, 3.0, [0, 0, 1, 0, 0])
+
+        review.restore()
+        assert self._aggregates(event) == (2, 4.0, [0, 0, 1, 0, 1])
+
+        # Una instancia cargada con only() también sabe cómo contaba antes.
+        EventReview.objects.only("id").get(pk=review.pk).force_delete()
+        assert self._aggregates(event) == (1, 3.0, [0, 0, 1, 0, 0])
+
+    def test_rebuild_command(self, django_user_model, event):
+        self._review(django_user_model, event, 4, 1)
+        self._review(django_user_model, event, 1, 2)
+        Event.objects.filter(pk=event.pk).update(rating_count=0, rating_avg=0, rating_4_count=0, rating_1_count=0)
+
+        call_command("rebuild_event_ratings", batch_size=1, stdout=StringIO())
+        assert self._aggregates(event) == (2, 2.5, [1, 0, 0, 1, 0])
+
+
+@pytest.mark.django_db
+class TestSoftDeleteCascade:
+
+    @pytest.fixture
+    def event(self, django_user_model):
+        organizer = django_user_model.objects.create_user(email="organizer@test.com", password="123456", username="organizer")
+        category = EventCategory.objects.create(name="Tecnología")
+        event = Event.objects.create(
+            event_name="Conferencia IA",
+            event_category=category,
+            event_organizer=organizer,
+            event_description="Descripción del evento",
+            event_location="Virtual",
+            event_date=timezone.now() + timedelta(days=10),
+            paid=False,
+            has_limit=False
+        )
+        for i in range(3):
+            user = django_user_model.objects.create_user(email=f"user{i}@test.com", password="123456", username=f"user{i}")
+            EventRegisteredUser.objects.create(event=event, user=user)
+            EventReview.objects.create(event=event, user=user, rating=4, review_text="Reseña")
+        return event
+
+    def test_delete_and_restore_event(self, event):
+        # Una reseña que ya estaba en la papelera no vuelve con el evento.
+        old_review = EventReview.objects.filter(event=event).first()
+        old_review.delete()
+
+        event.delete()
+        assert EventRegisteredUser.objects.filter(event=event).count() == 0
+        assert EventReview.objects.filter(event=event).count() == 0
+        stamps = set(EventRegisteredUser.all_objects.filter(event=event).values_list("deleted_at", flat=True))
+        assert stamps == {event.deleted_at}
+
+        event.restore()
+        assert EventRegisteredUser.objects.filter(event=event).count() == 3
+        assert list(EventReview.objects.filter(event=event).values_list("pk", flat=True).order_by("pk")) == list(
+            EventReview.all_objects.filter(event=event).exclude(pk=old_review.pk).values_list("pk", flat=True).order_by("pk")
+        )
+        assert EventReview.trashed_objects.get().pk == old_review.pk
+
+        # Los contadores no se tocan: el evento y sus filas se van y vuelven juntos.
+        event.refresh_from_db()
+        assert (event.registered_count, event.rating_count) == (3, 2)
+
+    def test_queryset_delete_is_set_based(self, event, django_assert_max_num_queries):
+        category = event.event_category
+        # Categoría -> eventos -> inscripciones y reseñas, en lotes de una fila.
+        with django_assert_max_num_queries(30):
+            assert EventCategory.objects.filter(pk=category.pk).delete(batch_size=1) == 1
+        assert not Event.objects.filter(pk=event.pk).exists()
+        assert EventRegisteredUser.objects.count() == 0
+
+        assert EventCategory.all_objects.filter(pk=category.pk).restore() == 1
+        assert Event.objects.filter(pk=event.pk).exists()
+        assert EventRegisteredUser.objects.count() == 3
+        assert EventReview.objects.count() == 3
+
+    def test_statements_do_not_grow_with_rows(self, event, django_user_model):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as few:
+            Event.objects.filter(pk=event.pk).delete()
+        Event.all_objects.filter(pk=event.pk).restore()
+
+        for i in range(3, 20):
+            user = django_user_model.objects.create_user(email=f"user{i}@test.com", password="123456", username=f"user{i}")
+            EventRegisteredUser.objects.create(event=event, user=user)
+
+        with CaptureQueriesContext(connection) as many:
+            Event.objects.filter(pk=event.pk).delete()
+        assert len(many) == len(few)
@@ -0,0 +1,107 @@
+from collections import Counter
+from datetime import timedelta
+from io import StringIO
+from itertools import permutations
+from math import sqrt
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.events import recommendations
+from apps.events.models import Event, EventCategory, EventRegisteredUser, EventSimilarity
+
+
+def brute_force(registrations, k, min_common):
+    """Similitud coseno por fuerza bruta, para comparar con CoAttendance."""
+    by_user = {}
+    for user_id, event_id in registrations:
+        by_user.setdefault(user_id, set()).add(event_id)
+    attendees = Counter(event_id for _, event_id in registrations)
+    common = Counter(pair for events in by_user.values() for pair in permutations(events, 2))
+    result = {}
+    for (a, b), count in common.items():
+        if count >= min_common:
+            result.setdefault(a, []).append((-count / sqrt(attendees[a] * attendees[b]), b))
+    return {a: [b for _, b in sorted(pairs)[:k]] for a, pairs in result.items()}
+
+
+class TestCoAttendance:
+
+    def test_matches_brute_force_across_chunks(self):
+        rng = np.random.default_rng(1)
+        pairs = np.unique(rng.integers(1, 60, size=2000) << 32 | rng.integers(1, 40, size=2000))
+        user_ids, event_ids = pairs >> 32, pairs & 0xFFFFFFFF
+
+        co_attendance = recommendations.CoAttendance()
+        # Bloques que no parten a ningún usuario.
+        for users in np.array_split(np.unique(user_ids), 7):
+            mask = np.isin(user_ids, users)
+            co_attendance.add(user_ids[mask], event_ids[mask])
+        events, similar, rank, score, common = co_attendance.top_k(5, min_common=2)
+
+        expected = brute_force(list(zip(user_ids.tolist(), event_ids.tolist())), 5, 2)
+        result = {}
+        for event_id, similar_id in zip(events.tolist(), similar.tolist()):
+            result.setdefault(event_id, []).append(similar_id)
+        assert result == expected
+        assert rank.min() == 1 and rank.max() == 5
+        assert np.all((score > 0) & (score <= 1))
+
+    def test_skips_heavy_users(self):
+        co_attendance = recommendations.CoAttendance(max_events_per_user=2)
+        co_attendance.add([1, 1, 2, 2, 3, 3, 3], [10, 11, 10, 11, 10, 11, 12])
+
+        events, similar, rank, score, common = co_attendance.top_k(5, min_common=1)
+
+        assert events.tolist() == [10, 11]
+        assert similar.tolist() == [11, 10]
+        assert common.tolist() == [2, 2]
+        assert score.tolist() == [1.0, 1.0]
+
+    def test_empty(self):
+        co_attendance = recommendations.CoAttendance()
+        co_attendance.add([], [])
+
+        assert all(len(column) == 0 for column in co_attendance.top_k(5))
+
+
+@pytest.mark.django_db
+def test_build_event_similarities_command(django_user_model):
+    organizer = django_user_model.objects.create_user(email="organizer@test.com", password="123456", username="organizer")
+    category = EventCategory.objects.create(name="Conferencia")
+    events = [
+        Event.objects.create(
+            event_name=f"Evento {i}",
+            event_category=category,
+            event_organizer=organizer,
+            event_description="Descripción",
+            event_location="Medellín",
+            event_date=timezone.now() + timedelta(days=1),
+            paid=False,
+            has_limit=False,
+        )
+        for i in range(3)
+    ]
+    users = [
+        django_user_model.objects.create_user(email=f"user{i}@test.com", password="123456", username=f"user{i}")
+        for i in range(4)
+    ]
+    # Todos van al evento 0; tres también al 1 y uno al 2.
+    for i, user in enumerate(users):
+        EventRegisteredUser.objects.create(event=events[0], user=user)
+        if i < 3:
+            EventRegisteredUser.objects.create(event=events[1], user=user)
+    EventRegisteredUser.objects.create(event=events[2], user=users[3])
+    # Las canceladas no cuentan.
+    EventRegisteredUser.objects.create(event=events[2], user=users[0], registration_status="3")
+
+    chunks = list(recommendations.registration_chunks(EventRegisteredUser, chunk_size=2))
+    assert sum(len(user_ids) for user_ids, _ in chunks) == 8
+    assert all(not set(a[0].tolist()) & set(b[0].tolist()) for a, b in zip(chunks, chunks[1:]))
+
+    call_command("build_event_similarities", min_common=2, chunk_size=3, stdout=StringIO())
+
+    rows = EventSimilarity.objects.order_by("event_id", "rank").values_list("event_id", "similar_event_id", "common_attendees")
+    assert list(rows) == [(events[0].id, events[1].id, 3), (events[1].id, events[0].id, 3)]
@@ -1,6 +1,13 @@
+from datetime import timedelta
+from decimal import Decimal
+
 import pytest
-from apps.events.serializers import EventWriteSerializer
-from apps.events.models import EventCategory
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.base.compiled import CompiledSerializer
+from apps.events.serializers import EventRegisteredUserSerializer, EventSerializer, EventWriteSerializer
+from apps.events.models import Event, EventCategory, EventRegisteredUser
 from apps.users.models import User
 
 @pytest.mark.django_db
@@ -37,4 +44,57 @@ class TestEventSerializer:
             "limit": 0
         }
         serializer = EventWriteSerializer(data=data)
-        assert not serializer.is_valid()
\ No newline at end of file
+        assert not serializer.is_valid()
+
+@pytest.mark.django_db
+class TestCompiledSerializer:
+
+    def _render_both(self, serializer_class, queryset, rf):
+        context = {"request": rf.get("/")}
+        expected = serializer_class(queryset, many=True, context=context).data
+        compiled = CompiledSerializer(serializer_class(context=context))
+        actual = compiled.to_representation(compiled.values(queryset))
+        return JSONRenderer().render(expected), JSONRenderer().render(actual)
+
+    def test_event_output_is_identical(self, rf):
+        organizer = User.objects.create_user(email="organizer@test.com", password="123456", username="organizer")
+        category = EventCategory.objects.create(name="Conferencia")
+        common = dict(
+            event_category=category,
+            event_organizer=organizer,
+            event_description="Charla sobre IA",
+            event_location="Medellín",
+            event_date=timezone.now() + timedelta(days=3, microseconds=1234),
+        )
+        Event.objects.create(event_name="Gratis", paid=False, has_limit=False, **common)
+        Event.objects.create(
+            event_name="Pago",
+            paid=True,
+            price=Decimal("15000.5"),
+            has_limit=True,
+            limit=10,
+            latitude=6.25,
+            longitude=-75.56,
+            event_picture="event_pictures/foto.png",
+            **common,
+        )
+
+        expected, actual = self._render_both(EventSerializer, Event.objects.order_by("id"), rf)
+        assert actual == expected
+
+    def test_registration_output_is_identical(self, rf):
+        organizer = User.objects.create_user(email="organizer@test.com", password="123456", username="organizer")
+        event = Event.objects.create(
+            event_name="Tech Talk",
+            event_category=EventCategory.objects.create(name="Conferencia"),
+            event_organizer=organizer,
+            event_description="Charla sobre IA",
+            event_location="Medellín",
+            event_date=timezone.now() + timedelta(days=3),
+            paid=False,
+            has_limit=False,
+        )
+        EventRegisteredUser.objects.create(event=event, user=organizer, registration_status="2")
+
+        expected, actual = self._render_both(EventRegisteredUserSerializer, EventRegisteredUser.objects.all(), rf)
+        assert actual == expected
@@ -0,0 +1,135 @@
+import math
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.events import trending
+from apps.events.models import Event, EventCategory, EventRegisteredUser, EventReview
+
+
+@pytest.fixture
+def events(django_user_model):
+    organizer = django_user_model.objects.create_user(email="organizer@test.com", password="123456", username="organizer")
+    category = EventCategory.objects.create(name="Conferencia")
+    return [
+        Event.objects.create(
+            event_name=f"Evento {i}",
+            event_category=category,
+            event_organizer=organizer,
+            event_description="Descripción",
+            event_location="Medellín",
+            event_date=timezone.now() + timedelta(days=30),
+            paid=False,
+            has_limit=False,
+        )
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def users(django_user_model):
+    return [
+        django_user_model.objects.create_user(email=f"user{i}@test.com", password="123456", username=f"user{i}")
+        for i in range(4)
+    ]
+
+
+def score(event):
+    return Event.objects.values_list("trending_score", flat=True).get(pk=event.pk)
+
+
+class TestScore:
+
+    def test_log1p_exp(self):
+        assert trending.log1p_exp(0) == pytest.approx(math.log(2))
+        assert trending.log1p_exp(-50) == pytest.approx(math.exp(-50))
+        assert trending.log1p_exp(5000) == pytest.approx(5000)
+
+    @pytest.mark.django_db
+    def test_recent_activity_outweighs_old(self, events, settings):
+        settings.EVENT_TRENDING_HALF_LIFE_HOURS = 24
+        now = timezone.now()
+        # Tres actividades de hace dos días valen menos que una de hoy más una.
+        for _ in range(3):
+            trending.record_activity(Event, events[0].pk, 1.0, now - timedelta(days=2))
+        trending.record_activity(Event, events[1].pk, 1.0, now)
+        trending.record_activity(Event, events[1].pk, 1.0, now)
+
+        assert score(events[1]) > score(events[0]) > score(events[2]) == 0
+        # Dos días son dos vidas medias: 3/4 frente a 2.
+        offset = trending.decay_rate() * (now - trending.TRENDING_EPOCH).total_seconds()
+        assert math.exp(score(events[1]) - offset) == pytest.approx(2, rel=1e-6)
+        assert math.exp(score(events[0]) - offset) == pytest.approx(0.75, rel=1e-6)
+
+
+@pytest.mark.django_db
+def test_registrations_and_reviews_update_score(events, users):
+    EventRegisteredUser.objects.create(event=events[1], user=users[0])
+    assert score(events[1]) > 0
+    before = score(events[1])
+
+    EventReview.objects.create(event=events[1], user=users[0], rating=5, review_text="Bien")
+    assert score(events[1]) > before
+
+    # Cancelar o cambiar el texto no es actividad nueva.
+    registration = EventRegisteredUser.objects.get(event=events[1], user=users[0])
+    registration.registration_status = "4"
+    registration.save()
+    review = EventReview.objects.get(event=events[1])
+    review.review_text = "Muy bien"
+    review.save()
+    expected = trending.log_weight(trending.REGISTRATION_WEIGHT + trending.REVIEW_WEIGHT, timezone.now())
+    assert score(events[1]) == pytest.approx(trending.log1p_exp(expected), rel=1e-6)
+
+
+@pytest.mark.django_db
+def test_compact_trending(events, users):
+    for user in users[:2]:
+        EventRegisteredUser.objects.create(event=events[0], user=user)
+    EventRegisteredUser.objects.create(event=events[1], user=users[0])
+    incremental = score(events[0])
+    # Actividad que ya no cuenta: el evento 2 tuvo una inscripción borrada.
+    EventRegisteredUser.objects.create(event=events[2], user=users[3]).force_delete()
+    assert score(events[2]) > 0
+
+    call_command("compact_trending", stdout=StringIO())
+
+    assert score(events[0]) == pytest.approx(incremental, rel=1e-6)
+    assert score(events[2]) == 0
+
+    # Fuera de la ventana la actividad deja de contar.
+    later = timezone.now() + timedelta(hours=24 * (trending.WINDOW_HALF_LIVES + 1))
+    with patch("apps.events.trending.timezone.now", return_value=later):
+        trending.compact_scores(Event, EventRegisteredUser, EventReview)
+    assert score(events[0]) == score(events[1]) == 0
+
+
+@pytest.mark.django_db
+def test_score_is_rounded(events, users):
+    # El cursor de ?ordering=trending compara el puntaje tal como está guardado.
+    EventRegisteredUser.objects.create(event=events[0], user=users[0])
+    EventReview.objects.create(event=events[0], user=users[0], rating=4, review_text="Bien")
+    assert score(events[0]) == round(score(events[0]), trending.TRENDING_DECIMALS)
+
+    trending.compact_scores(Event, EventRegisteredUser, EventReview)
+    assert score(events[0]) == round(score(events[0]), trending.TRENDING_DECIMALS)
+
+
+@pytest.mark.django_db
+def test_ordering_by_trending(events, users):
+    for user in users:
+        EventRegisteredUser.objects.create(event=events[2], user=user)
+    EventRegisteredUser.objects.create(event=events[0], user=users[0])
+
+    response = APIClient().get(reverse("events:event-list"), {"ordering": "-trending", "page_size": 2})
+
+    assert [event["id"] for event in response.data["results"]] == [events[2].id, events[0].id]
+    assert "trending_score" not in response.data["results"][0]
+    response = APIClient().get(response.data["next"])
+    assert [event["id"] for event in response.data["results"]] == [events[1].id]
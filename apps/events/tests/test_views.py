@@ -1,8 +1,32 @@
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
-from apps.events.models import EventCategory, Event, EventRegisteredUser, EventReview, Interests
+from PIL import Image
+from apps.base.testing import assert_list_queries_constant
+from apps.base.uploads import HashedUploadedFile
+from apps.events.models import (
+    AdmissionTicket, EventCategory, Event, EventRegisteredUser, EventReview, EventSimilarity, Interests
+)
+from apps.events.pagination import EventPagination
 
 User = get_user_model()
 
@@ -46,6 +70,48 @@ class EventCategoryViewSetTests(APITestCase):
         response = self.client.post(url, data)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+    def test_list_categories_from_catalog(self):
+        EventCategory.objects.create(name="Taller")
+        trashed = EventCategory.objects.create(name="Feria")
+        trashed.delete()
+        url = reverse("events:eventcategory-list")
+
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {"page_size": 1})
+        self.assertEqual([item["name"] for item in response.data["results"]], ["Taller"])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual([item["name"] for item in response.data["results"]], ["Conferencia"])
+        self.assertIsNone(response.data["next"])
+
+    def test_catalog_rechecks_database(self):
+        url = reverse("events:eventcategory-list")
+        self.client.get(url)
+        # Un cambio hecho en otro worker: no pasa por las señales de este proceso.
+        EventCategory.objects.filter(pk=self.category.pk).update(name="Congreso", updated_at=timezone.now())
+        self.assertEqual(self.client.get(url).data["results"][0]["name"], "Conferencia")
+        with patch("apps.events.catalog.time.monotonic", return_value=time.monotonic() + 60):
+            self.assertEqual(self.client.get(url).data["results"][0]["name"], "Congreso")
+
+    def test_category_change_reaches_nested_events(self):
+        Event.objects.create(
+            event_name="Tech Talk",
+            event_category=self.category,
+            event_organizer=self.organizer,
+            event_description="Charla sobre IA",
+            event_location="Medellín",
+            event_date=timezone.now() + timedelta(days=1),
+            paid=False,
+            has_limit=False,
+        )
+        url = reverse("events:event-list")
+        self.assertEqual(self.client.get(url).data["results"][0]["event_category"]["name"], "Conferencia")
+
+        self.category.name = "Congreso"
+        self.category.save()
+        self.assertEqual(self.client.get(url).data["results"][0]["event_category"]["name"], "Congreso")
+
 
 class EventViewSetTests(APITestCase):
     def setUp(self):
@@ -92,6 +158,398 @@ class EventViewSetTests(APITestCase):
         response = self.client.post(url, data)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+    def _create_events(self, total):
+        # Varios eventos comparten fecha para ejercitar el desempate por id.
+        base_date = timezone.now() + timedelta(days=1)
+        return [
+            Event.objects.create(
+                event_name=f"Evento {i}",
+                event_category=self.category,
+                event_organizer=self.organizer,
+                event_description="Descripción",
+                event_location="Medellín",
+                event_date=base_date + timedelta(days=i // 2),
+                paid=False,
+                has_limit=False,
+            )
+            for i in range(total)
+        ]
+
+    def test_list_events_cursor_pagination(self):
+        events = self._create_events(7)
+        url = reverse("events:event-list")
+
+        seen = []
+        response = self.client.get(url, {"page_size": 3})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 3)
+            seen.extend(item["id"] for item in response.data["results"])
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        expected = [event.id for event in sorted(events, key=lambda e: (e.event_date, e.id))]
+        self.assertEqual(seen, expected)
+
+        # Desde la última página se puede volver atrás con el cursor previo.
+        previous = self.client.get(response.data["previous"])
+        self.assertEqual([item["id"] for item in previous.data["results"]], expected[3:6])
+
+    def test_list_events_max_page_size(self):
+        self._create_events(3)
+        url = reverse("events:event-list")
+        with patch.object(EventPagination, "max_page_size", 2):
+            response = self.client.get(url, {"page_size": 50})
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_list_events_by_rating(self):
+        events = self._create_events(3)
+        for event, rating in zip(events, (3, 5, 1)):
+            EventReview.objects.create(user=self.customer, event=event, rating=rating, review_text="Reseña")
+        url = reverse("events:event-list")
+
+        response = self.client.get(url, {"ordering": "-rating", "page_size": 2})
+        self.assertEqual([item["id"] for item in response.data["results"]], [events[1].id, events[0].id])
+        response = self.client.get(response.data["next"])
+        self.assertEqual([item["id"] for item in response.data["results"]], [events[2].id])
+
+        response = self.client.get(url, {"min_rating": 3})
+        self.assertEqual({item["id"] for item in response.data["results"]}, {events[0].id, events[1].id})
+
+        response = self.client.get(url, {"min_rating": "alto"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_events(self):
+        by_name, by_description, other = self._create_events(3)
+        by_name.event_name = "Taller de Python"
+        by_name.save()
+        by_description.event_description = "Charla con ejemplos en python"
+        by_description.save()
+        url = reverse("events:event-list")
+
+        response = self.client.get(url, {"search": "Python"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Las coincidencias en el nombre pesan más que en la descripción.
+        self.assertEqual([item["id"] for item in response.data["results"]], [by_name.id, by_description.id])
+        self.assertNotIn("search_vector", response.data["results"][0])
+
+        response = self.client.get(url, {"search": "Conferencia"})
+        self.assertEqual(len(response.data["results"]), 3)
+
+        # El cursor reproduce el rango de la última fila de la página.
+        response = self.client.get(url, {"search": "Python", "page_size": 1})
+        response = self.client.get(response.data["next"])
+        self.assertEqual([item["id"] for item in response.data["results"]], [by_description.id])
+
+        # Un término vacío no filtra y usa el orden por defecto.
+        response = self.client.get(url, {"search": " "})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_list_events_near_location(self):
+        medellin, envigado, bogota = self._create_events(3)
+        for event, (latitude, longitude) in zip(
+            (medellin, envigado, bogota), ((6.2442, -75.5812), (6.1759, -75.5917), (4.7110, -74.0721))
+        ):
+            event.latitude, event.longitude = latitude, longitude
+            event.save()
+        url = reverse("events:event-list")
+
+        response = self.client.get(url, {"lat": 6.25, "lng": -75.58, "radius": 15})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Ordenados por distancia al punto.
+        self.assertEqual([item["id"] for item in response.data["results"]], [medellin.id, envigado.id])
+
+        response = self.client.get(url, {"lat": 6.25, "lng": -75.58, "radius": 2})
+        self.assertEqual([item["id"] for item in response.data["results"]], [medellin.id])
+
+        response = self.client.get(url, {"bbox": "-75.0,4.0,-73.0,5.0"})
+        self.assertEqual([item["id"] for item in response.data["results"]], [bogota.id])
+
+        response = self.client.get(url, {"lat": 6.25})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_events_invalid_cursor(self):
+        url = reverse("events:event-list")
+        response = self.client.get(url, {"cursor": "no-es-un-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_is_bound_to_its_ordering(self):
+        self._create_events(3)
+        url = reverse("events:event-list")
+        next_url = self.client.get(url, {"ordering": "rating", "page_size": 1}).data["next"]
+        [cursor] = parse_qs(urlparse(next_url).query)["cursor"]
+
+        response = self.client.get(url, {"ordering": "trending", "page_size": 1, "cursor": cursor})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(url, {"ordering": "rating", "page_size": 1, "cursor": cursor})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_conditional_get(self):
+        self._create_events(3)
+        url = reverse("events:event-list")
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        # Sin Last-Modified: If-Modified-Since no sirve para detectar borrados.
+        self.assertNotIn("Last-Modified", response)
+
+        # Otra página u otro filtro es otra representación.
+        self.assertEqual(self.client.get(url, {"page_size": 1}, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+        # Los validadores salen de las filas de la página, no de un agregado sobre todo el listado.
+        response = self.client.get(url, {"page_size": 1})
+        page_etag, [shown] = response["ETag"], [item["id"] for item in response.data["results"]]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"page_size": 1}, HTTP_IF_NONE_MATCH=page_etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse([query for query in queries if "COUNT(" in query["sql"] or "MAX(" in query["sql"]])
+
+        # Borrar un evento de otra página no cambia esta; borrarlo de la página sí,
+        # aunque no cambie el máximo de updated_at.
+        Event.objects.exclude(pk=shown).order_by("-id").first().delete()
+        self.assertEqual(
+            self.client.get(url, {"page_size": 1}, HTTP_IF_NONE_MATCH=page_etag).status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        Event.objects.get(pk=shown).delete()
+        self.assertEqual(
+            self.client.get(url, {"page_size": 1}, HTTP_IF_NONE_MATCH=page_etag).status_code, status.HTTP_200_OK
+        )
+
+    def test_retrieve_conditional_get(self):
+        event = self._create_events(1)[0]
+        url = reverse("events:event-detail", args=[event.id])
+
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Una reseña cambia los agregados del evento con un UPDATE directo.
+        EventReview.objects.create(event=event, user=self.customer, rating=5, review_text="Muy bueno")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+        missing = reverse("events:event-detail", args=[event.id + 100])
+        self.assertEqual(self.client.get(missing).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(reverse("events:event-detail", args=["abc"])).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_sparse_fieldsets(self):
+        self._create_events(2)
+        url = reverse("events:event-list")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"fields": "event_name,event_date,event_location,event_picture"})
+        self.assertEqual(
+            set(response.data["results"][0]), {"event_name", "event_date", "event_location", "event_picture"}
+        )
+        [select] = [query["sql"] for query in queries if "event_name" in query["sql"]]
+        self.assertNotIn("users_user", select)
+        self.assertNotIn("event_description", select)
+
+        response = self.client.get(url, {"fields": "event_name", "expand": "event_organizer"})
+        self.assertEqual(
+            response.data["results"][0]["event_organizer"],
+            {"id": self.organizer.id, "email": "organizer@example.com", "name": "", "last_name": ""},
+        )
+
+        self.assertEqual(self.client.get(url, {"fields": "no_existe"}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {"expand": "event_category"}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_similar_events(self):
+        event, first, second = self._create_events(3)
+        EventSimilarity.objects.bulk_create([
+            EventSimilarity(event=event, similar_event=second, rank=1, score=0.9, common_attendees=9),
+            EventSimilarity(event=event, similar_event=first, rank=2, score=0.5, common_attendees=5),
+        ])
+        url = reverse("events:event-similar", args=[event.id])
+
+        response = self.client.get(url, {"fields": "id,event_name"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data], [second.id, first.id])
+        self.assertEqual(set(response.data[0]), {"id", "event_name"})
+
+        self.assertEqual(self.client.get(reverse("events:event-similar", args=[first.id])).data, [])
+        self.assertEqual(self.client.get(reverse("events:event-similar", args=[0])).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            self.client.get(reverse("events:event-similar", args=["abc"])).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+    @override_settings(EVENT_ORGANIZER_STATS_CACHE_TIMEOUT=0)
+    def test_organizer_stats(self):
+        first, second = self._create_events(2)
+        first.has_limit, first.limit = True, 10
+        first.save()
+        for i, registration_status in enumerate(["1", "2", "2", "4"]):
+            user = User.objects.create_user(
+                email=f"user{i}@example.com", username=f"user{i}", password="password123", user_type="1"
+            )
+            EventRegisteredUser.objects.create(event=first, user=user, registration_status=registration_status)
+        EventReview.objects.create(event=first, user=self.customer, rating=4, review_text="Bueno")
+        other = User.objects.create_user(
+            email="other@example.com", username="other", password="password123", user_type="3"
+        )
+        Event.objects.filter(pk=second.pk).update(event_organizer=other)
+
+        url = reverse("events:event-organizer-stats")
+        self.client.force_authenticate(user=self.organizer)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [row] = response.data["results"]
+        self.assertEqual(row["id"], first.id)
+        self.assertEqual(row["registrations"], {"1": 1, "2": 2, "3": 0, "4": 1})
+        self.assertEqual((row["registered_count"], row["remaining_capacity"]), (3, 7))
+        self.assertEqual((row["review_count"], row["rating_avg"]), (1, 4.0))
+
+        # Los parámetros del listado no cambian el orden de las estadísticas.
+        for params in ({"search": "Evento"}, {"lat": 1, "lng": 2}, {"ordering": "-trending"}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual([item["id"] for item in response.data["results"]], [first.id])
+
+        self.client.force_authenticate(user=self.customer)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_organizer_stats_cached(self):
+        self._create_events(1)
+        url = reverse("events:event-organizer-stats")
+        self.client.force_authenticate(user=self.organizer)
+        with override_settings(EVENT_ORGANIZER_STATS_CACHE_TIMEOUT=30):
+            cache.clear()
+            self.client.get(url)
+            with self.assertNumQueries(0):
+                self.assertEqual(len(self.client.get(url).data["results"]), 1)
+
+
+class EventRegisteredUserViewSetTests(APITestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            email="organizer@example.com", username="organizer", password="password123", user_type="3"
+        )
+        self.customer = User.objects.create_user(
+            email="customer@example.com", username="customer", password="password123", user_type="1"
+        )
+        self.other = User.objects.create_user(
+            email="other@example.com", username="other", password="password123", user_type="1"
+        )
+        self.event = Event.objects.create(
+            event_name="Evento con cupo",
+            event_category=EventCategory.objects.create(name="Conferencia"),
+            event_organizer=self.organizer,
+            event_description="Descripción",
+            event_location="Medellín",
+            event_date=timezone.now() + timedelta(days=1),
+            paid=False,
+            has_limit=True,
+            limit=2,
+        )
+        self.url = reverse("events:eventregistereduser-list")
+
+    def test_register_until_full(self):
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.post(self.url, {"event": self.event.id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.post(self.url, {"event": self.event.id})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.other)
+        response = self.client.post(self.url, {"event": self.event.id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        late = User.objects.create_user(email="late@example.com", username="late", password="password123")
+        self.client.force_authenticate(user=late)
+        response = self.client.post(self.url, {"event": self.event.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered_count, 2)
+
+    def test_bulk_status(self):
+        first = EventRegisteredUser.objects.create(event=self.event, user=self.customer)
+        second = EventRegisteredUser.objects.create(event=self.event, user=self.other)
+        url = reverse("events:eventregistereduser-bulk-status")
+
+        # Otro organizador no puede tocar inscripciones de este evento.
+        intruder = User.objects.create_user(
+            email="intruder@example.com", username="intruder", password="password123", user_type="3"
+        )
+        self.client.force_authenticate(user=intruder)
+        response = self.client.post(url, {"registration_status": "3", "ids": [first.id, second.id]}, format="json")
+        self.assertEqual(response.data["updated"], 0)
+
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.post(url, {"registration_status": "2", "ids": [first.id, second.id]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"updated": 2, "registrations": {"1": 0, "2": 2, "3": 0, "4": 0}})
+
+        response = self.client.post(
+            url, {"registration_status": "3", "event": self.event.id, "current_status": "2"}, format="json"
+        )
+        self.assertEqual(response.data["registrations"], {"1": 0, "2": 0, "3": 2, "4": 0})
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered_count, 0)
+
+        # Volver a ocupar más cupos que el límite no aplica nada.
+        late = User.objects.create_user(email="late@example.com", username="late", password="password123")
+        EventRegisteredUser.objects.create(event=self.event, user=late)
+        response = self.client.post(url, {"registration_status": "1", "event": self.event.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(EventRegisteredUser.objects.filter(registration_status="3").count(), 2)
+
+        response = self.client.post(url, {"registration_status": "1"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expand_registration_relations(self):
+        EventRegisteredUser.objects.create(event=self.event, user=self.customer)
+        self.client.force_authenticate(user=self.customer)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {"fields": "id,registration_status", "expand": "event"})
+        [row] = response.data["results"]
+        self.assertEqual(set(row), {"id", "registration_status", "event"})
+        self.assertEqual(row["event"]["event_name"], "Evento con cupo")
+
+    def test_export_attendees(self):
+        EventRegisteredUser.objects.create(event=self.event, user=self.customer)
+        EventRegisteredUser.objects.create(event=self.event, user=self.other, registration_status="2")
+        url = reverse("events:event-export-attendees", args=[self.event.id])
+
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.get(url)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,email,nombres,apellidos,estado,registrado")
+        self.assertEqual([line.split(",")[1] for line in lines[1:]], ["customer@example.com", "other@example.com"])
+
+        response = self.client.get(url, {"output": "ndjson"}, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        rows = [json.loads(line) for line in gzip.decompress(b"".join(response.streaming_content)).splitlines()]
+        self.assertEqual([row["estado"] for row in rows], ["1", "2"])
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip;q=0, identity")
+        self.assertNotIn("Content-Encoding", response)
+
+        self.assertEqual(self.client.get(url, {"output": "xml"}).status_code, status.HTTP_400_BAD_REQUEST)
+        missing = reverse("events:event-export-attendees", args=["abc"])
+        self.assertEqual(self.client.get(missing).status_code, status.HTTP_404_NOT_FOUND)
+
+        intruder = User.objects.create_user(
+            email="intruder@example.com", username="intruder", password="password123", user_type="3"
+        )
+        self.client.force_authenticate(user=intruder)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_reviews(self):
+        EventReview.objects.create(event=self.event, user=self.customer, rating=5, review_text="Excelente, volvería")
+        url = reverse("events:event-export-reviews", args=[self.event.id])
+
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.get(url, HTTP_ACCEPT="application/x-ndjson")
+        [row] = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual((row["email"], row["calificacion"], row["resena"]), ("customer@example.com", 5, "Excelente, volvería"))
+
 
 class InterestsViewSetTests(APITestCase):
     def setUp(self):
@@ -106,4 +564,411 @@ class InterestsViewSetTests(APITestCase):
         url = reverse("events:interests-list")
         data = {"event_categories": [self.category1.id, self.category2.id]}
         response = self.client.post(url, data)
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class ListQueryCountTests(APITestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            email="organizer@example.com", username="organizer", password="password123", user_type="3"
+        )
+        self.category = EventCategory.objects.create(name="Conferencia")
+        self.event = self._create_event(0)
+
+    def _create_event(self, i):
+        return Event.objects.create(
+            event_name=f"Evento {i}",
+            event_category=EventCategory.objects.get_or_create(name=f"Categoría {i}")[0],
+            event_organizer=self.organizer,
+            event_description="Descripción",
+            event_location="Medellín",
+            event_date=timezone.now() + timedelta(days=i + 1),
+            paid=False,
+            has_limit=False,
+        )
+
+    def _create_user(self, i):
+        return User.objects.create_user(email=f"user{i}@example.com", username=f"user{i}", password="password123")
+
+    def test_events_list(self):
+        assert_list_queries_constant(self, reverse("events:event-list"), lambda i: self._create_event(i + 1))
+
+    def test_registered_users_list(self):
+        assert_list_queries_constant(
+            self,
+            reverse("events:eventregistereduser-list"),
+            lambda i: EventRegisteredUser.objects.create(event=self._create_event(i + 1), user=self._create_user(i)),
+        )
+
+    def test_reviews_list(self):
+        assert_list_queries_constant(
+            self,
+            reverse("events:eventreview-list"),
+            lambda i: EventReview.objects.create(
+                event=self._create_event(i + 1), user=self._create_user(i), rating=5, review_text="Bueno"
+            ),
+        )
+
+    def test_interests_list(self):
+        customer = User.objects.create_user(
+            email="customer@example.com", username="customer", password="password123", user_type="1"
+        )
+        self.client.force_authenticate(user=customer)
+
+        def create_interests(i):
+            interests = Interests.objects.create(user=self._create_user(i))
+            interests.event_categories.set([self.category])
+
+        assert_list_queries_constant(self, reverse("events:interests-list"), create_interests)
+
+
+
+class EventFeedTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(
+            email="organizer@example.com", username="organizer", password="password123", user_type="3"
+        )
+        self.customer = User.objects.create_user(
+            email="customer@example.com", username="customer", password="password123", user_type="1"
+        )
+        self.music = EventCategory.objects.create(name="Música")
+        self.sports = EventCategory.objects.create(name="Deportes")
+        self.interests = Interests.objects.create(user=self.customer)
+        self.interests.event_categories.set([self.music])
+        self.url = reverse("events:event-list-by-interests")
+        self.client.force_authenticate(user=self.customer)
+
+    def _create_event(self, category, days=1):
+        event = Event.objects.create(
+            event_name=f"{category.name} {days}",
+            event_category=category,
+            event_organizer=self.organizer,
+            event_description="Descripción",
+            event_location="Medellín",
+            event_date=timezone.now() + timedelta(days=1),
+            paid=False,
+            has_limit=False,
+        )
+        # La fecha se ajusta sin pasar por clean() para poder crear eventos pasados.
+        Event.objects.filter(pk=event.pk).update(event_date=timezone.now() + timedelta(days=days))
+        return event
+
+    def test_feed_only_upcoming_events_of_interest(self):
+        upcoming = self._create_event(self.music, days=2)
+        self._create_event(self.music, days=-2)
+        self._create_event(self.sports, days=2)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data["results"]], [upcoming.id])
+
+    def test_feed_is_paginated(self):
+        events = [self._create_event(self.music, days=i + 1) for i in range(3)]
+        response = self.client.get(self.url, {"page_size": 2})
+        self.assertEqual([item["id"] for item in response.data["results"]], [e.id for e in events[:2]])
+        response = self.client.get(response.data["next"])
+        self.assertEqual([item["id"] for item in response.data["results"]], [events[2].id])
+
+    def test_feed_without_interests_is_empty(self):
+        self.interests.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [])
+
+    @override_settings(EVENT_FEED_CACHE_TIMEOUT=60)
+    def test_feed_cache_invalidation(self):
+        first = self._create_event(self.music, days=1)
+        self.assertEqual(len(self.client.get(self.url).data["results"]), 1)
+
+        # Un evento nuevo de una categoría de interés invalida la página cacheada.
+        second = self._create_event(self.music, days=2)
+        ids = [item["id"] for item in self.client.get(self.url).data["results"]]
+        self.assertEqual(ids, [first.id, second.id])
+
+        # Cambiar los intereses también.
+        sports_event = self._create_event(self.sports, days=3)
+        self.interests.event_categories.set([self.sports])
+        ids = [item["id"] for item in self.client.get(self.url).data["results"]]
+        self.assertEqual(ids, [sports_event.id])
+
+    @override_settings(EVENT_FEED_CACHE_TIMEOUT=60)
+    def test_feed_cache_invalidation_on_category_change(self):
+        event = self._create_event(self.music, days=1)
+        self.assertEqual(len(self.client.get(self.url).data["results"]), 1)
+
+        # Pasar el evento a otra categoría invalida también el feed de la anterior.
+        event = Event.objects.get(pk=event.pk)
+        event.event_category = self.sports
+        event.save()
+        self.assertEqual(self.client.get(self.url).data["results"], [])
+
+
+class EventPictureUploadTests(APITestCase):
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        self.temp_dir = os.path.join(root, "tmp")
+        settings_override = override_settings(
+            MEDIA_ROOT=os.path.join(root, "media"), UPLOAD_TEMP_DIR=self.temp_dir, IMAGE_VARIANT_WORKERS=0
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.organizer = User.objects.create_user(
+            email="organizer@example.com", username="organizer", password="password123", user_type="3"
+        )
+        self.client.force_authenticate(user=self.organizer)
+        self.url = reverse("events:event-list")
+        self.data = {
+            "event_name": "Tech Talk",
+            "event_category": EventCategory.objects.create(name="Conferencia").id,
+            "event_description": "Charla sobre IA",
+            "event_location": "Medellín",
+            "event_date": "2030-01-01T10:00:00Z",
+            "paid": False,
+            "has_limit": False,
+        }
+
+    def _picture(self, content, name="foto.png"):
+        return SimpleUploadedFile(name, content, content_type="image/png")
+
+    def _png(self, size=(64, 64)):
+        buffer = io.BytesIO()
+        Image.new("RGB", size, (10, 120, 200)).save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def test_upload_streams_to_temp_dir(self):
+        content = self._png()
+        with patch("apps.base.uploads.HashedUploadedFile", wraps=HashedUploadedFile) as uploaded_file:
+            response = self.client.post(self.url, {**self.data, "event_picture": self._picture(content)})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(uploaded_file.call_count, 1)
+        event = Event.objects.get(pk=response.data["id"])
+        self.assertEqual(event.event_picture.read(), content)
+        # El temporal se movió al destino final.
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_non_image_rejected(self):
+        response = self.client.post(self.url, {**self.data, "event_picture": self._picture(b"<?php echo 1; ?>" * 10)})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("event_picture", response.data)
+        self.assertFalse(Event.objects.exists())
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_oversize_upload_rejected_while_streaming(self):
+        content = self._png(size=(600, 600)) + os.urandom(200 * 1024)
+        with override_settings(IMAGE_UPLOAD_MAX_SIZE=150 * 1024):
+            response = self.client.post(self.url, {**self.data, "event_picture": self._picture(content)})
+
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertFalse(Event.objects.exists())
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_oversize_content_length_rejected_before_reading(self):
+        picture = self._picture(self._png() + bytes(200 * 1024))
+        with override_settings(IMAGE_UPLOAD_MAX_SIZE=1024), patch("apps.base.uploads.HashedUploadedFile") as uploaded_file:
+            response = self.client.post(self.url, {**self.data, "event_picture": picture})
+
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        uploaded_file.assert_not_called()
+
+
+class AdmissionQueueTests(APITestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            email="organizer@example.com", username="organizer", password="password123", user_type="3"
+        )
+        self.customers = [
+            User.objects.create_user(email=f"customer{i}@example.com", username=f"customer{i}", password="password123")
+            for i in range(4)
+        ]
+        self.event = Event.objects.create(
+            event_name="Apertura",
+            event_category=EventCategory.objects.create(name="Conferencia"),
+            event_organizer=self.organizer,
+            event_description="Descripción",
+            event_location="Medellín",
+            event_date=timezone.now() + timedelta(days=1),
+            paid=False,
+            has_limit=True,
+            limit=2,
+            queued_admission=True,
+        )
+        self.url = reverse("events:eventregistereduser-list")
+
+    def _request_seat(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.post(self.url, {"event": self.event.id})
+
+    def _ticket(self, user):
+        return AdmissionTicket.objects.get(event=self.event, user=user)
+
+    def test_request_is_answered_with_ticket(self):
+        response = self._request_seat(self.customers[0])
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "1")
+        self.assertFalse(EventRegisteredUser.objects.exists())
+
+        # Repetir la solicitud devuelve el mismo ticket.
+        self.assertEqual(self._request_seat(self.customers[0]).data["id"], response.data["id"])
+        self.assertEqual(AdmissionTicket.objects.count(), 1)
+
+    def test_worker_admits_in_arrival_order_and_waitlists_overflow(self):
+        for customer in self.customers:
+            self._request_seat(customer)
+
+        call_command("process_admissions", "--once", "--batch-size", "3", stdout=io.StringIO())
+
+        self.assertEqual([self._ticket(customer).status for customer in self.customers], ["2", "2", "3", "3"])
+        registrations = EventRegisteredUser.objects.filter(event=self.event)
+        self.assertEqual(
+            set(registrations.values_list("user", flat=True)), {self.customers[0].pk, self.customers[1].pk}
+        )
+        self.assertEqual(self._ticket(self.customers[0]).registration.user, self.customers[0])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered_count, 2)
+
+    def test_cancellation_promotes_waitlist(self):
+        for customer in self.customers:
+            self._request_seat(customer)
+        call_command("process_admissions", "--once", stdout=io.StringIO())
+        latecomer = User.objects.create_user(email="late@example.com", username="late", password="password123")
+        self._request_seat(latecomer)
+
+        registration = self._ticket(self.customers[0]).registration
+        with self.captureOnCommitCallbacks(execute=True):
+            registration.registration_status = "4"
+            registration.save()
+
+        # Solo el cupo liberado, y solo desde la lista de espera: la cola es del worker.
+        self.assertEqual(self._ticket(self.customers[2]).status, "2")
+        self.assertEqual(self._ticket(self.customers[3]).status, "3")
+        self.assertEqual(self._ticket(latecomer).status, "1")
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered_count, 2)
+
+    def test_bulk_cancellation_promotes_one_ticket_per_freed_seat(self):
+        for customer in self.customers:
+            self._request_seat(customer)
+        call_command("process_admissions", "--once", stdout=io.StringIO())
+        Event.objects.filter(pk=self.event.pk).update(limit=3)
+
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.post(
+            reverse("events:eventregistereduser-bulk-status"),
+            {"registration_status": "4", "ids": [self._ticket(self.customers[0]).registration_id]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Se liberó un cupo aunque el evento tenga dos libres.
+        self.assertEqual(self._ticket(self.customers[2]).status, "2")
+        self.assertEqual(self._ticket(self.customers[3]).status, "3")
+
+    def test_already_registered_user_is_rejected(self):
+        EventRegisteredUser.objects.create(event=self.event, user=self.customers[0])
+        self._request_seat(self.customers[0])
+
+        call_command("process_admissions", "--once", stdout=io.StringIO())
+
+        self.assertEqual(self._ticket(self.customers[0]).status, "4")
+        self.assertEqual(EventRegisteredUser.objects.filter(event=self.event).count(), 1)
+
+    def test_user_only_sees_own_tickets(self):
+        self._request_seat(self.customers[0])
+        self._request_seat(self.customers[1])
+
+        response = self.client.get(reverse("events:admissionticket-list"))
+
+        self.assertEqual([ticket["id"] for ticket in response.data["results"]], [self._ticket(self.customers[1]).id])
+
+    def test_events_without_queue_register_directly(self):
+        Event.objects.filter(pk=self.event.pk).update(queued_admission=False)
+
+        response = self._request_seat(self.customers[0])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(AdmissionTicket.objects.exists())
+
+
+@override_settings(EVENT_CALENDAR_CACHE_TIMEOUT=0)
+class EventCalendarTests(APITestCase):
+    def setUp(self):
+        organizer = User.objects.create_user(
+            email="organizer@example.com", username="organizer", password="password123", user_type="3"
+        )
+        category = EventCategory.objects.create(name="Conferencia")
+        # Horas en UTC; Bogotá es UTC-5.
+        for name, moment in (
+            ("Primero", "2030-10-01T15:00:00Z"),
+            ("Noche del 1", "2030-10-02T03:00:00Z"),
+            ("Segundo", "2030-10-02T15:00:00Z"),
+            ("Fin de mes", "2030-10-31T20:00:00Z"),
+            ("Noviembre", "2030-11-01T06:00:00Z"),
+        ):
+            Event.objects.create(
+                event_name=name,
+                event_category=category,
+                event_organizer=organizer,
+                event_description="Descripción",
+                event_location="Medellín",
+                event_date=moment,
+                paid=False,
+                has_limit=False,
+            )
+        self.list_url = reverse("events:event-list")
+        self.url = reverse("events:event-calendar")
+
+    def test_list_filters_by_local_dates(self):
+        response = self.client.get(self.list_url, {"from": "2030-10-02", "to": "2030-10-31"})
+
+        self.assertEqual(
+            [event["event_name"] for event in response.data["results"]], ["Segundo", "Fin de mes"]
+        )
+
+    def test_list_accepts_datetimes(self):
+        response = self.client.get(self.list_url, {"from": "2030-10-01T21:00:00-05:00"})
+
+        self.assertEqual(len(response.data["results"]), 4)
+
+    def test_invalid_range(self):
+        self.assertEqual(self.client.get(self.list_url, {"from": "ayer"}).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.list_url, {"from": "2030-10-05", "to": "2030-10-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_counts_per_day_in_bogota(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {"from": "2030-10-01", "to": "2030-10-31"})
+
+        self.assertEqual(response.data["time_zone"], "America/Bogota")
+        self.assertEqual(
+            response.data["results"],
+            [{"date": "2030-10-01", "count": 2}, {"date": "2030-10-02", "count": 1}, {"date": "2030-10-31", "count": 1}],
+        )
+
+    def test_counts_per_week_and_month(self):
+        params = {"from": "2030-09-01", "to": "2030-11-30"}
+        weeks = self.client.get(self.url, {**params, "period": "week"}).data["results"]
+        months = self.client.get(self.url, {**params, "period": "month"}).data["results"]
+
+        self.assertEqual(weeks, [{"date": "2030-09-30", "count": 3}, {"date": "2030-10-28", "count": 2}])
+        self.assertEqual(months, [{"date": "2030-10-01", "count": 4}, {"date": "2030-11-01", "count": 1}])
+
+    def test_calendar_requires_bounded_range(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {"from": "2030-01-01", "to": "2032-01-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {"from": "2030-10-01", "to": "2030-10-31", "period": "year"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_calendar_is_cached(self):
+        params = {"from": "2030-10-01", "to": "2030-10-31"}
+        with override_settings(EVENT_CALENDAR_CACHE_TIMEOUT=60):
+            cache.clear()
+            self.client.get(self.url, params)
+            with self.assertNumQueries(0):
+                self.assertEqual(len(self.client.get(self.url, params).data["results"]), 3)
@@ -0,0 +1,139 @@
+"""
+Puntaje de tendencia de los eventos con decaimiento exponencial.
+
+Cada actividad de peso ``w`` (una inscripción, una reseña) en el instante
+``t`` vale ``w · 2^(-(ahora - t) / vida_media)``. Guardar esa suma tal cual
+obligaría a reescribir todas las filas a medida que pasa el tiempo, así que
+``Event.trending_score`` guarda
+
+    ln(1 + Σ w · e^(λ · (t - TRENDING_EPOCH)))      con λ = ln 2 / vida media
+
+El factor ``e^(-λ · (ahora - época))`` que falta para obtener el valor
+actual es el mismo para todos los eventos (y el 1 también), así que ordenar
+por ``trending_score`` es ordenar por tendencia actual y el índice
+``(trending_score, id)`` sirve sin tocar los eventos quietos. Sumar una
+actividad es un UPDATE en O(1) (``logaddexp`` en SQL) y el logaritmo evita el
+desbordamiento: el puntaje crece unos 0,69 por vida media.
+
+El puntaje se guarda redondeado a ``TRENDING_DECIMALS`` decimales: el cursor
+de la paginación (``?ordering=trending``) lo compara por igualdad y así el
+valor del cursor es exactamente el de la columna.
+
+El comando compact_trending recalcula el puntaje con la actividad de la
+ventana reciente y deja en 0 los eventos fríos; corrige la actividad que ya
+no existe (inscripciones canceladas o borradas) y la que no pasó por save().
+"""
+
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Abs, Exp, Greatest, Ln, Round
+from django.utils import timezone
+
+from apps.events.capacity import SEAT_STATUSES
+
+TRENDING_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+REGISTRATION_WEIGHT = 1.0
+REVIEW_WEIGHT = 0.5
+# La compactación solo lee la actividad de las últimas N vidas medias; lo
+# anterior pesa menos de 2^-N.
+WINDOW_HALF_LIVES = 20
+SCAN_CHUNK_SIZE = 5000
+TRENDING_DECIMALS = 6
+
+
+def decay_rate():
+    """λ en 1/segundos."""
+    return math.log(2) / timedelta(hours=settings.EVENT_TRENDING_HALF_LIFE_HOURS).total_seconds()
+
+
+def log_weight(weight, moment):
+    """``ln(w · e^(λ · (t - época)))``: el aporte de una actividad en escala logarítmica."""
+    return math.log(weight) + decay_rate() * (moment - TRENDING_EPOCH).total_seconds()
+
+
+def log1p_exp(value):
+    """``ln(1 + e^x)`` sin desbordar para x grandes."""
+    return value + math.log1p(math.exp(-value)) if value > 0 else math.log1p(math.exp(value))
+
+
+def score_update(weight, moment):
+    """
+    ``logaddexp(trending_score, ln w + λ·(t - época))`` como expresión para un
+    UPDATE: ``max(a, b) + ln(1 + e^-|a - b|)`` no desborda.
+    """
+    score = F("trending_score")
+    activity = Value(log_weight(weight, moment), output_field=FloatField())
+    return Round(Greatest(score, activity) + Ln(Value(1.0) + Exp(-Abs(score - activity))), TRENDING_DECIMALS)
+
+
+def record_activity(event_model, event_id, weight, moment=None):
+    """Suma una actividad al puntaje del evento con un único UPDATE."""
+    moment = moment or timezone.now()
+    event_model._base_manager.filter(pk=event_id).update(
+        trending_score=score_update(weight, moment),
+        # El orden ?ordering=trending cambia: invalida el ETag del listado.
+        updated_at=moment,
+    )
+
+
+def compute_scores(registration_model, review_model, now=None):
+    """``{event_id: trending_score}`` recalculado con la actividad de la ventana reciente."""
+    now = now or timezone.now()
+    rate = decay_rate()
+    since = now - timedelta(seconds=WINDOW_HALF_LIVES * math.log(2) / rate)
+    sources = (
+        (registration_model._base_manager.filter(registration_status__in=SEAT_STATUSES), REGISTRATION_WEIGHT),
+        (review_model._base_manager.all(), REVIEW_WEIGHT),
+    )
+
+    # Sumas relativas a ``now`` (cada término ≤ w) para no desbordar.
+    totals = {}
+    for queryset, weight in sources:
+        rows = (
+            queryset.filter(deleted_at=None, created_at__gte=since)
+            .order_by()
+            .values_list("event_id", "created_at")
+            .iterator(chunk_size=SCAN_CHUNK_SIZE)
+        )
+        for event_id, created_at in rows:
+            totals[event_id] = totals.get(event_id, 0.0) + weight * math.exp(rate * (created_at - now).total_seconds())
+
+    offset = rate * (now - TRENDING_EPOCH).total_seconds()
+    return {
+        event_id: round(log1p_exp(math.log(total) + offset), TRENDING_DECIMALS)
+        for event_id, total in totals.items()
+        if total > 0
+    }
+
+
+def compact_scores(event_model, registration_model, review_model, batch_size=1000):
+    """
+    Reescribe ``trending_score`` de todos los eventos desde ``compute_scores``,
+    en lotes de ``batch_size`` eventos con un ``bulk_update`` por lote; solo se
+    escriben los que cambian. La actividad que llegue mientras corre puede
+    perderse, pero la recupera la siguiente compactación. Devuelve cuántos
+    eventos cambiaron.
+    """
+    now = timezone.now()
+    scores = compute_scores(registration_model, review_model, now)
+    updated = 0
+    last_pk = 0
+    while True:
+        events = list(
+            event_model._base_manager.filter(pk__gt=last_pk).order_by("pk").only("pk", "trending_score")[:batch_size]
+        )
+        if not events:
+            return updated
+        last_pk = events[-1].pk
+
+        changed = []
+        for event in events:
+            score = scores.get(event.pk, 0.0)
+            if not math.isclose(event.trending_score, score, rel_tol=1e-9, abs_tol=1e-9):
+                event.trending_score, event.updated_at = score, now
+                changed.append(event)
+        event_model._base_manager.bulk_update(changed, ["trending_score", "updated_at"])
+        updated += len(changed)
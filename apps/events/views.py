@@ -1,16 +1,30 @@
-from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Q
-from django.utils import timezone
-from rest_framework import viewsets
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError
+from django.db.models import Count
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.parsers import FormParser, MultiPartParser, JSONParser
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, IsAdminUser
 from rest_framework.response import Response
 
+from apps.base.compiled import CompiledListMixin
+from apps.base.conditional import ConditionalGetMixin
+from apps.base.export import CONTENT_TYPES, EXPORT_RENDERERS, stream_export
+from apps.base.pagination import KeysetPagination
 from apps.base.permissions import IsCustomerUser, IsOrganizerUser
-from apps.events.models import Event, EventCategory, EventRegisteredUser, EventReview, Interests
+from apps.base.query_plans import QueryPlanMixin
+from apps.base.uploads import StreamingUploadMixin
+from apps.events import admission, capacity, dates, feed, geo, search, stats
+from apps.events.catalog import catalog
+from apps.events.models import AdmissionTicket, Event, EventCategory, EventRegisteredUser, EventReview, Interests
+from apps.events.pagination import EventPagination
 from apps.events.serializers import (
+    AdmissionTicketSerializer,
+    BulkRegistrationStatusSerializer,
     EventCategorySerializer,
     EventRegisteredUserSerializer,
     EventRegisteredUserWriteSerializer,
@@ -20,11 +34,13 @@ from apps.events.serializers import (
     EventWriteSerializer,
     InterestsSerializer,
     InterestsWriteSerializer,
+    OrganizerEventStatsSerializer,
 )
 
 
-class EventCategoryViewSet(viewsets.ModelViewSet):
+class EventCategoryViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     queryset = EventCategory.objects.all()
+    pagination_class = KeysetPagination
     serializer_class = EventCategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
@@ -34,14 +50,97 @@ class EventCategoryViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated(), IsAdminUser()]
         return [IsAuthenticatedOrReadOnly()]
 
+    def list(self, request, *args, **kwargs):
+        # El listado sale del catálogo en memoria: ninguna consulta a la base.
+        categories = catalog.live()
+        page = self.paginate_queryset(categories)
+        serializer_class = self.get_serializer_class()
+        data = [catalog.representation(category.pk, serializer_class) for category in (categories if page is None else page)]
+        return self.get_paginated_response(data) if page is not None else Response(data)
+
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(StreamingUploadMixin, ConditionalGetMixin, CompiledListMixin, QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all()
+    pagination_class = EventPagination
+    sparse_actions = ("list", "retrieve", "list_by_interests", "similar")
+    compiled_actions = ("list", "list_by_interests")
     parser_classes = (JSONParser, MultiPartParser, FormParser)
+    default_radius_km = 5
+    max_radius_km = 200
+    # Valores de ?ordering= y la llave de paginación que usa cada uno.
+    ordering_options = {
+        "rating": ("rating_avg", "id"),
+        "-rating": ("-rating_avg", "-id"),
+        "trending": ("trending_score", "id"),
+        "-trending": ("-trending_score", "-id"),
+    }
+
+    def get_pagination_ordering(self, queryset):
+        if self.action == "organizer_stats":
+            # Filas de values() propias: siempre por fecha, sin búsqueda ni ?ordering=.
+            return None
+        params = self.request.query_params
+        # Solo si filter_queryset() anotó la columna (p. ej. no con ?search=%20).
+        annotations = getattr(getattr(queryset, "query", None), "annotations", {})
+        if "search_rank" in annotations and "ordering" not in params:
+            return ("-search_rank", "id")
+        if "distance" in annotations and "ordering" not in params:
+            return ("distance", "id")
+        return self.ordering_options.get(params.get("ordering"))
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        term = self.request.query_params.get("search", "").strip()
+        if term:
+            queryset = search.search_events(queryset, term)
+        min_rating = self.request.query_params.get("min_rating")
+        if min_rating is not None:
+            try:
+                queryset = queryset.filter(rating_avg__gte=float(min_rating))
+            except ValueError:
+                raise ValidationError({"min_rating": "Debe ser un número."})
+        queryset = dates.filter_date_range(queryset, *self.get_date_range())
+        return self.filter_location(queryset)
+
+    def get_date_range(self):
+        """?from= y ?to= (fecha o fecha y hora ISO 8601) como límites ``[inicio, fin)`` de event_date."""
+        params = self.request.query_params
+        try:
+            start = dates.parse_bound(params["from"]) if params.get("from") else None
+            end = dates.parse_bound(params["to"], end=True) if params.get("to") else None
+        except ValueError:
+            raise ValidationError("Use from y to con fechas ISO 8601 (2026-10-01 o 2026-10-01T08:00:00-05:00).")
+        if start is not None and end is not None and start >= end:
+            raise ValidationError("from debe ser anterior a to.")
+        return start, end
+
+    def filter_location(self, queryset):
+        """?lat=&lng=&radius= (km) o ?bbox=min_lng,min_lat,max_lng,max_lat"""
+        params = self.request.query_params
+        try:
+            if "lat" in params or "lng" in params:
+                latitude, longitude = float(params["lat"]), float(params["lng"])
+                radius = float(params.get("radius", self.default_radius_km))
+                if not (-90 <= latitude <= 90 and -180 <= longitude <= 180 and 0 < radius <= self.max_radius_km):
+                    raise ValueError
+                queryset = geo.filter_nearby(queryset, latitude, longitude, radius)
+            if "bbox" in params:
+                min_lng, min_lat, max_lng, max_lat = (float(value) for value in params["bbox"].split(","))
+                if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= max_lng <= 180):
+                    raise ValueError
+                queryset = geo.filter_bbox(queryset, min_lat, min_lng, max_lat, max_lng)
+        except (KeyError, ValueError):
+            raise ValidationError(
+                f"Use lat y lng con radius entre 0 y {self.max_radius_km} km, "
+                "o bbox=min_lng,min_lat,max_lng,max_lat."
+            )
+        return queryset
 
     def get_permissions(self):
         # Solo los organizadores pueden crear, actualizar o eliminar eventos
-        if self.action in ["create", "update", "partial_update", "destroy"]:
+        if self.action in [
+            "create", "update", "partial_update", "destroy", "organizer_stats", "export_attendees", "export_reviews"
+        ]:
             return [IsAuthenticated(), IsOrganizerUser()]
         elif self.action == "list_by_interests":
             return [IsAuthenticated(), IsCustomerUser()]
@@ -51,6 +150,8 @@ class EventViewSet(viewsets.ModelViewSet):
         """Devuelve el serializer correcto según la acción."""
         if self.action in ["create", "update", "partial_update"]:
             return EventWriteSerializer
+        if self.action == "organizer_stats":
+            return OrganizerEventStatsSerializer
         return EventSerializer
 
     def perform_create(self, serializer):
@@ -76,40 +177,161 @@ class EventViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def list_by_interests(self, request):
+        queryset = feed.filter_feed(self.get_queryset(), request.user)
+        return self.conditional_list(request, queryset, lambda: self.render_feed(request, queryset))
+
+    def render_feed(self, request, queryset):
+        cached = feed.get_cached_page(request)
+        if cached is not None:
+            return Response(cached)
+
+        response = self.list_response(queryset)
+        feed.cache_page(request, response.data)
+        return response
+
+    @action(detail=False, methods=["get"])
+    def organizer_stats(self, request):
+        """Inscripciones por estado, cupo restante y reseñas de cada evento del organizador."""
+        cached = stats.get_cached(request.user, request)
+        if cached is not None:
+            return Response(cached)
+
+        page = self.paginate_queryset(stats.organizer_stats(request.user))
+        serializer = self.get_serializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        stats.set_cached(request.user, request, response.data)
+        return response
+
+    @action(detail=False, methods=["get"])
+    def calendar(self, request):
+        """Cantidad de eventos por día, semana o mes (?period=) entre ?from= y ?to=, en hora de Bogotá."""
+        period = request.query_params.get("period", "day")
+        if period not in dates.CALENDAR_PERIODS:
+            raise ValidationError({"period": f"Use uno de: {', '.join(dates.CALENDAR_PERIODS)}."})
+        start, end = self.get_date_range()
+        if start is None or end is None:
+            raise ValidationError("El calendario necesita from y to.")
+        if end - start > timedelta(days=dates.CALENDAR_MAX_DAYS):
+            raise ValidationError(f"El calendario abarca como máximo {dates.CALENDAR_MAX_DAYS} días.")
+
+        cached = dates.get_cached(request)
+        if cached is not None:
+            return Response(cached)
+
+        rows = dates.event_counts(self.filter_queryset(self.get_queryset()), period)
+        data = {
+            "period": period,
+            "time_zone": settings.TIME_ZONE,
+            "results": [{"date": row["date"].isoformat(), "count": row["count"]} for row in rows],
+        }
+        dates.set_cached(request, data)
+        return Response(data)
+
+    @action(detail=True, methods=["get"])
+    def similar(self, request, pk=None):
+        """Eventos con más asistentes en común, precalculados por build_event_similarities."""
         try:
-            user_interests = request.user.interests
-        except ObjectDoesNotExist:
-            return Response([])  # Lista vacía si el usuario no tiene intereses
-
-        # Filtra eventos basados en los intereses del usuario
-        queryset = Event.objects.filter(
-            Q(event_category=user_interests.interest_1) |
-            Q(event_category=user_interests.interest_2) |
-            Q(event_category=user_interests.interest_3),
-            event_date__gte=timezone.now()  # Solo eventos futuros
-        )
-        serializer = EventSerializer(queryset, many=True)
+            exists = Event.objects.filter(pk=pk).exists()
+        except (TypeError, ValueError, DjangoValidationError):
+            exists = False
+        if not exists:
+            raise NotFound()
+        # Una lectura por el índice único (event, rank) de EventSimilarity.
+        queryset = self.get_queryset().filter(similar_to__event_id=pk).order_by("similar_to__rank")
+        serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
-
-class EventRegisteredUserViewSet(viewsets.ModelViewSet):
+    # Columnas de cada exportación: (encabezado, campo para values_list).
+    attendee_columns = (
+        ("id", "id"),
+        ("email", "user__email"),
+        ("nombres", "user__name"),
+        ("apellidos", "user__last_name"),
+        ("estado", "registration_status"),
+        ("registrado", "created_at"),
+    )
+    review_columns = (
+        ("id", "id"),
+        ("email", "user__email"),
+        ("calificacion", "rating"),
+        ("resena", "review_text"),
+        ("creada", "created_at"),
+    )
+
+    @action(detail=True, methods=["get"], renderer_classes=EXPORT_RENDERERS)
+    def export_attendees(self, request, pk=None):
+        """Inscritos del evento en CSV (por defecto) o NDJSON (?output=ndjson o Accept)."""
+        queryset = EventRegisteredUser.objects.filter(event_id=self.get_owned_event_id(pk))
+        return self.export(request, queryset, self.attendee_columns, f"evento-{pk}-inscritos")
+
+    @action(detail=True, methods=["get"], renderer_classes=EXPORT_RENDERERS)
+    def export_reviews(self, request, pk=None):
+        """Reseñas del evento en CSV (por defecto) o NDJSON (?output=ndjson o Accept)."""
+        queryset = EventReview.objects.filter(event_id=self.get_owned_event_id(pk))
+        return self.export(request, queryset, self.review_columns, f"evento-{pk}-resenas")
+
+    def get_owned_event_id(self, pk):
+        try:
+            event = Event.objects.filter(pk=pk).values("id", "event_organizer_id").first()
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound()
+        if event is None:
+            raise NotFound()
+        if not (self.request.user.is_superuser or event["event_organizer_id"] == self.request.user.pk):
+            raise PermissionDenied("Solo el organizador puede exportar los datos de este evento.")
+        return event["id"]
+
+    def export(self, request, queryset, columns, filename):
+        # ?format= lo reserva DRF para elegir el renderer.
+        default = request.accepted_renderer.format if request.accepted_renderer.format in CONTENT_TYPES else "csv"
+        output = request.query_params.get("output", default)
+        if output not in CONTENT_TYPES:
+            raise ValidationError({"output": f"Use uno de: {', '.join(CONTENT_TYPES)}."})
+        headers, fields = zip(*columns)
+        rows = queryset.order_by("id").values_list(*fields)
+        return stream_export(request, rows, headers, filename, output)
+
+
+class EventRegisteredUserViewSet(CompiledListMixin, QueryPlanMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     queryset = EventRegisteredUser.objects.all()
+    pagination_class = KeysetPagination
+    compiled_actions = ("list",)
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
             return EventRegisteredUserWriteSerializer
+        if self.action == "bulk_status":
+            return BulkRegistrationStatusSerializer
         return EventRegisteredUserSerializer
 
-    def perform_create(self, serializer):
+    def get_permissions(self):
+        if self.action == "bulk_status":
+            return [IsAuthenticated(), IsOrganizerUser()]
+        return super().get_permissions()
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
         event = serializer.validated_data["event"]
-        user = self.request.user
+        if not event.queued_admission:
+            self.perform_create(serializer)
+            return Response(serializer.data, status=status.HTTP_201_CREATED, headers=self.get_success_headers(serializer.data))
 
-        # Evita doble registro
-        if EventRegisteredUser.objects.filter(event=event, user=user).exists():
-            raise PermissionDenied("Ya estás registrado en este evento.")
+        # Evento con admisión por cola: solo se guarda el ticket; el cupo lo
+        # asigna process_admissions en orden de llegada.
+        ticket, _ = admission.enqueue(AdmissionTicket, event.pk, request.user.pk)
+        return Response(AdmissionTicketSerializer(ticket).data, status=status.HTTP_202_ACCEPTED)
 
-        serializer.save(user=user)
+    def perform_create(self, serializer):
+        # El cupo se reserva con un UPDATE condicional dentro de save(); el doble
+        # registro lo detecta la restricción unique_event_user al insertar.
+        try:
+            serializer.save(user=self.request.user)
+        except IntegrityError:
+            raise PermissionDenied("Ya estás registrado en este evento.")
+        except DjangoValidationError as error:
+            raise ValidationError(error.messages)
 
     def update(self, request, *args, **kwargs):
         registration = self.get_object()
@@ -125,10 +347,63 @@ class EventRegisteredUserViewSet(viewsets.ModelViewSet):
             return super().destroy(request, *args, **kwargs)
         raise PermissionDenied("Solo el autor puede eliminar esta inscripción.")
 
+    @action(detail=False, methods=["post"])
+    def bulk_status(self, request):
+        """Cambia el estado de muchas inscripciones de los eventos del organizador en un solo UPDATE."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        # El filtro de dueño viaja dentro del UPDATE: ids ajenos simplemente no se tocan.
+        registrations = EventRegisteredUser.objects.all()
+        if not request.user.is_superuser:
+            registrations = registrations.filter(event__event_organizer=request.user)
+        if data.get("ids"):
+            registrations = registrations.filter(pk__in=data["ids"])
+        if "event" in data:
+            registrations = registrations.filter(event_id=data["event"])
+        if "current_status" in data:
+            registrations = registrations.filter(registration_status=data["current_status"])
+
+        try:
+            updated, freed_seats = capacity.bulk_set_status(Event, registrations, data["registration_status"])
+        except DjangoValidationError as error:
+            raise ValidationError(error.messages)
+        for event_id, seats in freed_seats.items():
+            admission.promote_waitlist(AdmissionTicket, event_id, seats)
+        event_ids = list(freed_seats)
+
+        counts = (
+            EventRegisteredUser.objects.filter(event_id__in=event_ids)
+            .values("registration_status")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        by_status = {code: 0 for code, _ in EventRegisteredUser.STATUS_CHOICES}
+        by_status.update({row["registration_status"]: row["total"] for row in counts})
+        return Response({"updated": updated, "registrations": by_status})
+
+
+class AdmissionTicketViewSet(viewsets.ReadOnlyModelViewSet):
+    """Tickets de admisión por cola del usuario, para consultar su estado."""
+
+    permission_classes = [IsAuthenticated]
+    queryset = AdmissionTicket.objects.all()
+    pagination_class = KeysetPagination
+    serializer_class = AdmissionTicketSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.user.is_superuser:
+            return queryset
+        return queryset.filter(user=self.request.user)
+
 
-class EventReviewViewSet(viewsets.ModelViewSet):
+class EventReviewViewSet(ConditionalGetMixin, CompiledListMixin, QueryPlanMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     queryset = EventReview.objects.all()
+    pagination_class = KeysetPagination
+    compiled_actions = ("list",)
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
@@ -160,8 +435,9 @@ class EventReviewViewSet(viewsets.ModelViewSet):
         raise PermissionDenied("Solo el autor puede eliminar esta reseña.")
 
 
-class InterestsViewSet(viewsets.ModelViewSet):
+class InterestsViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Interests.objects.all()
+    pagination_class = KeysetPagination
     serializer_class = InterestsSerializer
     permission_classes = [IsAuthenticated, IsCustomerUser]
 
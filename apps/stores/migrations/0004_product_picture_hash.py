@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 13:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0003_soft_delete_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='picture_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+    ]
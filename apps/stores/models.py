@@ -1,4 +1,4 @@
-from apps.base.models import BaseModel
+from apps.base.models import BaseModel, live_index
 from django.conf import settings
 from django.db import models
 
@@ -27,9 +27,17 @@ class Product(BaseModel):
     description = models.TextField(blank=True)
     seller = models.ForeignKey(Store, on_delete=models.CASCADE)
     picture = models.ImageField(upload_to="products/")
+    # sha256 de picture, lo llena apps.base.images al generar las variantes.
+    picture_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     stock = models.PositiveIntegerField(default=0)
 
+    class Meta:
+        indexes = [
+            live_index("category", "created_at", "id", name="product_category_created_idx"),
+            live_index("seller", "created_at", "id", name="product_seller_created_idx"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -49,6 +57,9 @@ class Order(BaseModel):
     order_items = models.ManyToManyField(OrderItem)
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
 
+    class Meta:
+        indexes = [live_index("user", "order_date", "id", name="order_user_date_idx")]
+
     def __str__(self):
         return f"{self.user} - {self.total_price}"
 
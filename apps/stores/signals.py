@@ -0,0 +1,4 @@
+from apps.base import images
+from apps.stores.models import Product
+
+images.register(Product, "picture")
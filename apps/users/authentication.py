@@ -0,0 +1,114 @@
+"""
+Autenticación JWT sin consulta a ``users_user`` en cada petición.
+
+``CachedJWTAuthentication`` resuelve el usuario del token desde ``user_cache``,
+un LRU en memoria de cada proceso, acotado en tamaño
+(``AUTH_USER_CACHE_SIZE``) y en tiempo (``AUTH_USER_CACHE_TIMEOUT``). La llave
+es ``(id, token_version)``: al cambiar la contraseña sube ``token_version`` y
+los tokens anteriores ya no encuentran ni su entrada ni al usuario.
+
+Guardar o borrar un usuario (desactivarlo, cambiarle el tipo o la contraseña)
+invalida sus entradas en el proceso que lo hizo; en los demás workers el
+cambio se ve a más tardar al vencer el TTL. Las peticiones que escriben
+(POST, PUT, PATCH, DELETE) siempre leen el usuario de la base, así nunca
+guardan una copia vieja.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+TOKEN_VERSION_CLAIM = "token_version"
+
+
+class UserCache:
+    """LRU con TTL de usuarios por ``(id, token_version)``, seguro entre hilos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        timeout = settings.AUTH_USER_CACHE_TIMEOUT
+        if not timeout:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, user = entry
+            if time.monotonic() - stored_at > timeout:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Cada petición recibe su propia instancia: request.user se puede modificar.
+        return copy.copy(user)
+
+    def set(self, key, user):
+        if not settings.AUTH_USER_CACHE_TIMEOUT:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.copy(user))
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.AUTH_USER_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_cache = UserCache()
+
+
+class VersionedRefreshToken(RefreshToken):
+    """RefreshToken con ``token_version``; el access token derivado lo copia."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        # DRF crea los autenticadores en cada petición.
+        self.use_cache = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        # Los tokens emitidos antes de token_version equivalen a la versión 0.
+        key = (validated_token.get(api_settings.USER_ID_CLAIM), validated_token.get(TOKEN_VERSION_CLAIM, 0))
+        if getattr(self, "use_cache", False):
+            user = user_cache.get(key)
+            if user is not None:
+                return user
+
+        user = super().get_user(validated_token)
+        if user.token_version != key[1]:
+            raise AuthenticationFailed("La contraseña del usuario cambió.", code="password_changed")
+        user_cache.set(key, user)
+        return user
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    # Mismo esquema Bearer en la documentación OpenAPI.
+    target_class = "apps.users.authentication.CachedJWTAuthentication"
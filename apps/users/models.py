@@ -40,12 +40,33 @@ class User(AbstractBaseUser, PermissionsMixin):
     username = models.CharField("Username", max_length=255, unique=True, db_index=True)
     phone = models.CharField("Phone", max_length=20, blank=True, null=True)
     event_picture = models.ImageField(upload_to="profiles/")
+    # sha256 de event_picture, lo llena apps.base.images al generar las variantes.
+    event_picture_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
     last_seen = models.DateTimeField(blank=True, null=True)
+    # Va en los tokens JWT y sube al cambiar la contraseña: los tokens anteriores
+    # dejan de valer (apps.users.authentication).
+    token_version = models.PositiveIntegerField(default=0, editable=False)
     objects = CustomUserManager()
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["name", "last_name"]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "password" in field_names:
+            instance._stored_password = instance.password
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None and self.password != getattr(self, "_stored_password", self.password):
+            self.token_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
+        self._stored_password = self.password
+
     def __str__(self):
         return self.email
 
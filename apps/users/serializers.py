@@ -2,16 +2,18 @@ from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from rest_framework import serializers
 
+from apps.base.serializers import ImageVariantsField
 from apps.users.models import User
 from apps.users.utils.gen_words import generate_random_username
 
 
 class UserSerializer(serializers.ModelSerializer):
     username = serializers.CharField(required=False)
+    event_picture_variants = ImageVariantsField("event_picture")
 
     class Meta:
         model = User
-        fields = ["id", "email", "name", "last_name", "phone", "password", "user_type", "username"]
+        fields = ["id", "email", "name", "last_name", "phone", "password", "user_type", "username", "event_picture_variants"]
         extra_kwargs = {"password": {"write_only": True}, "user_type": {"read_only": True}}
 
     def create(self, validated_data):
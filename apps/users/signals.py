@@ -1,7 +1,16 @@
+from functools import partial
+
 from django.contrib.auth.models import Group
-from django.db.models.signals import post_migrate
+from django.db import transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
 from django.dispatch import receiver
 
+from apps.base import images
+from apps.users.authentication import user_cache
+from apps.users.models import User
+
+images.register(User, "event_picture")
+
 
 @receiver(post_migrate)
 def create_user_groups(sender, **kwargs):
@@ -11,3 +20,11 @@ def create_user_groups(sender, **kwargs):
         Group.objects.get_or_create(name="Organizer")
     except BaseException:
         pass
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, using, **kwargs):
+    # También al confirmar: otra petición pudo leer la fila vieja mientras tanto.
+    user_cache.invalidate(instance.pk)
+    transaction.on_commit(partial(user_cache.invalidate, instance.pk), using=using)
@@ -0,0 +1,121 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.users.authentication import TOKEN_VERSION_CLAIM, UserCache, VersionedRefreshToken, user_cache
+from apps.users.models import User
+
+
+def user_queries(queries):
+    return [query["sql"] for query in queries if 'FROM "users_user"' in query["sql"]]
+
+
+@override_settings(AUTH_USER_CACHE_TIMEOUT=30, AUTH_USER_CACHE_SIZE=100)
+class CachedJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(
+            email="customer@example.com", username="customer", password="password123", user_type="1"
+        )
+        self.url = reverse("events:event-list-by-interests")
+
+    def _authenticate(self, user=None):
+        token = VersionedRefreshToken.for_user(user or self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return token
+
+    def test_user_is_cached_between_requests(self):
+        self._authenticate()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries(queries), [])
+
+    def test_login_token_carries_version(self):
+        response = self.client.post(
+            reverse("users:user-login"), {"email": "customer@example.com", "password": "password123"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_password_change_revokes_tokens(self):
+        token = self._authenticate()
+        self.assertEqual(token[TOKEN_VERSION_CLAIM], 0)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password("otra-clave-456")
+        user.save()
+        self.assertEqual(user.token_version, 1)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self._authenticate(user)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_deactivation_and_changes_invalidate_cache(self):
+        self._authenticate()
+        self.client.get(self.url)
+
+        self.user.user_type = "3"
+        self.user.save()
+        # El feed es solo para clientes: el cambio de tipo se ve de inmediato.
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_writes_read_user_from_database(self):
+        self._authenticate()
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.put(reverse("users:user-update-profile"), {})
+        self.assertTrue(user_queries(queries))
+
+    @override_settings(AUTH_USER_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self._authenticate()
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertTrue(user_queries(queries))
+        self.assertEqual(len(user_cache), 0)
+
+
+@override_settings(AUTH_USER_CACHE_TIMEOUT=30, AUTH_USER_CACHE_SIZE=2)
+class UserCacheTests(APITestCase):
+    def test_evicts_least_recently_used(self):
+        cache = UserCache()
+        users = [User(pk=pk, email=f"user{pk}@example.com") for pk in (1, 2, 3)]
+        cache.set((1, 0), users[0])
+        cache.set((2, 0), users[1])
+        cache.get((1, 0))
+        cache.set((3, 0), users[2])
+
+        self.assertEqual(cache.get((1, 0)).email, "user1@example.com")
+        self.assertIsNone(cache.get((2, 0)))
+        # Cada lectura es una copia.
+        self.assertIsNot(cache.get((3, 0)), cache.get((3, 0)))
+
+    def test_expires_and_invalidates(self):
+        cache = UserCache()
+        cache.set((1, 0), User(pk=1))
+        cache.set((1, 1), User(pk=1))
+        cache.invalidate(1)
+        self.assertEqual(len(cache), 0)
+
+        with patch("apps.users.authentication.time.monotonic", return_value=100.0):
+            cache.set((2, 0), User(pk=2))
+        with patch("apps.users.authentication.time.monotonic", return_value=131.0):
+            self.assertIsNone(cache.get((2, 0)))
+        self.assertEqual(len(cache), 0)
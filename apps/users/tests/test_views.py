@@ -1,9 +1,13 @@
+from datetime import timedelta
+
 import pytest
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.events.models import Event, EventCategory, EventRegisteredUser, EventReview
 from apps.users.models import User
 from apps.users.serializers import UserSerializer
 
@@ -88,4 +92,31 @@ class TestUserViewSet(APITestCase):
     def test_query_username(self):
         url = reverse("users:user-query-username")
         response = self.client.get(url, {"username": "testuser"})
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_users_is_not_paginated(self):
+        response = self.client.get(reverse("users:user-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 2)
+
+    def test_destroy_user_updates_event_aggregates(self):
+        event = Event.objects.create(
+            event_name="Evento con cupo",
+            event_category=EventCategory.objects.create(name="Tecnología"),
+            event_organizer=self.admin,
+            event_description="Descripción del evento",
+            event_location="Online",
+            event_date=timezone.now() + timedelta(days=5),
+            paid=False,
+            has_limit=True,
+            limit=1,
+        )
+        EventRegisteredUser.objects.create(event=event, user=self.user)
+        EventReview.objects.create(event=event, user=self.user, rating=5, review_text="Muy bueno")
+
+        # El usuario no es un BaseModel: sus filas se borran en cascada sin pasar por save().
+        response = self.client.delete(reverse("users:user-detail", args=[self.user.pk]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        event.refresh_from_db()
+        self.assertEqual((event.registered_count, event.rating_count, event.rating_avg, event.rating_5_count), (0, 0, 0, 0))
@@ -4,8 +4,8 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.users.authentication import VersionedRefreshToken
 from apps.users.models import User
 from apps.users.serializers import LoginUserSerializer, RecoverPasswordSerializer, UpdateProfileSerializer, UserSerializer
 
@@ -33,7 +33,7 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = LoginUserSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.validated_data["user"]
-            refresh = RefreshToken.for_user(user)
+            refresh = VersionedRefreshToken.for_user(user)
             user_serializer = UserSerializer(user)
             return Response(
                 {
@@ -48,6 +48,8 @@ ALLOWED_HOSTS = ['*']
 # Application definition
 INSTALLED_APPS = [
     # Aplicaciones locales
+    # Ruta completa: 'base' a secas se resolvería al paquete 'base' instalado por pip.
+    'apps.base.apps.BaseConfig',
     'users.apps.UsersConfig',
     'stores.apps.StoresConfig',
     'events.apps.EventsConfig',
@@ -72,7 +74,7 @@ INSTALLED_APPS = [
 # Configuración de REST Framework y autenticación con JWT
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
@@ -80,6 +82,47 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# Tamaño de página por defecto de los listados de eventos (apps.base.pagination)
+PAGINATION_PAGE_SIZE = int(os.getenv('PAGE_SIZE', '20'))
+
+# Tamaño máximo de página que un cliente puede pedir con ?page_size=
+PAGINATION_MAX_PAGE_SIZE = int(os.getenv('PAGINATION_MAX_PAGE_SIZE', '100'))
+
+# Segundos que se cachea cada página del feed por intereses (0 lo desactiva)
+EVENT_FEED_CACHE_TIMEOUT = int(os.getenv('EVENT_FEED_CACHE_TIMEOUT', '0'))
+
+# Cada cuántos segundos un worker compara su copia del catálogo de categorías
+# con la base (apps.events.catalog); acota cuánto tarda en verse un cambio
+# hecho en otro worker o réplica cuando el cache no es compartido
+EVENT_CATEGORY_CATALOG_TTL = int(os.getenv('EVENT_CATEGORY_CATALOG_TTL', '5'))
+
+# Segundos que se cachean las estadísticas del tablero de un organizador (0 lo desactiva)
+EVENT_ORGANIZER_STATS_CACHE_TIMEOUT = int(os.getenv('EVENT_ORGANIZER_STATS_CACHE_TIMEOUT', '30'))
+
+# Segundos que se cachea cada respuesta del calendario de eventos (0 lo desactiva)
+EVENT_CALENDAR_CACHE_TIMEOUT = int(os.getenv('EVENT_CALENDAR_CACHE_TIMEOUT', '60'))
+
+# Horas en que la actividad de un evento pierde la mitad de su peso en el
+# orden ?ordering=-trending (apps.events.trending)
+EVENT_TRENDING_HALF_LIFE_HOURS = int(os.getenv('EVENT_TRENDING_HALF_LIFE_HOURS', '24'))
+
+# Clase que convierte Event.event_location en coordenadas (comando geocode_events).
+# En local se puede usar 'apps.events.geo.StaticGeocoder'.
+EVENT_GEOCODER = os.getenv('EVENT_GEOCODER', 'apps.events.geo.NullGeocoder')
+
+# Días que una fila borrada lógicamente permanece en la papelera antes de que
+# el comando purge_trashed la elimine definitivamente.
+TRASH_RETENTION_DAYS = int(os.getenv('TRASH_RETENTION_DAYS', '30'))
+
+# Hilos que generan las variantes de las imágenes subidas (apps.base.images);
+# con 0 se generan en línea al confirmar la transacción.
+IMAGE_VARIANT_WORKERS = int(os.getenv('IMAGE_VARIANT_WORKERS', '2'))
+
+# Usuarios autenticados que cada proceso guarda en memoria y segundos que
+# vale cada uno (apps.users.authentication; 0 lo desactiva)
+AUTH_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', '10000'))
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', '30'))
+
 # Configuración de SimpleJWT
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
@@ -169,11 +212,29 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = [] if not DEBUG else [BASE_DIR / "static"]  # Para archivos estáticos en desarrollo
 STATIC_ROOT = BASE_DIR / "staticfiles"
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Temporales de las subidas en curso (apps.base.uploads): fuera de MEDIA_ROOT,
+# que se sirve completo, pero en el mismo sistema de archivos para que
+# guardarlos sea un rename
+UPLOAD_TEMP_DIR = os.getenv('UPLOAD_TEMP_DIR', str(BASE_DIR / 'media_tmp'))
+
+# STATICFILES_STORAGE ya no existe en Django 5.1; los almacenamientos se
+# configuran aquí. Los archivos subidos se guardan por su sha256 (ver
+# apps.base.storage) y los sirve apps.base.media.serve con caché inmutable.
+STORAGES = {
+    'default': {'BACKEND': 'apps.base.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# max-age de los archivos de media que no están direccionados por contenido
+MEDIA_CACHE_MAX_AGE = int(os.getenv('MEDIA_CACHE_MAX_AGE', '3600'))
+
+# Tamaño máximo en bytes de una imagen subida (apps.base.uploads.ImageUploadHandler)
+IMAGE_UPLOAD_MAX_SIZE = int(os.getenv('IMAGE_UPLOAD_MAX_SIZE', str(10 * 1024 * 1024)))
+
 # Configuración de CORS
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",  # Frontend en React local